@@ -0,0 +1,103 @@
+# =============================================================================
+# bench_scoring.py — Deck Scoring Throughput (serial vs --workers N)
+# =============================================================================
+# Scores one synthetic buyer feature table against a set of exporters and
+# reports exporters/sec for:
+#
+#   serial                 — score_pairs_batch + select_top_n per block,
+#                            in-process (the --stream-top-n numeric path)
+#   workers=N              — parallel_runner.score_exporters_parallel
+#
+# Every mode must pick identical decks (checked). Only the numeric part is
+# timed; building score documents stays in the parent in every mode.
+#
+#   python bench_scoring.py --buyers 10000 --exporters 2000 --workers 2 --workers 4
+
+import argparse
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from config import EXPORTER_BLOCK_SIZE
+from data_loader import INDUSTRY_VOCAB
+from parallel_runner import score_exporters_parallel
+from scoring_engine import build_industry_matrix, score_pairs_batch, select_top_n
+
+
+def synthetic_features(n_buyers: int, seed: int = 7) -> pd.DataFrame:
+    """A build_buyer_features()-shaped table with random sub-scores."""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "clean_industry_code":  rng.integers(0, len(INDUSTRY_VOCAB), n_buyers).astype(np.int16),
+        "score_intent":         rng.random(n_buyers),
+        "score_reliability":    rng.random(n_buyers),
+        "score_geopolitical":   rng.random(n_buyers),
+        "score_news_delta":     rng.uniform(-0.4, 0.4, n_buyers),
+        "score_recency_weight": rng.uniform(0.3, 1.0, n_buyers),
+    })
+
+
+def run_serial(exporter_codes: np.ndarray, buyer_features, top_n: int) -> list:
+    decks = []
+    for start in range(0, len(exporter_codes), EXPORTER_BLOCK_SIZE):
+        batch = score_pairs_batch(
+            exporter_cols  = {"clean_industry_code": exporter_codes[start:start + EXPORTER_BLOCK_SIZE]},
+            buyer_features = buyer_features,
+        )
+        decks.extend(select_top_n(row, top_n) for row in batch["composite_score"])
+    return decks
+
+
+def bench(exporter_codes: np.ndarray, buyer_features, top_n: int, worker_counts: list) -> list:
+    industry_matrix = build_industry_matrix()
+    results, reference = [], None
+    for workers in [1, *worker_counts]:
+        t0 = time.perf_counter()
+        if workers == 1:
+            decks = run_serial(exporter_codes, buyer_features, top_n)
+        else:
+            selections = score_exporters_parallel(
+                exporter_codes  = exporter_codes,
+                swipe_factors   = {},
+                buyer_features  = buyer_features,
+                industry_matrix = industry_matrix,
+                top_n           = top_n,
+                workers         = workers,
+                shard_size      = EXPORTER_BLOCK_SIZE,
+            )
+            decks = [sel["buyer_idx"].tolist() for sel in selections]
+        elapsed = time.perf_counter() - t0
+
+        label = "serial" if workers == 1 else f"workers={workers}"
+        if reference is None:
+            reference = decks
+        elif decks != reference:
+            raise AssertionError(f"{label}: decks differ from the serial run")
+        results.append({"mode": label, "seconds": elapsed,
+                        "exporters_per_sec": len(exporter_codes) / elapsed})
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Deck scoring throughput benchmark")
+    parser.add_argument("--buyers", type=int, default=10_000, help="buyers per deck (default: 10000)")
+    parser.add_argument("--exporters", type=int, default=2_000, help="exporters scored (default: 2000)")
+    parser.add_argument("--top-n", type=int, default=10, help="deck size (default: 10)")
+    parser.add_argument("--workers", type=int, action="append",
+                        help="worker processes; repeatable (default: 2 and the CPU count)")
+    args = parser.parse_args()
+
+    buyer_features = synthetic_features(args.buyers)
+    exporter_codes = np.random.default_rng(11).integers(
+        0, len(INDUSTRY_VOCAB), args.exporters).astype(np.int16)
+    worker_counts  = args.workers or sorted({2, max(os.cpu_count() or 1, 2)})
+    results = bench(exporter_codes, buyer_features, args.top_n, worker_counts)
+
+    base = results[0]["exporters_per_sec"]
+    print(f"\n{args.exporters} exporters × {args.buyers} buyers, top {args.top_n}, "
+          f"{os.cpu_count()} CPUs")
+    for r in results:
+        print(f"  {r['mode']:<12} {r['exporters_per_sec']:>10,.0f} exporters/sec  "
+              f"({r['seconds']:.2f}s, ×{r['exporters_per_sec'] / base:.2f})")
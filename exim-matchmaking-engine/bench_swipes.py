@@ -0,0 +1,112 @@
+# =============================================================================
+# bench_swipes.py — Swipe Ingestion Throughput (single-event vs group commit)
+# =============================================================================
+# Replays one synthetic burst of deck swipes into a fresh durable SwipeStore
+# per mode and reports sustained events/sec:
+#
+#   process_swipe, fsync every event    — each swipe durable on return
+#   process_swipe, fsync every N        — SWIPE_LOG_FSYNC_EVERY batching
+#   process_swipes(batch of B)          — group commit: one write + one fsync
+#                                         per batch, each batch durable on return
+#
+# Every mode ends with identical swipe states and preference vectors (checked).
+#
+#   python bench_swipes.py --events 20000 --batch-size 64 --batch-size 512
+
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from config import SWIPE_LOG_FSYNC_EVERY
+from swipe_engine import SwipeStore
+
+
+COUNTRIES  = ["Netherlands", "Japan", "Germany", "USA", "UAE", "Canada", "Brazil", "Kenya"]
+INDUSTRIES = ["Textiles", "Solar", "IT Software", "Machinery", "Spices", "Medical Devices"]
+
+
+def synthetic_events(n_events: int, n_exporters: int, n_buyers: int, seed: int = 7) -> list:
+    """A burst of swipes from n_exporters decks, one microsecond apart."""
+    rng    = random.Random(seed)
+    buyers = [{"Buyer_ID": f"IMP_{i:05d}",
+               "Country":  rng.choice(COUNTRIES),
+               "Industry": rng.choice(INDUSTRIES)} for i in range(n_buyers)]
+    start  = time.time_ns() // 1_000
+    events = []
+    for k in range(n_events):
+        buyer = rng.choice(buyers)
+        events.append({
+            "exporter_id": f"EXP_{rng.randrange(n_exporters):04d}",
+            "buyer_id":    buyer["Buyer_ID"],
+            "direction":   "left" if rng.random() < 0.7 else "right",
+            "buyer_row":   buyer,
+            "timestamp":   start + k,
+        })
+    return events
+
+
+def run_single(store: SwipeStore, events: list):
+    for ev in events:
+        store.process_swipe(ev["exporter_id"], ev["buyer_id"], ev["direction"], ev["buyer_row"])
+
+
+def run_batched(store: SwipeStore, events: list, batch_size: int):
+    for start in range(0, len(events), batch_size):
+        store.process_swipes(events[start:start + batch_size])
+
+
+def _strip_times(store: SwipeStore):
+    """States and pattern counts without wall-clock fields (single-event swipes are stamped 'now')."""
+    states = {exp: {buyer: {k: v for k, v in st.items() if k != "last_swiped_at"}
+                    for buyer, st in pairs.items()}
+              for exp, pairs in store._states.items()}
+    patterns = {exp: (pv["left_patterns"], pv["right_patterns"]) for exp, pv in store._pvectors.items()}
+    return states, patterns
+
+
+def bench(events: list, batch_sizes: list, workdir: str) -> list:
+    modes = [("process_swipe, fsync every event", 1, None),
+             (f"process_swipe, fsync every {SWIPE_LOG_FSYNC_EVERY}", SWIPE_LOG_FSYNC_EVERY, None)]
+    modes += [(f"process_swipes, batch {b}", SWIPE_LOG_FSYNC_EVERY, b) for b in batch_sizes]
+
+    results, reference = [], None
+    for i, (label, fsync_every, batch_size) in enumerate(modes):
+        store = SwipeStore(log_path=os.path.join(workdir, f"mode{i}.log"), fsync_every=fsync_every)
+        t0 = time.perf_counter()
+        if batch_size is None:
+            run_single(store, events)
+        else:
+            run_batched(store, events, batch_size)
+        store.close()
+        elapsed = time.perf_counter() - t0
+
+        final = _strip_times(store)
+        if reference is None:
+            reference = final
+        elif final != reference:
+            raise AssertionError(f"{label}: swipe state differs from the single-event path")
+        results.append({"mode": label, "seconds": elapsed, "events_per_sec": len(events) / elapsed})
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Swipe ingestion throughput benchmark")
+    parser.add_argument("--events", type=int, default=20_000, help="swipes in the burst (default: 20000)")
+    parser.add_argument("--exporters", type=int, default=200, help="exporters swiping (default: 200)")
+    parser.add_argument("--buyers", type=int, default=5_000, help="buyers in the decks (default: 5000)")
+    parser.add_argument("--batch-size", type=int, action="append",
+                        help="process_swipes batch size; repeatable (default: 64 and 512)")
+    parser.add_argument("--dir", default=None, help="directory for the logs (default: a temp dir)")
+    args = parser.parse_args()
+
+    events = synthetic_events(args.events, args.exporters, args.buyers)
+    with tempfile.TemporaryDirectory(dir=args.dir) as workdir:
+        results = bench(events, args.batch_size or [64, 512], workdir)
+
+    base = results[0]["events_per_sec"]
+    print(f"\n{len(events)} swipes, {args.exporters} exporters, {args.buyers} buyers")
+    for r in results:
+        print(f"  {r['mode']:<36} {r['events_per_sec']:>12,.0f} events/sec  "
+              f"({r['seconds']:.2f}s, ×{r['events_per_sec'] / base:.1f})")
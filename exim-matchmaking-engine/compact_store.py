@@ -0,0 +1,156 @@
+# =============================================================================
+# compact_store.py — Compact Struct-of-Arrays Tables
+# =============================================================================
+# A cleaned buyer/exporter DataFrame carries every raw column plus ~25 float64
+# clean_* columns and string tiers, and the pipeline used to explode it into
+# one Python dict per row. CompactTable keeps one small array per column
+# instead — every encoding is lossless, so scores are unchanged:
+#   - strings / categoricals → integer codes + category table
+#   - floats with few distinct values (flags 0 / 1 / 0.1, 2-decimal scores)
+#     → uint8 / uint16 codes + float64 value table
+#   - other floats → float32 when that round-trips exactly, else float64
+#   - integers → the narrowest integer type that holds the range
+# Columns decode to plain NumPy arrays for the batch scorer; rows decode to
+# the same dict to_dict("records") would give, for the swipe engine and cards.
+
+import sys
+
+import numpy as np
+import pandas as pd
+
+
+def _code_dtype(n_values: int):
+    """Narrowest unsigned code type for n_values distinct values."""
+    for dtype in (np.uint8, np.uint16, np.uint32):
+        if n_values <= np.iinfo(dtype).max + 1:
+            return dtype
+    return np.int64
+
+
+class CompactTable:
+    """Struct-of-arrays view of a cleaned DataFrame (see module header)."""
+
+    def __init__(self, df: pd.DataFrame):
+        self.columns = list(df.columns)
+        self._length = len(df)
+        self._arrays = {}   # column → stored array (codes or values)
+        self._tables = {}   # column → decode table for coded columns
+        self._rows   = {}   # column → Python-level lookup used by row()
+
+        for col in self.columns:
+            series = df[col]
+            if pd.api.types.is_float_dtype(series.dtype):
+                self._encode_float(col, series.to_numpy(dtype=np.float64))
+            elif pd.api.types.is_bool_dtype(series.dtype) or pd.api.types.is_integer_dtype(series.dtype):
+                values = series.to_numpy()
+                if len(values) and not pd.api.types.is_bool_dtype(series.dtype):
+                    values = values.astype(np.result_type(np.min_scalar_type(values.min()),
+                                                          np.min_scalar_type(values.max())))
+                self._arrays[col] = values
+            else:
+                # Strings, categoricals and other objects: missing → NaN on decode
+                codes, uniques = pd.factorize(series.astype(object), use_na_sentinel=False)
+                self._arrays[col] = codes.astype(_code_dtype(len(uniques)))
+                self._tables[col] = np.asarray(uniques, dtype=object)
+
+        for col, table in self._tables.items():
+            self._rows[col] = table.tolist()
+
+    def _encode_float(self, col: str, values: np.ndarray):
+        codes, uniques = pd.factorize(values, use_na_sentinel=False)
+        if len(uniques) <= np.iinfo(np.uint16).max + 1:
+            self._arrays[col] = codes.astype(_code_dtype(len(uniques)))
+            self._tables[col] = np.asarray(uniques, dtype=np.float64)
+            return
+        as_float32 = values.astype(np.float32)
+        lossless = np.array_equal(as_float32.astype(np.float64), values, equal_nan=True)
+        self._arrays[col] = as_float32 if lossless else values
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __contains__(self, col: str) -> bool:
+        return col in self._arrays
+
+    def __getitem__(self, col: str) -> np.ndarray:
+        """Decoded column: float64 for floats, object for strings, ints as stored."""
+        values = self._arrays[col]
+        if col in self._tables:
+            return self._tables[col][values]
+        if values.dtype == np.float32:
+            return values.astype(np.float64)
+        return values
+
+    def row(self, i: int) -> dict:
+        """Row i as a plain dict, equal to df.to_dict("records")[i]."""
+        record = {}
+        for col in self.columns:
+            code = self._arrays[col][i]
+            if col in self._rows:
+                record[col] = self._rows[col][code]
+            else:
+                record[col] = code.item()
+        return record
+
+    def records(self) -> "RecordView":
+        """Lazy list-like of row dicts — a drop-in for to_dict("records")."""
+        return RecordView(self)
+
+    def nbytes(self) -> int:
+        """Bytes held by the column arrays and decode tables."""
+        total = sum(arr.nbytes for arr in self._arrays.values())
+        for table in self._tables.values():
+            total += table.nbytes
+            if table.dtype == object:
+                total += sum(sys.getsizeof(v) for v in table)
+        return total
+
+
+class RecordView:
+    """Sequence of row dicts decoded on access; nothing is materialised up front."""
+
+    def __init__(self, table: CompactTable):
+        self._table = table
+
+    def __len__(self) -> int:
+        return len(self._table)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self._table.row(j) for j in range(*i.indices(len(self._table)))]
+        if i < 0:
+            i += len(self._table)
+        if not 0 <= i < len(self._table):
+            raise IndexError(i)
+        return self._table.row(i)
+
+    def __iter__(self):
+        for i in range(len(self._table)):
+            yield self._table.row(i)
+
+
+# ─── MEMORY REPORT ───────────────────────────────────────────────────────────
+
+def _records_nbytes(df: pd.DataFrame) -> int:
+    """Approximate footprint of df.to_dict("records") (dicts + boxed values)."""
+    records = df.to_dict("records")
+    total = sys.getsizeof(records)
+    for record in records:
+        total += sys.getsizeof(record) + sum(sys.getsizeof(v) for v in record.values())
+    return total
+
+
+def memory_report(df: pd.DataFrame, table: CompactTable) -> dict:
+    """
+    Compare the cleaned DataFrame, its to_dict("records") list and the
+    compact table. Boxed values shared between records (interned strings,
+    small ints) are counted once per record, so the records figure is an
+    upper bound.
+    """
+    return {
+        "rows":              len(df),
+        "columns":           len(df.columns),
+        "dataframe_bytes":   int(df.memory_usage(deep=True).sum()),
+        "records_bytes":     int(_records_nbytes(df)),
+        "compact_bytes":     int(table.nbytes()),
+    }
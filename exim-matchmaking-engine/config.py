@@ -3,6 +3,8 @@
 # =============================================================================
 # All weights, thresholds, and mappings are here. Tune without touching logic.
 
+import os
+
 # ─── SCORING WEIGHTS ─────────────────────────────────────────────────────────
 # Priority order: industry > intent > reliability > geopolitical
 # Must sum to 1.0
@@ -84,6 +86,8 @@ NEWS_RECENCY_HALFLIFE_DAYS = 180
 # How fast old buyer records lose relevance (exponential decay)
 # Lambda: higher = faster decay. 0.001 ≈ ~2yr half-life
 RECORD_RECENCY_LAMBDA = 0.001
+# Format of the Date column in all source CSVs; other values count as invalid
+RECORD_DATE_FORMAT = "%Y-%m-%d"
 
 # ─── SWIPE FEEDBACK ENGINE ───────────────────────────────────────────────────
 # Option B: Soft Decay
@@ -98,6 +102,10 @@ PATTERN_PENALTY_FACTOR    = 0.30   # Reduce similar profiles' scores by this muc
 # Pattern dimensions: what makes two buyers "similar" for pattern learning
 PATTERN_DIMENSIONS        = ["Country", "Industry"]  # Group by these fields
 
+# Durable swipe log (SwipeStore(log_path=...), see swipe_log.py)
+SWIPE_LOG_FSYNC_EVERY     = 64      # fsync the log after this many events (1 = every event)
+SWIPE_SNAPSHOT_EVERY      = 10_000  # snapshot states + vectors after this many events
+
 # ─── CARD DISPLAY THRESHOLDS ─────────────────────────────────────────────────
 # Buyers below this composite score won't surface in the card deck
 MIN_COMPOSITE_SCORE       = 0.10
@@ -122,3 +130,21 @@ SCORE_TIERS = [
     (0.20, "🔵 Weak Fit"),
     (0.00, "⚠️ Low Priority"),
 ]
+
+# ─── BATCH SCORING ───────────────────────────────────────────────────────────
+# Exporters scored together per vectorised block (block = exporters × all buyers).
+# Memory per block ≈ EXPORTER_BLOCK_SIZE × n_buyers × ~40 bytes.
+EXPORTER_BLOCK_SIZE = 256
+
+# ─── CSV INGESTION ───────────────────────────────────────────────────────────
+# pandas reader engine for direct typed reads (data_loader.read_source_csv,
+# e.g. delta files): "c" (default) or "pyarrow" (multi-threaded; used only if
+# pyarrow is installed, else falls back to "c"). The transform graph's shared
+# text read ({kind}.source) always uses "c".
+CSV_ENGINE = "c"
+
+# Rows per cleaned chunk when streaming importers (data_loader.iter_importers)
+IMPORTER_CHUNK_SIZE = 100_000
+
+# Cleaned-frame cache (Feather, needs pyarrow); None disables caching
+DATA_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache")
@@ -8,19 +8,28 @@
 import pandas as pd
 import numpy as np
 from datetime import datetime
-from config import PROFILE_VISITS_NORM_CAP, RECORD_RECENCY_LAMBDA
-
-TODAY = datetime.today()
+import config
+from config import (
+    PROFILE_VISITS_NORM_CAP, RECORD_RECENCY_LAMBDA, RECORD_DATE_FORMAT, INDUSTRY_ADJACENCY,
+    CSV_ENGINE, DATA_CACHE_DIR, IMPORTER_CHUNK_SIZE,
+)
+from transform_graph import TransformGraph
 
 
 # ─── GENERIC HELPERS ─────────────────────────────────────────────────────────
 
+# Token sets (after str().strip().lower()) shared by the cell and column cleaners
+_NA_TOKENS    = ("", "na", "nan", "none", "unknown", "null")
+_TRUE_TOKENS  = ("1", "true", "yes")
+_FALSE_TOKENS = ("0", "false", "no")
+
+
 def _safe_float(val, fallback=np.nan):
     """Convert messy values to float. Handles 'NA', 'Unknown', '', None."""
     if val is None:
         return fallback
     s = str(val).strip().lower()
-    if s in ("", "na", "nan", "none", "unknown", "null"):
+    if s in _NA_TOKENS:
         return fallback
     try:
         return float(val)
@@ -36,24 +45,63 @@ def _safe_binary(val, unknown_fallback=0.1):
     - 'Unknown' / NA  → unknown_fallback (treated as uncertain, not zero)
     """
     s = str(val).strip().lower()
-    if s in ("1", "true", "yes"):
+    if s in _TRUE_TOKENS:
         return 1.0
-    if s in ("0", "false", "no"):
+    if s in _FALSE_TOKENS:
         return 0.0
     return unknown_fallback
 
 
-def _recency_weight(date_str):
+# Column-level twins of the cell cleaners above. Same outputs, but the Python
+# cleaner only runs once per DISTINCT raw value (flags and text-typed numeric
+# columns have a handful), and already-numeric columns are not parsed at all.
+
+def _map_distinct(series: pd.Series, clean) -> np.ndarray:
+    """Apply a cell cleaner to each distinct value of a column, then gather."""
+    codes, uniques = pd.factorize(series, use_na_sentinel=False)
+    # No forced dtype: like Series.apply, all-int fallbacks stay int64
+    cleaned = np.array([clean(val) for val in uniques])
+    return cleaned[codes]
+
+
+def _safe_float_col(series: pd.Series, fallback=np.nan) -> pd.Series:
+    """Column version of _safe_float."""
+    if pd.api.types.is_numeric_dtype(series.dtype):
+        values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+        values = np.where(np.isnan(values), fallback, values)
+    else:
+        # pd.to_numeric's string parser is not always bit-identical to float(),
+        # so text columns go through _safe_float itself (per distinct value)
+        values = _map_distinct(series, lambda val: _safe_float(val, fallback))
+    return pd.Series(values, index=series.index)
+
+
+def _safe_binary_col(series: pd.Series, unknown_fallback=0.1) -> pd.Series:
+    """Column version of _safe_binary (token mapping per distinct value)."""
+    values = _map_distinct(series, lambda val: _safe_binary(val, unknown_fallback))
+    return pd.Series(values, index=series.index)
+
+
+def _as_of_day(as_of=None) -> pd.Timestamp:
+    """Reference day for recency weights: as_of (date-like) or today, at midnight."""
+    return pd.Timestamp(as_of if as_of is not None else datetime.today()).normalize()
+
+
+def _parse_record_dates(dates: pd.Series) -> pd.Series:
+    """Record dates as Timestamps (RECORD_DATE_FORMAT); anything else → NaT."""
+    return pd.to_datetime(dates.astype("str").str.strip(), format=RECORD_DATE_FORMAT, errors="coerce")
+
+
+def _recency_weight_col(dates: pd.Series, as_of=None) -> pd.Series:
     """
-    Exponential decay weight based on how old the record is.
-    Recent records score closer to 1.0; very old records approach 0.
+    Exponential decay weight based on how old each record is, relative to
+    the as_of day. Recent records score closer to 1.0; very old records
+    approach 0. Missing or unparseable dates get the neutral 0.5.
     """
-    try:
-        record_date = pd.to_datetime(date_str)
-        days_old = max((TODAY - record_date).days, 0)
-        return float(np.exp(-RECORD_RECENCY_LAMBDA * days_old))
-    except Exception:
-        return 0.5  # neutral if date unparseable
+    parsed   = _parse_record_dates(dates)
+    days_old = (_as_of_day(as_of) - parsed).dt.days.clip(lower=0)
+    weights  = np.exp(-RECORD_RECENCY_LAMBDA * days_old.to_numpy(dtype=np.float64))
+    return pd.Series(np.where(parsed.isna(), 0.5, weights), index=dates.index)
 
 
 def _get_score_tier(score):
@@ -65,39 +113,470 @@ def _get_score_tier(score):
     return "⚠️ Low Priority"
 
 
+# ─── INDUSTRY ENCODING ───────────────────────────────────────────────────────
+# Industries become small integer codes so the scoring engine can look up the
+# industry match for a whole exporter × buyer block with one array gather.
+# Code 0 is reserved for a missing industry. Industries from the adjacency map
+# get fixed codes; labels seen for the first time at load are appended, so
+# importer and exporter codes always share one vocabulary.
+# INDUSTRY_VOCAB is append-only: a code, once handed out, keeps its label for
+# the life of the process (scoring_engine caches matrices keyed on the vocab).
+# Codes do depend on load order, so they are never persisted — cached frames
+# are re-encoded on load and the Mongo documents leave them out.
+
+INDUSTRY_VOCAB = [None] + sorted(
+    set(INDUSTRY_ADJACENCY) | {ind for adj in INDUSTRY_ADJACENCY.values() for ind in adj}
+)
+_INDUSTRY_CODES = {label: code for code, label in enumerate(INDUSTRY_VOCAB)}
+
+
+def _industry_label(val):
+    """Normalise an Industry value the way score_industry_match compares it (None = missing)."""
+    return str(val).strip() if val else None
+
+
+def encode_industries(series: pd.Series) -> np.ndarray:
+    """Map a raw Industry column to int16 codes into INDUSTRY_VOCAB."""
+    codes, uniques = pd.factorize(series.astype(object), use_na_sentinel=False)
+    unique_codes = np.empty(len(uniques), dtype=np.int16)
+    for i, val in enumerate(uniques):
+        label = _industry_label(val)
+        if label not in _INDUSTRY_CODES:
+            _INDUSTRY_CODES[label] = len(INDUSTRY_VOCAB)
+            INDUSTRY_VOCAB.append(label)
+        unique_codes[i] = _INDUSTRY_CODES[label]
+    return unique_codes[codes]
+
+
+# ─── CSV SCHEMAS ─────────────────────────────────────────────────────────────
+# Columns read from each source and their dtypes, so the reader neither
+# infers types over whole object columns nor keeps columns nobody uses.
+# Every listed column is consumed — by scoring, or by the raw block of the
+# MongoDB documents. Dtypes are the ones the CSVs parse to today, except
+# the low-cardinality dimensions, which are categoricals. Scores stay float64:
+# float32 would shift composite scores and reorder decks.
+# Measures that may hold "Unknown" read it as NaN (cleaned to the same
+# fallback); flag columns are left alone, since _safe_binary("1.0") != 1.0.
+
+IMPORTER_SCHEMA = {
+    "Record_ID":              "int64",
+    "Date":                   "str",
+    "Buyer_ID":               "str",
+    "Country":                "category",
+    "Industry":               "category",
+    "Avg_Order_Tons":         "float64",
+    "Revenue_Size_USD":       "int64",
+    "Team_Size":              "int64",
+    "Certification":          "str",
+    "Good_Payment_History":   "int64",
+    "Prompt_Response":        "float64",
+    "Hiring_Growth":          "int64",
+    "Funding_Event":          "str",      # "1" / "0" / "Unknown"
+    "Engagement_Spike":       "int64",
+    "SalesNav_ProfileVisits": "int64",
+    "DecisionMaker_Change":   "int64",
+    "Intent_Score":           "float64",
+    "Preferred_Channel":      "str",
+    "Response_Probability":   "float64",
+    "Tariff_News":            "int64",
+    "StockMarket_Shock":      "int64",
+    "War_Event":              "int64",
+    "Natural_Calamity":       "int64",
+    "Currency_Fluctuation":   "float64",
+}
+
+EXPORTER_SCHEMA = {
+    "Record_ID":                   "int64",
+    "Date":                        "str",
+    "Exporter_ID":                 "str",
+    "State":                       "str",
+    "Industry":                    "category",
+    "MSME_Udyam":                  "float64",
+    "Manufacturing_Capacity_Tons": "float64",
+    "Revenue_Size_USD":            "int64",
+    "Team_Size":                   "int64",
+    "Certification":               "str",
+    "Good_Payment_Terms":          "int64",
+    "Prompt_Response_Score":       "float64",
+    "Hiring_Signal":               "int64",
+    "LinkedIn_Activity":           "int64",
+    "SalesNav_ProfileViews":       "int64",
+    "SalesNav_JobChange":          "int64",
+    "Intent_Score":                "float64",
+    "Shipment_Value_USD":          "float64",
+    "Quantity_Tons":               "int64",
+    "Tariff_Impact":               "float64",
+    "StockMarket_Impact":          "float64",
+    "War_Risk":                    "int64",
+    "Natural_Calamity_Risk":       "int64",
+    "Currency_Shift":              "float64",
+}
+
+NEWS_SCHEMA = {
+    "News_ID":               "int64",
+    "Date":                  "str",
+    "Region":                "category",
+    "Event_Type":            "category",
+    "Impact_Level":          "str",
+    "Affected_Industry":     "str",
+    "Tariff_Change":         "float64",
+    "StockMarket_Shock":     "float64",
+    "War_Flag":              "int64",
+    "Natural_Calamity_Flag": "int64",
+    "Currency_Shift":        "float64",
+}
+
+# Extra missing-value tokens for float measures (on top of pandas' defaults)
+_MEASURE_NA_VALUES = ["Unknown", "unknown", "UNKNOWN", "none"]
+
+
+def _csv_engine() -> str:
+    """CSV_ENGINE, downgraded to "c" when pyarrow is not installed."""
+    if CSV_ENGINE == "pyarrow":
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            print("  [Loader] pyarrow not installed — using the C CSV engine")
+            return "c"
+    return CSV_ENGINE
+
+
+def read_source_csv(filepath: str, schema: dict) -> pd.DataFrame:
+    """
+    Read a source CSV with its schema: only the schema's columns, explicit
+    dtypes and NA tokens. A file whose values don't fit the declared dtypes
+    (e.g. a blank in an integer column) is re-read with inferred dtypes for
+    everything but the categoricals, so a messy dump degrades to the old
+    behaviour instead of failing.
+    """
+    engine  = _csv_engine()
+    options = _read_options(filepath, schema, engine)
+
+    try:
+        return pd.read_csv(filepath, engine=engine, **options)
+    except (ValueError, TypeError) as exc:
+        print(f"  [Loader] {filepath}: typed read failed ({exc}); inferring dtypes")
+        categories = {c: "category" for c, t in options["dtype"].items() if t == "category"}
+        return pd.read_csv(filepath, usecols=options["usecols"], dtype=categories)
+
+
+def _read_options(filepath: str, schema: dict, engine: str) -> dict:
+    """usecols / dtype / na_values reader arguments for a schema."""
+    header  = pd.read_csv(filepath, nrows=0).columns
+    usecols = [c for c in header if c in schema]
+    options = {"usecols": usecols, "dtype": {c: schema[c] for c in usecols}}
+    if engine != "pyarrow":   # pyarrow takes no per-column na_values
+        options["na_values"] = {c: _MEASURE_NA_VALUES for c in usecols if schema[c] == "float64"}
+    return options
+
+
+# ─── SHARED SOURCE READ ──────────────────────────────────────────────────────
+# In the transform graph each source CSV is parsed once, as text
+# ({kind}.source: every column exactly as written, blanks as ""). Its
+# consumers derive their own view from that frame instead of re-reading the
+# file:
+#   {kind}.raw      type_source_frame — the scoring schema's columns, dtypes
+#                   and NA tokens, equal to read_source_csv with the C engine
+#   {kind}.profile  the cells as written (see DATA-QUALITY PROFILE)
+#   {kind}.rag_base infer_csv_dtypes — what a plain pd.read_csv would give
+# The text read always uses the C engine: pyarrow parses numbers before
+# turning them into text ("1" comes back as "1.0"). read_source_csv still
+# reads a file directly (delta files) with CSV_ENGINE.
+
+# pandas' default na_values (pd.read_csv docs), for views built from text
+_CSV_NA_TOKENS = (
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan", "1.#IND", "1.#QNAN",
+    "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null",
+)
+_CSV_TRUE_TOKENS  = ("True", "TRUE", "true")
+_CSV_FALSE_TOKENS = ("False", "FALSE", "false")
+
+
+def read_source_text(filepath: str, schema: dict = None) -> pd.DataFrame:
+    """A source CSV exactly as written: all str, blanks as "" (only the schema's columns, if given)."""
+    usecols = None
+    if schema is not None:
+        usecols = [c for c in pd.read_csv(filepath, nrows=0).columns if c in schema]
+    return pd.read_csv(filepath, usecols=usecols, dtype=str, keep_default_na=False)
+
+
+def _infer_column(text: pd.Series) -> pd.Series:
+    """One text column with pandas' default NA tokens and dtype inference."""
+    values = text.mask(text.isin(_CSV_NA_TOKENS))
+    try:
+        return pd.to_numeric(values)
+    except (ValueError, TypeError):
+        pass
+    if values.dropna().isin(_CSV_TRUE_TOKENS + _CSV_FALSE_TOKENS).all():
+        flags = values.isin(_CSV_TRUE_TOKENS)
+        return flags if values.notna().all() else flags.astype(object).where(values.notna(), np.nan)
+    return values
+
+
+def infer_csv_dtypes(text: pd.DataFrame) -> pd.DataFrame:
+    """A read_source_text frame as a plain pd.read_csv of the file would give it."""
+    return pd.DataFrame({col: _infer_column(text[col]) for col in text.columns}, index=text.index)
+
+
+def _typed_column(text: pd.Series, dtype: str) -> pd.Series:
+    """One text column as read_source_csv reads it with a schema dtype (raises where it would)."""
+    na_tokens = _CSV_NA_TOKENS + tuple(_MEASURE_NA_VALUES) if dtype == "float64" else _CSV_NA_TOKENS
+    values = text.mask(text.isin(na_tokens))
+    if dtype not in ("int64", "float64"):
+        return values.astype(dtype)
+    numbers = pd.to_numeric(values)
+    if dtype == "int64" and (numbers.isna().any() or (numbers % 1 != 0).any()):
+        raise ValueError(f"{text.name}: blank or non-integer values in an int64 column")
+    return numbers.astype(dtype)
+
+
+def type_source_frame(text: pd.DataFrame, schema: dict, filepath: str = "") -> pd.DataFrame:
+    """
+    {kind}.raw: the schema's columns of a read_source_text frame, typed as
+    read_source_csv types them — including its fallback to inferred dtypes
+    (categoricals kept) when a value doesn't fit.
+    """
+    columns = [c for c in text.columns if c in schema]
+    try:
+        typed = {c: _typed_column(text[c], schema[c]) for c in columns}
+    except (ValueError, TypeError) as exc:
+        print(f"  [Loader] {filepath}: typed read failed ({exc}); inferring dtypes")
+        typed = {c: (_typed_column(text[c], "category") if schema[c] == "category" else _infer_column(text[c]))
+                 for c in columns}
+    return pd.DataFrame(typed, index=text.index)
+
+
+# ─── DATA-QUALITY PROFILE ────────────────────────────────────────────────────
+# Built from the source cells as written ({kind}.source), not the typed
+# read: that one has already turned "Unknown" / "NA" into NaN, which would hide
+# exactly the dirty tokens the profile is for. Per column: the rate of blank
+# cells (null_rate) and, separately, of NA placeholder tokens (na_token_rate,
+# with the tokens found); for numeric measures, the values that are not
+# numbers at all (with the most common offending tokens) and those outside
+# the expected range; for text / categorical columns, the number of distinct
+# values. Plus the range of parseable record dates.
+
+# Expected (low, high) per numeric source column; None = unbounded
+_SCORE, _SHIFT, _SIZE = (0, 1), (-1, 1), (0, None)
+
+_VALUE_RANGES = {
+    "importers": {
+        "Avg_Order_Tons": _SIZE, "Revenue_Size_USD": _SIZE, "Team_Size": _SIZE,
+        "Good_Payment_History": _SCORE, "Prompt_Response": _SCORE, "Hiring_Growth": _SCORE,
+        "Funding_Event": _SCORE, "Engagement_Spike": _SCORE, "SalesNav_ProfileVisits": _SIZE,
+        "DecisionMaker_Change": _SCORE, "Intent_Score": _SCORE, "Response_Probability": _SCORE,
+        "Tariff_News": _SCORE, "StockMarket_Shock": _SCORE, "War_Event": _SCORE,
+        "Natural_Calamity": _SCORE, "Currency_Fluctuation": _SHIFT,
+    },
+    "exporters": {
+        "MSME_Udyam": _SCORE, "Manufacturing_Capacity_Tons": _SIZE, "Revenue_Size_USD": _SIZE,
+        "Team_Size": _SIZE, "Good_Payment_Terms": _SCORE, "Prompt_Response_Score": _SCORE,
+        "Hiring_Signal": _SCORE, "LinkedIn_Activity": _SIZE, "SalesNav_ProfileViews": _SIZE,
+        "SalesNav_JobChange": _SCORE, "Intent_Score": _SCORE, "Shipment_Value_USD": _SIZE,
+        "Quantity_Tons": _SIZE, "Tariff_Impact": _SHIFT, "StockMarket_Impact": _SHIFT,
+        "War_Risk": _SCORE, "Natural_Calamity_Risk": _SCORE, "Currency_Shift": _SHIFT,
+    },
+    "news": {
+        "Tariff_Change": _SHIFT, "StockMarket_Shock": _SHIFT, "War_Flag": _SCORE,
+        "Natural_Calamity_Flag": _SCORE, "Currency_Shift": _SHIFT,
+    },
+}
+
+# Offending tokens listed per column in the report
+_PROFILE_TOP_TOKENS = 10
+
+
+def _out_of_range(values: pd.Series, bounds: tuple) -> pd.Series:
+    """Boolean mask of numeric values outside bounds (NaN is never out of range)."""
+    low, high = bounds
+    mask = pd.Series(False, index=values.index)
+    if low is not None:
+        mask |= values < low
+    if high is not None:
+        mask |= values > high
+    return mask
+
+
+def _top_tokens(counts: pd.Series, mask: np.ndarray) -> dict:
+    """The most common values of counts selected by mask, for the report."""
+    top = counts[mask].head(_PROFILE_TOP_TOKENS)
+    return {str(k): int(v) for k, v in top.items()}
+
+
+def profile_frame(df: pd.DataFrame, schema: dict, kind: str) -> dict:
+    """
+    Data-quality profile of a source frame (see DATA-QUALITY PROFILE), read
+    with read_source_text. Text columns are profiled per distinct value;
+    columns that are already numeric (a typed read) with column reductions
+    and without token counts.
+    """
+    ranges  = _VALUE_RANGES.get(kind, {})
+    n_rows  = len(df)
+    columns = {}
+    for col in (c for c in schema if c in df.columns):
+        series = df[col]
+        bounds = ranges.get(col)
+        entry  = {}
+
+        if pd.api.types.is_numeric_dtype(series.dtype):
+            blank = int(series.isna().sum())
+            if bounds is not None:
+                entry["unparseable"]  = 0
+                entry["out_of_range"] = int(_out_of_range(series, bounds).sum())
+        else:
+            counts = series.astype(object).value_counts(dropna=False)
+            tokens = pd.Series(counts.index, dtype=object)
+            norm   = tokens.astype(str).str.strip().str.lower()
+            is_blank = (tokens.isna() | norm.eq("")).to_numpy()
+            is_token = ~is_blank & norm.isin(_NA_TOKENS).to_numpy()
+            weight = counts.to_numpy()
+            blank  = int(weight[is_blank].sum())
+            if is_token.any():
+                entry["na_token_rate"] = round(int(weight[is_token].sum()) / n_rows, 4)
+                entry["na_tokens"]     = _top_tokens(counts, is_token)
+            if bounds is not None:
+                parsed = pd.to_numeric(tokens.astype(str).str.strip(), errors="coerce")
+                bad    = ~is_blank & ~is_token & parsed.isna().to_numpy()
+                entry["unparseable"]  = int(weight[bad].sum())
+                entry["out_of_range"] = int(weight[_out_of_range(parsed, bounds).to_numpy()].sum())
+                if bad.any():
+                    entry["unparseable_tokens"] = _top_tokens(counts, bad)
+            elif schema[col] not in ("int64", "float64"):
+                entry["cardinality"] = int((~is_blank & ~is_token).sum())
+
+        columns[col] = {"null_rate": round(blank / n_rows, 4) if n_rows else 0.0, **entry}
+
+    report = {"rows": n_rows, "columns": columns}
+    if "Date" in df.columns:
+        parsed  = _parse_record_dates(df["Date"])
+        present = df["Date"].notna() & df["Date"].astype(str).str.strip().ne("")
+        report["date_range"] = {
+            "min":     parsed.min().date().isoformat() if parsed.notna().any() else None,
+            "max":     parsed.max().date().isoformat() if parsed.notna().any() else None,
+            "invalid": int((parsed.isna() & present).sum()),
+        }
+    return report
+
+
+def _profile_summary(kind: str, profile: dict) -> str:
+    """One-line console summary of a profile."""
+    cols = profile["columns"].values()
+    return (f"  [Profile] {kind}: {profile['rows']} rows | "
+            f"{sum(c.get('unparseable', 0) for c in cols)} unparseable values | "
+            f"{sum(sum(c.get('na_tokens', {}).values()) for c in cols)} NA tokens | "
+            f"{sum(c.get('out_of_range', 0) for c in cols)} out of range | "
+            f"{profile.get('date_range', {}).get('invalid', 0)} invalid dates")
+
+
+# ─── CLEANED-DATA CACHE ──────────────────────────────────────────────────────
+# Each source is a chain of transform_graph stages — {kind}.source (the one
+# text parse), {kind}.raw (its typed projection), {kind}.clean and
+# {kind}.profile — declared in the same graph as the RAG export's stages
+# (rag_transforms), which start from the same {kind}.source.
+# Cleaned frames are written to DATA_CACHE_DIR as uncompressed Feather files
+# and read back on later runs (a copy into pandas, skipping the CSV parse and
+# cleaning). A stage's key covers everything its output depends on: the
+# source bytes, the code of the stage and of the helpers _SOURCES lists for
+# it, every config value, the token sets, the read schema and the recency
+# reference date.
+# Needs pyarrow; without it every run cleans from CSV as before.
+
+# Bump whenever a change the stage keys can't see (e.g. to a helper missing
+# from _SOURCES / _CLEANING_HELPERS) alters the cleaned output
+CLEANING_VERSION = 3
+
+
+def _profile_stage(text: pd.DataFrame, cleaned: pd.DataFrame, schema: dict, kind: str) -> dict:
+    """{kind}.profile: profile_frame of the source text, plus rows cleaning dropped."""
+    profile = profile_frame(text, schema, kind)
+    profile["rows_dropped"] = profile["rows"] - len(cleaned)
+    return profile
+
+
+def add_source_read(graph: TransformGraph, kind: str, filepath: str) -> TransformGraph:
+    """Declare {kind}.source, the one parse of a source CSV (see SHARED SOURCE READ), once."""
+    if f"{kind}.source" not in graph:
+        graph.add(f"{kind}.source", read_source_text, params={"filepath": filepath}, source=filepath)
+    return graph
+
+
+def add_source_stages(graph: TransformGraph, kind: str, filepath: str, as_of=None) -> TransformGraph:
+    """Declare {kind}.source, {kind}.raw, {kind}.clean and {kind}.profile for one source CSV."""
+    schema, clean, helpers = _SOURCES[kind]
+    settings = sorted((name, getattr(config, name)) for name in dir(config) if name.isupper())
+    tokens   = (_NA_TOKENS, _TRUE_TOKENS, _FALSE_TOKENS)
+
+    # raw is cheap to re-derive from the cached text, so it is not cached itself
+    add_source_read(graph, kind, filepath)
+    graph.add(f"{kind}.raw", type_source_frame, inputs=[f"{kind}.source"],
+              params={"schema": schema, "filepath": filepath},
+              code=(_typed_column, _infer_column), cache=False,
+              version=(_MEASURE_NA_VALUES, _CSV_NA_TOKENS, _CSV_TRUE_TOKENS, _CSV_FALSE_TOKENS))
+    graph.add(f"{kind}.clean", clean, inputs=[f"{kind}.raw"],
+              params={"as_of": _as_of_day(as_of).date().isoformat()},
+              code=_CLEANING_HELPERS + helpers,
+              version=(CLEANING_VERSION, settings, tokens))
+    graph.add(f"{kind}.profile", _profile_stage, inputs=[f"{kind}.source", f"{kind}.clean"],
+              params={"schema": schema, "kind": kind},
+              code=(profile_frame, _top_tokens, _out_of_range, _parse_record_dates),
+              version=(_VALUE_RANGES, tokens))
+    return graph
+
+
+def load_cleaned(kind: str, filepath: str, as_of=None, quality_report: dict = None) -> pd.DataFrame:
+    """
+    Read + clean a source CSV, or load its cached cleaned frame.
+
+    Industry codes are re-encoded after loading: INDUSTRY_VOCAB grows in
+    load order within a process, so cached codes may not match this run's.
+    quality_report: if given, quality_report[kind] is set to the dataset's
+    profile_frame report (cached next to the frame).
+    """
+    graph = add_source_stages(TransformGraph(DATA_CACHE_DIR), kind, filepath, as_of)
+    df = graph.run(f"{kind}.clean")
+    if "clean_industry_code" in df.columns:
+        df["clean_industry_code"] = encode_industries(df["Industry"])
+
+    if quality_report is not None:
+        quality_report[kind] = graph.run(f"{kind}.profile")
+        print(_profile_summary(kind, quality_report[kind]))
+    return df
+
+
 # ─── IMPORTER (BUYER) CLEANING ───────────────────────────────────────────────
 
-def load_importers(filepath: str) -> pd.DataFrame:
+def _clean_importers(df: pd.DataFrame, as_of=None) -> pd.DataFrame:
     """
-    Load and clean importer CSV.
+    Clean a raw importer frame (as read with IMPORTER_SCHEMA).
     Returns DataFrame with original fields + clean_* derived fields.
     """
-    df = pd.read_csv(filepath)
-
     # ── Drop rows with no Buyer_ID (can't match without identity) ──
     df = df[df["Buyer_ID"].notna() & df["Buyer_ID"].astype(str).str.strip().ne("")]
     df = df.reset_index(drop=True)
 
     # ── Clean: Numeric continuous fields ──
-    df["clean_avg_order_tons"]      = df["Avg_Order_Tons"].apply(lambda x: _safe_float(x, fallback=np.nan))
-    df["clean_revenue_usd"]         = df["Revenue_Size_USD"].apply(lambda x: _safe_float(x, fallback=0))
-    df["clean_team_size"]           = df["Team_Size"].apply(lambda x: _safe_float(x, fallback=0))
-    df["clean_prompt_response"]     = df["Prompt_Response"].apply(lambda x: _safe_float(x, fallback=0.5))
-    df["clean_intent_score"]        = df["Intent_Score"].apply(lambda x: _safe_float(x, fallback=0.3))
-    df["clean_response_probability"]= df["Response_Probability"].apply(lambda x: _safe_float(x, fallback=0.3))
-    df["clean_currency_fluctuation"]= df["Currency_Fluctuation"].apply(lambda x: _safe_float(x, fallback=0.0))
-    df["clean_profile_visits"]      = df["SalesNav_ProfileVisits"].apply(lambda x: _safe_float(x, fallback=0))
+    df["clean_avg_order_tons"]      = _safe_float_col(df["Avg_Order_Tons"], fallback=np.nan)
+    df["clean_revenue_usd"]         = _safe_float_col(df["Revenue_Size_USD"], fallback=0)
+    df["clean_team_size"]           = _safe_float_col(df["Team_Size"], fallback=0)
+    df["clean_prompt_response"]     = _safe_float_col(df["Prompt_Response"], fallback=0.5)
+    df["clean_intent_score"]        = _safe_float_col(df["Intent_Score"], fallback=0.3)
+    df["clean_response_probability"]= _safe_float_col(df["Response_Probability"], fallback=0.3)
+    df["clean_currency_fluctuation"]= _safe_float_col(df["Currency_Fluctuation"], fallback=0.0)
+    df["clean_profile_visits"]      = _safe_float_col(df["SalesNav_ProfileVisits"], fallback=0)
 
     # ── Clean: Binary flag fields ──
-    df["clean_good_payment"]         = df["Good_Payment_History"].apply(_safe_binary)
-    df["clean_hiring_growth"]        = df["Hiring_Growth"].apply(_safe_binary)
-    df["clean_engagement_spike"]     = df["Engagement_Spike"].apply(_safe_binary)
-    df["clean_decision_maker_change"]= df["DecisionMaker_Change"].apply(_safe_binary)
-    df["clean_funding_event"]        = df["Funding_Event"].apply(lambda x: _safe_binary(x, unknown_fallback=0.1))
-    df["clean_tariff_news"]          = df["Tariff_News"].apply(_safe_binary)
-    df["clean_stock_shock"]          = df["StockMarket_Shock"].apply(_safe_binary)
-    df["clean_war_event"]            = df["War_Event"].apply(_safe_binary)
-    df["clean_natural_calamity"]     = df["Natural_Calamity"].apply(_safe_binary)
+    df["clean_good_payment"]         = _safe_binary_col(df["Good_Payment_History"])
+    df["clean_hiring_growth"]        = _safe_binary_col(df["Hiring_Growth"])
+    df["clean_engagement_spike"]     = _safe_binary_col(df["Engagement_Spike"])
+    df["clean_decision_maker_change"]= _safe_binary_col(df["DecisionMaker_Change"])
+    df["clean_funding_event"]        = _safe_binary_col(df["Funding_Event"], unknown_fallback=0.1)
+    df["clean_tariff_news"]          = _safe_binary_col(df["Tariff_News"])
+    df["clean_stock_shock"]          = _safe_binary_col(df["StockMarket_Shock"])
+    df["clean_war_event"]            = _safe_binary_col(df["War_Event"])
+    df["clean_natural_calamity"]     = _safe_binary_col(df["Natural_Calamity"])
+
+    # ── Clean: Industry code (index into INDUSTRY_VOCAB) ──
+    df["clean_industry_code"] = encode_industries(df["Industry"])
 
     # ── Derived: Normalize profile visits (0–1) ──
     df["norm_profile_visits"] = (
@@ -106,33 +585,33 @@ def load_importers(filepath: str) -> pd.DataFrame:
     )
 
     # ── Derived: Recency weight ──
-    df["recency_weight"] = df["Date"].apply(_recency_weight)
+    df["recency_weight"] = _recency_weight_col(df["Date"], as_of)
 
     # ── Derived: Missing data score (transparency metric for UI) ──
     critical_fields = ["clean_avg_order_tons", "clean_response_probability"]
-    df["data_completeness"] = df.apply(
-        lambda row: 1.0 - sum(pd.isna(row[f]) for f in critical_fields) / len(critical_fields),
-        axis=1
-    )
+    df["data_completeness"] = 1.0 - df[critical_fields].isna().sum(axis=1) / len(critical_fields)
 
     # ── Clean: Preferred channel (standardise casing, fill blanks) ──
     df["clean_channel"] = df["Preferred_Channel"].fillna("Unknown").str.strip().str.title()
     df.loc[df["clean_channel"] == "", "clean_channel"] = "Unknown"
 
+    return _derive_importer_scores(df)
+
+
+def _derive_importer_scores(df: pd.DataFrame) -> pd.DataFrame:
+    """Card-display scores built from the clean_* signals (re-run after entity resolution)."""
     # ── Derived: Buyer activity tier (for card display) ──
-    def activity_tier(row):
-        signals = (
-            (row["clean_hiring_growth"] > 0.5) +
-            (row["clean_funding_event"] > 0.5) +
-            (row["clean_engagement_spike"] > 0.5) +
-            (row["clean_decision_maker_change"] > 0.5)
-        )
-        if signals >= 3: return "High Activity"
-        if signals == 2: return "Growing"
-        if signals == 1: return "Stable"
-        return "Low Activity"
-
-    df["buyer_activity_tier"] = df.apply(activity_tier, axis=1)
+    signals = (
+        (df["clean_hiring_growth"] > 0.5).astype(int) +
+        (df["clean_funding_event"] > 0.5).astype(int) +
+        (df["clean_engagement_spike"] > 0.5).astype(int) +
+        (df["clean_decision_maker_change"] > 0.5).astype(int)
+    )
+    df["buyer_activity_tier"] = np.select(
+        [signals >= 3, signals == 2, signals == 1],
+        ["High Activity", "Growing", "Stable"],
+        default="Low Activity",
+    )
 
     # ── Derived: Market momentum score (0–1) ──
     df["market_momentum_score"] = (
@@ -147,61 +626,123 @@ def load_importers(filepath: str) -> pd.DataFrame:
         df["clean_response_probability"].fillna(0.3) * 0.4
     ).clip(0, 1)
 
+    return df
+
+
+def load_importers(filepath: str, as_of=None, quality_report: dict = None) -> pd.DataFrame:
+    """
+    Load and clean importer CSV.
+    Returns DataFrame with original fields + clean_* derived fields.
+    Served from the cleaned-data cache when the file is unchanged.
+    as_of: reference date for recency_weight (default: today).
+    quality_report: optional dict that receives the data-quality profile.
+    """
+    df = load_cleaned("importers", filepath, as_of, quality_report)
+
     print(f"[Importers] Loaded {len(df)} records | {df['Industry'].nunique()} industries | "
           f"{df['Country'].nunique()} countries")
     return df
 
 
+def iter_importers(filepath: str, chunk_size: int = IMPORTER_CHUNK_SIZE, as_of=None):
+    """
+    Stream an importer CSV (e.g. a dump larger than RAM) as cleaned chunks of
+    up to chunk_size rows, holding one chunk in memory at a time.
+
+    Every derived column is row-local, so a chunk is cleaned exactly as
+    load_importers cleans those rows, with these chunk-safety rules:
+      - categorical schema columns come back as str (categories inferred per
+        chunk would not line up across chunks);
+      - float clean_* columns are always float64 (a chunk where a column is
+        entirely missing would otherwise come out int64);
+      - the index keeps counting across chunks (global buyer position).
+    Industry codes come from the shared INDUSTRY_VOCAB, so they agree across
+    chunks. Chunks bypass the cleaned-data cache, and a value that doesn't fit
+    the schema raises (a stream can't be re-read with inferred dtypes).
+    """
+    options = _read_options(filepath, IMPORTER_SCHEMA, "c")   # pyarrow can't chunk
+    options["dtype"] = {c: ("str" if t == "category" else t) for c, t in options["dtype"].items()}
+
+    offset = 0
+    for raw in pd.read_csv(filepath, chunksize=chunk_size, **options):
+        chunk = _clean_importers(raw, as_of)
+        for col in chunk.columns:
+            if col.startswith("clean_") and col != "clean_industry_code" \
+                    and pd.api.types.is_integer_dtype(chunk[col]):
+                chunk[col] = chunk[col].astype(np.float64)
+        chunk.index = pd.RangeIndex(offset, offset + len(chunk))
+        offset += len(chunk)
+        yield chunk
+
+
 # ─── EXPORTER CLEANING ───────────────────────────────────────────────────────
 
-def load_exporters(filepath: str) -> pd.DataFrame:
+def _clean_exporters(df: pd.DataFrame, as_of=None) -> pd.DataFrame:
     """
-    Load and clean exporter CSV.
+    Clean a raw exporter frame (as read with EXPORTER_SCHEMA).
     Returns DataFrame with original fields + clean_* derived fields.
     """
-    df = pd.read_csv(filepath)
     df = df[df["Exporter_ID"].notna()].reset_index(drop=True)
 
     # ── Clean: Numeric fields ──
-    df["clean_manufacturing_capacity"] = df["Manufacturing_Capacity_Tons"].apply(lambda x: _safe_float(x, 0))
-    df["clean_revenue_usd"]            = df["Revenue_Size_USD"].apply(lambda x: _safe_float(x, 0))
-    df["clean_team_size"]              = df["Team_Size"].apply(lambda x: _safe_float(x, 0))
-    df["clean_prompt_response_score"]  = df["Prompt_Response_Score"].apply(lambda x: _safe_float(x, 0.5))
-    df["clean_intent_score"]           = df["Intent_Score"].apply(lambda x: _safe_float(x, 0.3))
-    df["clean_shipment_value_usd"]     = df["Shipment_Value_USD"].apply(lambda x: _safe_float(x, np.nan))
-    df["clean_quantity_tons"]          = df["Quantity_Tons"].apply(lambda x: _safe_float(x, np.nan))
-    df["clean_linkedin_activity"]      = df["LinkedIn_Activity"].apply(lambda x: _safe_float(x, 0))
-    df["clean_tariff_impact"]          = df["Tariff_Impact"].apply(lambda x: _safe_float(x, 0))
-    df["clean_stock_impact"]           = df["StockMarket_Impact"].apply(lambda x: _safe_float(x, 0))
-    df["clean_war_risk"]               = df["War_Risk"].apply(_safe_binary)
-    df["clean_natural_calamity_risk"]  = df["Natural_Calamity_Risk"].apply(_safe_binary)
-    df["clean_currency_shift"]         = df["Currency_Shift"].apply(lambda x: _safe_float(x, 0))
+    df["clean_manufacturing_capacity"] = _safe_float_col(df["Manufacturing_Capacity_Tons"], 0)
+    df["clean_revenue_usd"]            = _safe_float_col(df["Revenue_Size_USD"], 0)
+    df["clean_team_size"]              = _safe_float_col(df["Team_Size"], 0)
+    df["clean_prompt_response_score"]  = _safe_float_col(df["Prompt_Response_Score"], 0.5)
+    df["clean_intent_score"]           = _safe_float_col(df["Intent_Score"], 0.3)
+    df["clean_shipment_value_usd"]     = _safe_float_col(df["Shipment_Value_USD"], np.nan)
+    df["clean_quantity_tons"]          = _safe_float_col(df["Quantity_Tons"], np.nan)
+    df["clean_linkedin_activity"]      = _safe_float_col(df["LinkedIn_Activity"], 0)
+    df["clean_tariff_impact"]          = _safe_float_col(df["Tariff_Impact"], 0)
+    df["clean_stock_impact"]           = _safe_float_col(df["StockMarket_Impact"], 0)
+    df["clean_war_risk"]               = _safe_binary_col(df["War_Risk"])
+    df["clean_natural_calamity_risk"]  = _safe_binary_col(df["Natural_Calamity_Risk"])
+    df["clean_currency_shift"]         = _safe_float_col(df["Currency_Shift"], 0)
 
     # ── Clean: Binary / categorical ──
-    df["clean_good_payment_terms"] = df["Good_Payment_Terms"].apply(_safe_binary)
-    df["clean_hiring_signal"]      = df["Hiring_Signal"].apply(_safe_binary)
-    df["clean_msme"]               = df["MSME_Udyam"].apply(lambda x: _safe_binary(x, 0))
-    df["clean_job_change"]         = df["SalesNav_JobChange"].apply(_safe_binary)
+    df["clean_good_payment_terms"] = _safe_binary_col(df["Good_Payment_Terms"])
+    df["clean_hiring_signal"]      = _safe_binary_col(df["Hiring_Signal"])
+    df["clean_msme"]               = _safe_binary_col(df["MSME_Udyam"], 0)
+    df["clean_job_change"]         = _safe_binary_col(df["SalesNav_JobChange"])
+
+    # ── Clean: Industry code (index into INDUSTRY_VOCAB) ──
+    df["clean_industry_code"] = encode_industries(df["Industry"])
 
     # ── Derived: Recency weight ──
-    df["recency_weight"] = df["Date"].apply(_recency_weight)
+    df["recency_weight"] = _recency_weight_col(df["Date"], as_of)
 
     # ── Derived: Export capacity tier ──
-    def capacity_tier(row):
-        cap = row["clean_manufacturing_capacity"]
-        if cap == 0 or pd.isna(cap):   return "Unknown"
-        if cap >= 6000:                  return "Large"
-        if cap >= 2000:                  return "Medium"
-        return "Small"
+    cap = df["clean_manufacturing_capacity"]
+    df["capacity_tier"] = np.select(
+        [(cap == 0) | cap.isna(), cap >= 6000, cap >= 2000],
+        ["Unknown", "Large", "Medium"],
+        default="Small",
+    )
+
+    return _derive_exporter_scores(df)
 
-    df["capacity_tier"] = df.apply(capacity_tier, axis=1)
 
+def _derive_exporter_scores(df: pd.DataFrame) -> pd.DataFrame:
+    """Matching-context scores built from the clean_* signals (re-run after entity resolution)."""
     # ── Derived: Exporter reliability score (used for matching context) ──
     df["exporter_reliability"] = (
         df["clean_good_payment_terms"] * 0.5 +
         df["clean_prompt_response_score"] * 0.5
     ).clip(0, 1)
 
+    return df
+
+
+def load_exporters(filepath: str, as_of=None, quality_report: dict = None) -> pd.DataFrame:
+    """
+    Load and clean exporter CSV.
+    Returns DataFrame with original fields + clean_* derived fields.
+    Served from the cleaned-data cache when the file is unchanged.
+    as_of: reference date for recency_weight (default: today).
+    quality_report: optional dict that receives the data-quality profile.
+    """
+    df = load_cleaned("exporters", filepath, as_of, quality_report)
+
     print(f"[Exporters] Loaded {len(df)} records | {df['Industry'].nunique()} industries | "
           f"{df['State'].nunique()} states")
     return df
@@ -209,20 +750,205 @@ def load_exporters(filepath: str) -> pd.DataFrame:
 
 # ─── GLOBAL NEWS CLEANING ────────────────────────────────────────────────────
 
-def load_news(filepath: str) -> pd.DataFrame:
+def _clean_news(df: pd.DataFrame, as_of=None) -> pd.DataFrame:
     """
-    Load and clean global news CSV.
+    Clean a raw news frame (as read with NEWS_SCHEMA).
     Adds recency weight and normalised impact fields.
     """
-    df = pd.read_csv(filepath)
+    df["clean_tariff_change"]    = _safe_float_col(df["Tariff_Change"], 0)
+    df["clean_stock_shock"]      = _safe_float_col(df["StockMarket_Shock"], 0)
+    df["clean_war_flag"]         = _safe_binary_col(df["War_Flag"])
+    df["clean_calamity_flag"]    = _safe_binary_col(df["Natural_Calamity_Flag"])
+    df["clean_currency_shift"]   = _safe_float_col(df["Currency_Shift"], 0)
+    df["recency_weight"]         = _recency_weight_col(df["Date"], as_of)
+    return df
 
-    df["clean_tariff_change"]    = df["Tariff_Change"].apply(lambda x: _safe_float(x, 0))
-    df["clean_stock_shock"]      = df["StockMarket_Shock"].apply(lambda x: _safe_float(x, 0))
-    df["clean_war_flag"]         = df["War_Flag"].apply(_safe_binary)
-    df["clean_calamity_flag"]    = df["Natural_Calamity_Flag"].apply(_safe_binary)
-    df["clean_currency_shift"]   = df["Currency_Shift"].apply(lambda x: _safe_float(x, 0))
-    df["recency_weight"]         = df["Date"].apply(_recency_weight)
+
+def load_news(filepath: str, as_of=None, quality_report: dict = None) -> pd.DataFrame:
+    """
+    Load and clean global news CSV.
+    Adds recency weight and normalised impact fields.
+    Served from the cleaned-data cache when the file is unchanged.
+    as_of: reference date for recency_weight (default: today).
+    quality_report: optional dict that receives the data-quality profile.
+    """
+    df = load_cleaned("news", filepath, as_of, quality_report)
 
     print(f"[News] Loaded {len(df)} events | {df['Event_Type'].nunique()} event types | "
           f"{df['Region'].nunique()} regions")
     return df
+
+
+# Helpers every cleaner calls; their source is part of each {kind}.clean key
+_CLEANING_HELPERS = (
+    _safe_float, _safe_binary, _map_distinct, _safe_float_col, _safe_binary_col,
+    _as_of_day, _parse_record_dates, _recency_weight_col, _industry_label, encode_industries,
+)
+
+# Read schema, cleaner and the cleaner's own helpers per source (see add_source_stages)
+_SOURCES = {
+    "importers": (IMPORTER_SCHEMA, _clean_importers, (_derive_importer_scores,)),
+    "exporters": (EXPORTER_SCHEMA, _clean_exporters, (_derive_exporter_scores,)),
+    "news":      (NEWS_SCHEMA, _clean_news, ()),
+}
+
+
+# ─── DELTA INGESTION ─────────────────────────────────────────────────────────
+# Partners send daily incremental files. Instead of a full reload, the delta's
+# records are cleaned on their own and upserted into the loaded frame, and
+# the entity IDs they touch are reported so only those buyers (or exporters)
+# need rescoring.
+
+_DELTA_SOURCES = {
+    "importers": (IMPORTER_SCHEMA, _clean_importers, "Buyer_ID"),
+    "exporters": (EXPORTER_SCHEMA, _clean_exporters, "Exporter_ID"),
+}
+
+
+def ingest_delta(base_df: pd.DataFrame, delta_path: str, kind: str = "importers", as_of=None) -> tuple:
+    """
+    Upsert a delta CSV of importer or exporter records into a loaded frame.
+
+    Records match on Record_ID: a known record is replaced in place, a new one
+    is appended (in file order), and within the delta the last row wins. Only
+    the delta rows go through cleaning. A known record whose Buyer_ID /
+    Exporter_ID is now blank is removed, as a full reload would drop it.
+    The result equals a full load of the base file with the delta applied.
+
+    Returns:
+        (updated_df, changed_ids) — changed_ids are the entity IDs of every
+        inserted, modified or removed record (both the old and the new ID when
+        a record moved); rows identical to the stored record don't count.
+    """
+    schema, clean, id_col = _DELTA_SOURCES[kind]
+    raw   = read_source_csv(delta_path, schema).drop_duplicates("Record_ID", keep="last")
+    delta = clean(raw.copy(), as_of)
+
+    base_ids = base_df["Record_ID"]
+    base_pos = pd.Series(np.arange(len(base_df)), index=base_ids)[~base_ids.duplicated(keep="last").to_numpy()]
+
+    # ── Known records the delta blanks out (dropped by cleaning) ──
+    dropped    = raw["Record_ID"][~raw["Record_ID"].isin(delta["Record_ID"])]
+    remove_pos = base_pos[dropped[dropped.isin(base_pos.index)]].to_numpy()
+
+    # ── Known records that actually changed, and new records ──
+    is_known   = delta["Record_ID"].isin(base_pos.index).to_numpy()
+    updates    = delta[is_known]
+    inserts    = delta[~is_known]
+    update_pos = base_pos[updates["Record_ID"]].to_numpy()
+
+    raw_cols = [c for c in schema if c in base_df.columns and c in delta.columns]
+    old = base_df.iloc[update_pos][raw_cols].astype(object).reset_index(drop=True)
+    new = updates[raw_cols].astype(object).reset_index(drop=True)
+    same = ((old == new) | (old.isna() & new.isna())).all(axis=1).to_numpy()
+    updates, update_pos = updates[~same], update_pos[~same]
+
+    changed_ids = set(base_df[id_col].iloc[np.concatenate([remove_pos, update_pos])])
+    changed_ids.update(updates[id_col])
+    changed_ids.update(inserts[id_col])
+
+    # ── Assemble: base rows in place (replaced / removed), then inserts ──
+    combined = pd.concat([base_df, updates, inserts], ignore_index=True)
+    take = np.arange(len(base_df))
+    take[update_pos] = len(base_df) + np.arange(len(updates))
+    keep = np.ones(len(base_df), dtype=bool)
+    keep[remove_pos] = False
+    take = np.concatenate([take[keep], len(base_df) + len(updates) + np.arange(len(inserts))])
+    out = combined.take(take).reset_index(drop=True)
+
+    # Categories differ between base and delta, so concat fell back to object
+    for col, dtype in schema.items():
+        if dtype == "category" and col in out.columns:
+            out[col] = out[col].astype("category")
+
+    print(f"[Delta] {kind}: {len(updates)} updated | {len(inserts)} inserted | "
+          f"{len(remove_pos)} removed | {len(changed_ids)} IDs to rescore")
+    return out, changed_ids
+
+
+# ─── ENTITY RESOLUTION ───────────────────────────────────────────────────────
+# The source files hold several dated records per Buyer_ID / Exporter_ID.
+# resolve_entities collapses them into one row per company so each one is
+# scored (and carded) once:
+#   - the most recent record (by Date; undated records count as oldest, ties
+#     go to the later row) supplies the raw fields and everything not below;
+#   - event flags take the max — the company reported it in some record;
+#   - rates and scores take the recency_weight-weighted mean of the records;
+#   - derived card/matching scores are recomputed from the merged signals.
+# entity_record_count records how many rows each entity was built from.
+
+_ENTITY_RULES = {
+    "importers": {
+        "id_col": "Buyer_ID",
+        "max": [
+            "clean_hiring_growth", "clean_engagement_spike", "clean_decision_maker_change",
+            "clean_funding_event", "clean_tariff_news", "clean_stock_shock",
+            "clean_war_event", "clean_natural_calamity",
+        ],
+        "mean": [
+            "clean_intent_score", "clean_prompt_response", "clean_response_probability",
+            "clean_good_payment", "clean_currency_fluctuation",
+        ],
+        "derive": _derive_importer_scores,
+    },
+    "exporters": {
+        "id_col": "Exporter_ID",
+        "max": [
+            "clean_hiring_signal", "clean_job_change", "clean_war_risk", "clean_natural_calamity_risk",
+        ],
+        "mean": [
+            "clean_intent_score", "clean_prompt_response_score", "clean_good_payment_terms",
+            "clean_tariff_impact", "clean_stock_impact", "clean_currency_shift",
+        ],
+        "derive": _derive_exporter_scores,
+    },
+}
+
+
+def resolve_entities(df: pd.DataFrame, kind: str = "importers") -> pd.DataFrame:
+    """
+    Collapse a cleaned importer / exporter frame to one row per entity ID
+    (rules above). Entities keep the order of their first record; a company
+    with a single record comes through unchanged apart from
+    entity_record_count.
+    """
+    rules  = _ENTITY_RULES[kind]
+    id_col = rules["id_col"]
+
+    codes, _ = pd.factorize(df[id_col])           # entity number, first-seen order
+    counts   = np.bincount(codes)
+    merged   = counts > 1
+
+    # ── Most recent record per entity ──
+    records = pd.DataFrame({
+        "entity": codes,
+        "date":   _parse_record_dates(df["Date"]).to_numpy(),
+        "pos":    np.arange(len(df)),
+    })
+    latest = (records.sort_values(["date", "pos"], na_position="first", kind="stable")
+                     .drop_duplicates("entity", keep="last")
+                     .sort_values("entity")["pos"].to_numpy())
+    out = df.iloc[latest].reset_index(drop=True)
+
+    # ── Event flags: any record ──
+    for col in rules["max"]:
+        out[col] = df[col].groupby(codes).max().to_numpy()
+
+    # ── Rates / scores: recency-weighted mean over the records that have one ──
+    weights = df["recency_weight"].to_numpy(dtype=np.float64)
+    for col in rules["mean"]:
+        values = df[col].to_numpy(dtype=np.float64)
+        valid  = ~np.isnan(values)
+        num    = np.bincount(codes, weights=np.where(valid, weights * values, 0.0), minlength=len(counts))
+        den    = np.bincount(codes, weights=np.where(valid, weights, 0.0), minlength=len(counts))
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = num / den
+        current  = out[col].to_numpy(dtype=np.float64)
+        out[col] = np.where(merged & (den > 0), mean, current)
+
+    out = rules["derive"](out)
+    out["entity_record_count"] = counts
+
+    print(f"[Entities] {kind}: {len(df)} records → {len(out)} entities "
+          f"({int(merged.sum())} merged from multiple records)")
+    return out
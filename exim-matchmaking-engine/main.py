@@ -9,6 +9,7 @@
 #   5. Rank buyers per exporter
 #   6. Output MongoDB-ready JSON documents
 
+import argparse
 import json
 import os
 import sys
@@ -16,10 +17,25 @@ import pandas as pd
 import numpy as np
 from datetime import datetime
 
-from data_loader import load_importers, load_exporters, load_news
-from news_overlay import build_news_overlay, get_news_tags
-from scoring_engine import score_buyer_for_exporter
-from swipe_engine import SwipeStore, compute_full_swipe_factors, default_swipe_state
+from data_loader import load_importers, load_exporters, load_news, resolve_entities
+from compact_store import CompactTable, memory_report
+from news_overlay import build_news_overlay, build_news_tag_index
+from scoring_engine import (
+    build_buyer_features,
+    exporter_score_columns,
+    score_pairs_batch,
+    build_score_document_from_batch,
+    build_industry_matrix,
+    build_industry_buckets,
+    select_top_n,
+    select_top_n_pruned,
+    MatchExplainer,
+)
+from parallel_runner import score_exporters_parallel
+from swipe_engine import (
+    SwipeStore, SwipeBuyerIndex, compile_pattern_table,
+    compute_swipe_penalties, now_epoch_us,
+)
 from mongo_schema import (
     build_buyer_document,
     build_exporter_document,
@@ -27,7 +43,7 @@ from mongo_schema import (
     build_news_event_document,
     RECOMMENDED_INDEXES,
 )
-from config import MIN_COMPOSITE_SCORE
+from config import MIN_COMPOSITE_SCORE, EXPORTER_BLOCK_SIZE
 
 
 # ─── PATH RESOLUTION ─────────────────────────────────────────────────────────
@@ -62,147 +78,365 @@ def save_json(data, filename):
     return path
 
 
+def print_memory_report(label: str, df, store: CompactTable):
+    mem = memory_report(df, store)
+    print(f"  Compact {label} store: {mem['compact_bytes'] / 1e6:.2f} MB "
+          f"(DataFrame {mem['dataframe_bytes'] / 1e6:.2f} MB, records {mem['records_bytes'] / 1e6:.2f} MB)")
+
+
 # ─── DEMO SWIPE SIMULATION ───────────────────────────────────────────────────
-def simulate_demo_swipes(store: SwipeStore, exporters_df, buyers_df):
+def simulate_demo_swipes(store: SwipeStore, buyer_store: CompactTable):
     """
     Simulates a realistic swipe history to demonstrate the feedback engine.
     In production, swipes come from real user interactions.
     """
     print("\n[Demo] Simulating swipe history...")
 
-    buyers_list = buyers_df.to_dict("records")
-    exporters_list = exporters_df.to_dict("records")
+    def first_buyers(column, value, n):
+        """The first n buyer rows whose column equals value (only those are decoded)."""
+        return [buyer_store.row(j) for j in np.flatnonzero(buyer_store[column] == value)[:n]]
 
     # Simulate: EXP_5094 (Textiles, Rajasthan) left-swipes Netherlands buyers 3x
-    netherlands_buyers = [b for b in buyers_list if b.get("Country") == "Netherlands"]
-    for buyer in netherlands_buyers[:3]:
+    for buyer in first_buyers("Country", "Netherlands", 3):
         store.process_swipe("EXP_5094", buyer["Buyer_ID"], "left", buyer)
 
     # Simulate: EXP_5094 likes Japan buyers (right swipe)
-    japan_buyers = [b for b in buyers_list if b.get("Country") == "Japan"]
-    for buyer in japan_buyers[:2]:
+    for buyer in first_buyers("Country", "Japan", 2):
         store.process_swipe("EXP_5094", buyer["Buyer_ID"], "right", buyer)
 
     # Simulate: EXP_3114 (Solar, Tamil Nadu) left-swipes IT Software buyers twice
-    it_buyers = [b for b in buyers_list if b.get("Industry") == "IT Software"]
-    for buyer in it_buyers[:2]:
+    for buyer in first_buyers("Industry", "IT Software", 2):
         store.process_swipe("EXP_3114", buyer["Buyer_ID"], "left", buyer)
 
     print(f"  [Demo] Swipe history simulated for 2 exporters")
 
 
+# ─── CARD FIELDS ─────────────────────────────────────────────────────────────
+def attach_card_fields(
+    score_doc: dict,
+    exp_row: dict,
+    buyer_pos: int,
+    buy_row: dict,
+    swipe_penalty: float,
+    explainer: MatchExplainer,
+) -> dict:
+    """
+    Add the match reasons, news tags and buyer display block the card UI
+    renders. Only called for cards that make a deck.
+    """
+    explanation = explainer.explain(exp_row, buyer_pos, buy_row, swipe_penalty)
+    score_doc["match_reasons"] = explanation["match_reasons"]
+    score_doc["news_tags"]     = explanation["news_tags"]
+
+    # Attach top-level buyer display fields for card rendering
+    score_doc["buyer_display"] = {
+        "country":         buy_row.get("Country"),
+        "industry":        buy_row.get("Industry"),
+        "revenue_usd":     buy_row.get("Revenue_Size_USD"),
+        "team_size":       buy_row.get("Team_Size"),
+        "certification":   buy_row.get("Certification"),
+        "channel":         buy_row.get("clean_channel"),
+        "activity_tier":   buy_row.get("buyer_activity_tier"),
+        "momentum":        buy_row.get("market_momentum_score"),
+        "contact_ready":   buy_row.get("contact_readiness_score"),
+    }
+    return score_doc
+
+
+def build_deck_from_selection(selection: dict, exp_row: dict, buyers_list, explainer: MatchExplainer, match_docs: list) -> list:
+    """Materialise the deck for one take_selection() result, appending its match docs."""
+    exp_scores = []
+    for k, j in enumerate(selection["buyer_idx"]):
+        buy_row   = buyers_list[j]
+        score_doc = build_score_document_from_batch(selection, 0, k, exp_row, buy_row)
+        attach_card_fields(
+            score_doc, exp_row, j, buy_row, selection["swipe_penalty_factor"][0, k], explainer
+        )
+        match_docs.append(build_match_score_document(score_doc))
+        exp_scores.append(score_doc)
+    return exp_scores
+
+
+# ─── SWIPE FACTORS PER SCORING BLOCK ─────────────────────────────────────────
+def swipe_factor_block(store: SwipeStore, exporter_rows, buyers_list, swiped_exporters,
+                       buyer_index: SwipeBuyerIndex, now_us: int):
+    """
+    Build (swipe_penalty, pattern_penalty, suppressed) arrays shaped
+    (len(exporter_rows), len(buyers_list)) for one scoring block.
+    Exporters without any swipe history keep neutral factors. For the rest,
+    the learned pattern factor is one gather from a per-group table
+    (compile_pattern_table), and decay and recovery run as one batch over
+    the buyers they actually swiped (compute_swipe_penalties); every other
+    buyer keeps 1.0 / False.
+    """
+    shape      = (len(exporter_rows), len(buyers_list))
+    swipe_pen  = np.ones(shape)
+    pattern_pen= np.ones(shape)
+    suppressed = np.zeros(shape, dtype=bool)
+
+    for i, exp_row in enumerate(exporter_rows):
+        exp_id = exp_row["Exporter_ID"]
+        if exp_id not in swiped_exporters:
+            continue
+
+        # C: learned patterns reach unseen buyers too — one gather by pattern group
+        pv = store.get_preference_vector(exp_id)
+        if pv:
+            pattern_pen[i] = compile_pattern_table(pv, buyer_index)[buyer_index.pattern_group]
+
+        # B: decay + recovery for the swiped buyers, scattered into dense vectors
+        swiped = store.swiped_arrays(exp_id, buyer_index.positions)
+        swipe_pen[i], suppressed[i] = compute_swipe_penalties(swiped, buyer_index, now_us)
+
+    return swipe_pen, pattern_pen, suppressed
+
+
 # ─── MAIN PIPELINE ───────────────────────────────────────────────────────────
 def run_pipeline(
     importer_path: str,
     exporter_path: str,
     news_path: str,
     top_n_per_exporter: int = 10,
+    stream_top_n: bool = False,
+    workers: int = 1,
+    prune_candidates: bool = False,
+    verify_pruning: bool = False,
+    as_of: str = None,
+    dedupe_entities: bool = True,
+    swipe_log: str = None,
+    report_memory: bool = False,
 ):
+    """
+    Run the full pipeline and return the per-exporter card decks.
+
+    stream_top_n: keep only each exporter's top-N per scoring block and build
+                  score documents just for those buyers. mongo_match_scores.json
+                  then holds the deck matches instead of every above-threshold
+                  pair; the card decks are identical to the default mode.
+    workers:      > 1 shards exporters across that many processes. Implies
+                  stream_top_n; outputs match the serial streaming run.
+    prune_candidates: serial streaming run that skips industry buckets whose
+                  score bound cannot reach an exporter's N-th best buyer.
+    verify_pruning: with prune_candidates, also score every pair and fail if
+                  any pruned deck differs from the exhaustive one.
+    as_of:        reference date (e.g. "2025-02-23") for record recency
+                  weights; defaults to today. Pin it for reproducible reruns.
+    dedupe_entities: collapse multi-record buyers / exporters into one entity
+                  each (data_loader.resolve_entities) before scoring. False
+                  scores every record, so a company can appear on several cards.
+    swipe_log:    path of a durable swipe event log (swipe_log.py). Swipe
+                  state is replayed from it, and the demo swipes are only
+                  simulated (and logged) while it is empty.
+    report_memory: print each table's size as a DataFrame, as
+                  to_dict("records") and as a CompactTable. Building the
+                  records list for the comparison is the cost the compact
+                  store avoids, so it only happens when asked.
+    """
     print("\n" + "="*60)
     print("🚀 SWIPE-TO-EXPORT: Matchmaking Algorithm Pipeline")
     print("="*60)
 
     # ── STEP 1: Load & Clean ──────────────────────────────────────────────
     print("\n[Step 1] Loading and cleaning data...")
-    buyers_df    = load_importers(importer_path)
-    exporters_df = load_exporters(exporter_path)
-    news_df      = load_news(news_path)
+    quality_report = {}
+    buyers_df    = load_importers(importer_path, as_of, quality_report)
+    exporters_df = load_exporters(exporter_path, as_of, quality_report)
+    news_df      = load_news(news_path, as_of, quality_report)
+    if dedupe_entities:
+        buyers_df    = resolve_entities(buyers_df, "importers")
+        exporters_df = resolve_entities(exporters_df, "exporters")
+
+    # Struct-of-arrays copies every later step reads from; the DataFrames
+    # are dropped once they are built
+    buyer_store    = CompactTable(buyers_df)
+    exporter_store = CompactTable(exporters_df)
+    if report_memory:
+        print_memory_report("buyer", buyers_df, buyer_store)
+        print_memory_report("exporter", exporters_df, exporter_store)
+    del buyers_df, exporters_df
 
     # ── STEP 2: Build News Overlay ────────────────────────────────────────
     print("\n[Step 2] Building global news overlay...")
     news_overlay = build_news_overlay(news_df)
     print(f"  News overlay built: {len(news_overlay)} (country, industry) keys indexed")
+    news_tag_index = build_news_tag_index(news_df)
+    print(f"  News tag index built: {len(news_tag_index)} (country, industry) keys indexed")
+
+    # Exporter-independent buyer sub-scores, computed once per load
+    buyer_features = build_buyer_features(buyer_store, news_overlay)
+    print(f"  Buyer feature table built: {len(buyer_features)} buyers")
 
     # ── STEP 3: Build MongoDB Documents for base collections ─────────────
     print("\n[Step 3] Building base collection documents...")
-    buyer_docs    = [build_buyer_document(row) for _, row in buyers_df.iterrows()]
-    exporter_docs = [build_exporter_document(row) for _, row in exporters_df.iterrows()]
+    buyer_docs    = [build_buyer_document(row) for row in buyer_store.records()]
+    exporter_docs = [build_exporter_document(row) for row in exporter_store.records()]
     news_docs     = [build_news_event_document(row) for _, row in news_df.iterrows()]
 
     # ── STEP 4: Simulate Swipe History ───────────────────────────────────
     print("\n[Step 4] Initialising swipe feedback engine...")
-    swipe_store = SwipeStore()
-    simulate_demo_swipes(swipe_store, exporters_df, buyers_df)
+    swipe_store = SwipeStore(log_path=swipe_log)
+    if swipe_store.swiped_exporter_ids():
+        print(f"  Swipe state replayed from {swipe_log} "
+              f"({len(swipe_store.swiped_exporter_ids())} exporters with history)")
+    else:
+        simulate_demo_swipes(swipe_store, buyer_store)
+    swipe_store.close()   # fsync the log; the store stays readable
 
     # ── STEP 5: Score All (exporter, buyer) Pairs ────────────────────────
     print("\n[Step 5] Scoring all exporter-buyer pairs...")
     match_docs        = []
     ranked_per_exporter = {}
 
-    exporters_list = exporters_df.to_dict("records")
-    buyers_list    = buyers_df.to_dict("records")
+    exporters_list = exporter_store.records()
+    buyers_list    = buyer_store.records()
     total_pairs    = len(exporters_list) * len(buyers_list)
     scored          = 0
 
-    for exp_row in exporters_list:
-        exp_id     = exp_row["Exporter_ID"]
-        exp_scores = []
-        pv         = swipe_store.get_preference_vector(exp_id)
-
-        for buy_row in buyers_list:
-            buy_id = buy_row["Buyer_ID"]
-
-            # Get swipe state for this pair
-            raw_state   = swipe_store.get_state(exp_id, buy_id)
-            swipe_factors = compute_full_swipe_factors(raw_state, pv, buy_row)
-
-            # Skip suppressed buyers entirely
-            if swipe_factors.get("suppressed", False):
-                scored += 1
-                continue
-
-            # Build swipe_state dict expected by score_buyer_for_exporter
-            swipe_state_for_scorer = {
-                "penalty_factor":  swipe_factors["penalty_factor"],
-                "pattern_penalty": swipe_factors["pattern_penalty"],
-            }
-
-            # Compute full score
-            score_doc = score_buyer_for_exporter(
-                exporter_row = exp_row,
-                buyer_row    = buy_row,
-                news_overlay = news_overlay,
-                swipe_state  = swipe_state_for_scorer,
+    exporter_cols    = exporter_score_columns(exporter_store)
+    swiped_exporters = swipe_store.swiped_exporter_ids()
+    buyer_index      = SwipeBuyerIndex(buyer_store)
+    swipe_now        = now_epoch_us()   # one reference time for every exporter's recovery
+    explainer        = MatchExplainer(exporter_store, buyer_store, buyer_features, news_tag_index, swipe_store)
+
+    if workers > 1:
+        # Swipe factors are only shipped for exporters that have swiped
+        swipe_factors = {}
+        for pos, exp_row in enumerate(exporters_list):
+            if exp_row["Exporter_ID"] in swiped_exporters:
+                pen, pat, supp = swipe_factor_block(
+                    swipe_store, [exp_row], buyers_list, swiped_exporters, buyer_index, swipe_now
+                )
+                swipe_factors[pos] = (pen[0], pat[0], supp[0])
+
+        print(f"  Sharding {len(exporters_list)} exporters across {workers} workers...")
+        selections = score_exporters_parallel(
+            exporter_codes  = exporter_cols["clean_industry_code"],
+            swipe_factors   = swipe_factors,
+            buyer_features  = buyer_features,
+            industry_matrix = build_industry_matrix(),
+            top_n           = top_n_per_exporter,
+            workers         = workers,
+            shard_size      = EXPORTER_BLOCK_SIZE,
+        )
+
+        # Merge in exporter order, exactly as the serial streaming loop does
+        for exp_row, selection in zip(exporters_list, selections):
+            ranked_per_exporter[exp_row["Exporter_ID"]] = build_deck_from_selection(
+                selection, exp_row, buyers_list, explainer, match_docs
+            )
+            scored += len(buyers_list)
+    elif prune_candidates:
+        buckets       = build_industry_buckets(buyer_features)
+        pruned_cache  = {}   # exporters without swipes share a deck per industry
+        mismatches    = 0
+
+        for exp_row, exp_code in zip(exporters_list, exporter_cols["clean_industry_code"]):
+            exp_id = exp_row["Exporter_ID"]
+            swipe_vectors = {}
+            if exp_id in swiped_exporters:
+                pen, pat, supp = swipe_factor_block(
+                    swipe_store, [exp_row], buyers_list, swiped_exporters, buyer_index, swipe_now
+                )
+                swipe_vectors = {"swipe_penalty": pen[0], "pattern_penalty": pat[0], "suppressed": supp[0]}
+                selection = select_top_n_pruned(exp_code, buyer_features, buckets, top_n_per_exporter, **swipe_vectors)
+            else:
+                if exp_code not in pruned_cache:
+                    pruned_cache[exp_code] = select_top_n_pruned(exp_code, buyer_features, buckets, top_n_per_exporter)
+                selection = pruned_cache[exp_code]
+            scored += selection["n_scored"]
+
+            if verify_pruning:
+                batch = score_pairs_batch(
+                    exporter_cols   = {"clean_industry_code": np.array([exp_code])},
+                    buyer_features  = buyer_features,
+                    swipe_penalty   = swipe_vectors.get("swipe_penalty", np.ones(len(buyers_list)))[None, :],
+                    pattern_penalty = swipe_vectors.get("pattern_penalty", np.ones(len(buyers_list)))[None, :],
+                )
+                allowed = ~swipe_vectors.get("suppressed", np.zeros(len(buyers_list), dtype=bool))
+                exhaustive = select_top_n(batch["composite_score"][0], top_n_per_exporter, allowed)
+                if exhaustive != selection["buyer_idx"].tolist():
+                    mismatches += 1
+                    print(f"  ❌ Pruned deck differs from exhaustive run for {exp_id}")
+
+            ranked_per_exporter[exp_id] = build_deck_from_selection(
+                selection, exp_row, buyers_list, explainer, match_docs
             )
 
-            # Skip very low scores
-            if score_doc["composite_score"] < MIN_COMPOSITE_SCORE:
-                scored += 1
-                continue
-
-            # Attach news tags for card UI
-            news_tags = get_news_tags(news_df, buy_row.get("Country",""), buy_row.get("Industry",""))
-            score_doc["news_tags"] = news_tags
-
-            # Attach top-level buyer display fields for card rendering
-            score_doc["buyer_display"] = {
-                "country":         buy_row.get("Country"),
-                "industry":        buy_row.get("Industry"),
-                "revenue_usd":     buy_row.get("Revenue_Size_USD"),
-                "team_size":       buy_row.get("Team_Size"),
-                "certification":   buy_row.get("Certification"),
-                "channel":         buy_row.get("clean_channel"),
-                "activity_tier":   buy_row.get("buyer_activity_tier"),
-                "momentum":        buy_row.get("market_momentum_score"),
-                "contact_ready":   buy_row.get("contact_readiness_score"),
-            }
-
-            mongo_doc = build_match_score_document(score_doc)
-            match_docs.append(mongo_doc)
-            exp_scores.append(score_doc)
-            scored += 1
-
-        # Sort this exporter's matches by composite_score DESC
-        exp_scores.sort(key=lambda x: x["composite_score"], reverse=True)
-        ranked_per_exporter[exp_id] = exp_scores[:top_n_per_exporter]
+        if verify_pruning:
+            print(f"  Pruning verified against exhaustive scoring: {mismatches} mismatching decks")
+            if mismatches:
+                raise RuntimeError(f"Candidate pruning changed {mismatches} decks")
+    else:
+        for start in range(0, len(exporters_list), EXPORTER_BLOCK_SIZE):
+            block_rows = exporters_list[start:start + EXPORTER_BLOCK_SIZE]
+            block_cols = {k: v[start:start + EXPORTER_BLOCK_SIZE] for k, v in exporter_cols.items()}
+
+            # Swipe factors for the block (neutral for exporters with no swipe history)
+            swipe_pen, pattern_pen, suppressed = swipe_factor_block(
+                swipe_store, block_rows, buyers_list, swiped_exporters, buyer_index, swipe_now
+            )
+
+            # Score the whole exporter × buyer block at once
+            batch = score_pairs_batch(
+                exporter_cols   = block_cols,
+                buyer_features  = buyer_features,
+                swipe_penalty   = swipe_pen,
+                pattern_penalty = pattern_pen,
+            )
+
+            # Candidates: not suppressed, and not clearly below threshold
+            # (exact threshold check is on the rounded score, as stored)
+            candidates = ~suppressed & (batch["composite_score"] >= MIN_COMPOSITE_SCORE - 1e-4)
+
+            for i, exp_row in enumerate(block_rows):
+                exp_id     = exp_row["Exporter_ID"]
+                exp_scores = []
+                scored    += len(buyers_list)
+
+                if stream_top_n:
+                    # Streaming top-N: select the deck from the score vector, then
+                    # materialise documents only for the buyers that make it
+                    for j in select_top_n(batch["composite_score"][i], top_n_per_exporter, ~suppressed[i]):
+                        buy_row   = buyers_list[j]
+                        score_doc = build_score_document_from_batch(batch, i, j, exp_row, buy_row)
+                        attach_card_fields(score_doc, exp_row, j, buy_row, swipe_pen[i, j], explainer)
+                        match_docs.append(build_match_score_document(score_doc))
+                        exp_scores.append(score_doc)
+                    ranked_per_exporter[exp_id] = exp_scores
+                    continue
+
+                kept = []
+                for j in np.flatnonzero(candidates[i]):
+                    buy_row = buyers_list[j]
+                    score_doc = build_score_document_from_batch(batch, i, j, exp_row, buy_row)
+
+                    # Skip very low scores
+                    if score_doc["composite_score"] < MIN_COMPOSITE_SCORE:
+                        continue
+                    kept.append((score_doc, j))
+
+                # Sort this exporter's matches by composite_score DESC
+                kept.sort(key=lambda x: x[0]["composite_score"], reverse=True)
+                for score_doc, j in kept[:top_n_per_exporter]:
+                    attach_card_fields(score_doc, exp_row, j, buyers_list[j], swipe_pen[i, j], explainer)
+                    exp_scores.append(score_doc)
+
+                # Every kept pair is stored; only deck cards carry reasons
+                kept.sort(key=lambda x: x[1])
+                match_docs.extend(build_match_score_document(score_doc) for score_doc, _ in kept)
+                ranked_per_exporter[exp_id] = exp_scores
 
     print(f"  Scored {scored}/{total_pairs} pairs | {len(match_docs)} valid matches generated")
 
     # ── STEP 6: Generate Per-Exporter Ranked Output ───────────────────────
     print("\n[Step 6] Building ranked card decks per exporter...")
     card_decks = {}
+    first_exporter_pos = {}
+    for pos, exp_id in enumerate(exporter_cols["Exporter_ID"]):
+        first_exporter_pos.setdefault(exp_id, pos)
     for exp_id, matches in ranked_per_exporter.items():
-        exp_info = next((e for e in exporters_list if e["Exporter_ID"] == exp_id), {})
+        pos      = first_exporter_pos.get(exp_id)
+        exp_info = exporters_list[pos] if pos is not None else {}
         card_decks[exp_id] = {
             "exporter_id":   exp_id,
             "exporter_name": exp_id,
@@ -221,6 +455,7 @@ def run_pipeline(
     save_json(match_docs,    "mongo_match_scores.json")
     save_json(card_decks,    "mongo_card_decks.json")
     save_json(RECOMMENDED_INDEXES, "mongo_indexes.json")
+    save_json(quality_report, "data_quality_report.json")
 
     # ── STEP 8: Print Summary ─────────────────────────────────────────────
     print("\n" + "="*60)
@@ -241,9 +476,38 @@ def run_pipeline(
 
 # ─── ENTRY POINT ─────────────────────────────────────────────────────────────
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Swipe-to-Export matchmaking pipeline")
+    parser.add_argument("--top-n", type=int, default=10,
+                        help="cards per exporter deck (default: 10)")
+    parser.add_argument("--stream-top-n", action="store_true",
+                        help="only build score documents for deck buyers")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="score exporters on N processes (implies --stream-top-n)")
+    parser.add_argument("--prune", action="store_true",
+                        help="skip industry buckets that cannot reach the deck (implies --stream-top-n)")
+    parser.add_argument("--verify-pruning", action="store_true",
+                        help="with --prune, check every pruned deck against exhaustive scoring")
+    parser.add_argument("--as-of", default=None, metavar="YYYY-MM-DD",
+                        help="reference date for recency weights (default: today)")
+    parser.add_argument("--all-records", action="store_true",
+                        help="score every source record instead of one row per buyer/exporter")
+    parser.add_argument("--swipe-log", default=None, metavar="PATH",
+                        help="durable swipe event log to replay (and log demo swipes to)")
+    parser.add_argument("--memory-report", action="store_true",
+                        help="print DataFrame / records / compact store sizes per table")
+    args = parser.parse_args()
+
     run_pipeline(
         importer_path = os.path.join(DATA_DIR, "importer.csv"),
         exporter_path = os.path.join(DATA_DIR, "exporter.csv"),
         news_path     = os.path.join(DATA_DIR, "globalnews.csv"),
-        top_n_per_exporter = 10,
+        top_n_per_exporter = args.top_n,
+        stream_top_n  = args.stream_top_n,
+        workers       = args.workers,
+        prune_candidates = args.prune,
+        verify_pruning   = args.verify_pruning,
+        as_of            = args.as_of,
+        dedupe_entities  = not args.all_records,
+        swipe_log        = args.swipe_log,
+        report_memory    = args.memory_report,
     )
@@ -16,17 +16,30 @@
 import pandas as pd
 import numpy as np
 
+# Working columns of the cleaned frames that are not persisted: industry codes
+# index the process-local data_loader.INDUSTRY_VOCAB, so they mean nothing to
+# another run
+_UNPERSISTED_COLUMNS = {"clean_industry_code"}
 
-def build_buyer_document(row: pd.Series) -> dict:
+
+def _row_dict(row) -> dict:
+    """A cleaned row (Series, or a CompactTable row dict) as a plain dict."""
+    return row.to_dict() if isinstance(row, pd.Series) else dict(row)
+
+
+def build_buyer_document(row) -> dict:
     """
-    Builds a MongoDB buyer document from a cleaned importer row.
+    Builds a MongoDB buyer document from a cleaned importer row
+    (Series or row dict).
     Keeps ALL original CSV columns + adds computed_ prefix fields.
     """
-    raw = row.to_dict()
+    raw = _row_dict(row)
     
     # Keep everything raw — convert NaN to None for JSON safety
     cleaned_raw = {}
     for k, v in raw.items():
+        if k in _UNPERSISTED_COLUMNS:
+            continue
         if isinstance(v, float) and np.isnan(v):
             cleaned_raw[k] = None
         else:
@@ -82,13 +95,16 @@ def build_buyer_document(row: pd.Series) -> dict:
     return doc
 
 
-def build_exporter_document(row: pd.Series) -> dict:
+def build_exporter_document(row) -> dict:
     """
-    Builds a MongoDB exporter document from a cleaned exporter row.
+    Builds a MongoDB exporter document from a cleaned exporter row
+    (Series or row dict).
     """
-    raw = row.to_dict()
+    raw = _row_dict(row)
     cleaned_raw = {}
     for k, v in raw.items():
+        if k in _UNPERSISTED_COLUMNS:
+            continue
         if isinstance(v, float) and np.isnan(v):
             cleaned_raw[k] = None
         else:
@@ -157,7 +173,7 @@ def build_match_score_document(score_dict: dict) -> dict:
         # ── Display fields ──
         "score_tier":         score_dict["score_tier"],
         "industry_match_tag": score_dict["industry_match_tag"],
-        "match_reasons":      score_dict["match_reasons"],
+        "match_reasons":      score_dict.get("match_reasons", []),   # deck cards only; else MatchExplainer
 
         # ── Metadata ──
         "scored_at":          score_dict["scored_at"],
@@ -169,7 +185,7 @@ def build_swipe_event_document(
     exporter_id: str,
     buyer_id: str,
     direction: str,
-    timestamp: str,
+    timestamp: int,
 ) -> dict:
     """
     Builds a MongoDB swipe_events document. Append-only audit log.
@@ -178,7 +194,7 @@ def build_swipe_event_document(
         "exporter_id": exporter_id,
         "buyer_id":    buyer_id,
         "direction":   direction,   # "left" or "right"
-        "timestamp":   timestamp,
+        "timestamp":   timestamp,   # epoch microseconds (UTC)
     }
 
 
@@ -199,7 +215,7 @@ def build_swipe_state_document(
         "right_count":  state.get("right_count", 0),
         "penalty_factor": state.get("penalty_factor", 1.0),
         "suppressed":   state.get("suppressed", False),
-        "last_swiped_at": state.get("last_swiped_at"),
+        "last_swiped_at": state.get("last_swiped_at"),   # epoch microseconds (UTC)
         "last_signal_recovery_at": state.get("last_signal_recovery_at"),
     }
 
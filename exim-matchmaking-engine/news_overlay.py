@@ -5,6 +5,9 @@
 # a net overlay delta that will be added to / subtracted from the composite score.
 # Positive delta = trade opportunity. Negative delta = risk penalty.
 
+import math
+from collections import ChainMap
+
 import pandas as pd
 import numpy as np
 from config import (
@@ -42,59 +45,174 @@ def _recency_multiplier(recency_weight: float) -> float:
     return float(recency_weight)
 
 
-def build_news_overlay(news_df: pd.DataFrame) -> dict:
+def _news_column(news_df: pd.DataFrame, column: str, default) -> pd.Series:
+    """A news column, or a constant Series when the feed lacks it."""
+    if column in news_df.columns:
+        return news_df[column]
+    return pd.Series(default, index=news_df.index)
+
+
+def compute_news_deltas(news_df: pd.DataFrame) -> np.ndarray:
+    """
+    Per-event overlay delta as one columnar computation:
+        base effect (tariff sign, war dampening) × impact multiplier × recency
+    """
+    event_type    = _news_column(news_df, "Event_Type", "").astype(object)
+    impact_level  = _news_column(news_df, "Impact_Level", "Medium").astype(object)
+    recency_w     = _news_column(news_df, "recency_weight", 0.5).to_numpy(dtype=float)
+    tariff_change = _news_column(news_df, "clean_tariff_change", 0).to_numpy(dtype=float)
+    war_flag      = _news_column(news_df, "clean_war_flag", 0).to_numpy(dtype=float)
+
+    # ── Base effect from event type ──
+    base_effect = event_type.map(NEWS_EVENT_BASE_EFFECTS).fillna(0.0).to_numpy(dtype=float)
+
+    # ── For Tariff Update: sign depends on tariff direction ──
+    # Positive tariff_change = new tariff barriers = bad for exporter
+    # Negative tariff_change = tariff removed = good for exporter
+    is_tariff   = (event_type == "Tariff Update").to_numpy()
+    base_effect = np.where(
+        is_tariff & (tariff_change != 0),
+        -np.abs(base_effect) * np.sign(tariff_change),
+        base_effect,
+    )
+
+    # ── For Trade Agreement: diminish if war ongoing in same region ──
+    is_trade    = (event_type == "Trade Agreement").to_numpy()
+    base_effect = np.where(is_trade & (war_flag > 0.5), base_effect * 0.5, base_effect)
+
+    # ── Scale by impact level and recency ──
+    impact_mult = impact_level.map(NEWS_IMPACT_MULTIPLIER).fillna(0.6).to_numpy(dtype=float)
+    return base_effect * impact_mult * recency_w
+
+
+def overlay_keys(region: str) -> list:
+    """Countries a news region's events are filed under ("__GLOBAL__" for Global)."""
+    if region == "Global":
+        # Special sentinel; matched against any country
+        return ["__GLOBAL__"]
+    return REGION_COUNTRY_MAP.get(region) or []
+
+
+class NewsOverlay(dict):
+    """
+    The clipped overlay dict (what scoring reads) plus the unclipped running
+    sums behind it, which apply_news_event accumulates into so re-clipping
+    after an update gives the same value as a full rebuild.
+    """
+
+    def __init__(self, clipped: dict, unclipped: dict):
+        super().__init__(clipped)
+        self.unclipped = unclipped
+
+
+def build_news_overlay(news_df: pd.DataFrame) -> NewsOverlay:
     """
     Pre-compute a nested lookup dict:
         overlay[(country, industry)] → net_delta (float, -1 to +1)
     
-    This is called ONCE at startup and cached. When scoring a buyer,
+    This is called ONCE at startup and cached; later news rows are folded in
+    with apply_news_event. When scoring a buyer,
     we just do overlay.get((buyer_country, buyer_industry), 0.0)
+
+    Columnar: deltas for all events at once, then each event is exploded to
+    the countries its region covers and summed per (country, industry).
+    The sum is a bincount over the exploded rows, which adds in news-row
+    order — the same float result as accumulating event by event.
     """
-    overlay = {}  # key: (country, industry) → accumulated delta
-
-    for _, row in news_df.iterrows():
-        event_type       = row.get("Event_Type", "")
-        affected_industry= row.get("Affected_Industry", "")
-        region           = row.get("Region", "Global")
-        impact_level     = row.get("Impact_Level", "Medium")
-        recency_w        = row.get("recency_weight", 0.5)
-        tariff_change    = row.get("clean_tariff_change", 0)
-        war_flag         = row.get("clean_war_flag", 0)
-        calamity_flag    = row.get("clean_calamity_flag", 0)
-
-        # ── Base effect from event type ──
-        base_effect = NEWS_EVENT_BASE_EFFECTS.get(event_type, 0.0)
-
-        # ── For Tariff Update: sign depends on tariff direction ──
-        # Positive tariff_change = new tariff barriers = bad for exporter
-        # Negative tariff_change = tariff removed = good for exporter
-        if event_type == "Tariff Update":
-            base_effect = -abs(base_effect) * np.sign(tariff_change) if tariff_change != 0 else base_effect
-
-        # ── For Trade Agreement: boost if no war / calamity in same event ──
-        if event_type == "Trade Agreement":
-            if war_flag > 0.5:
-                base_effect *= 0.5  # diminish if war ongoing in same region
-
-        # ── Scale by impact level and recency ──
-        impact_mult  = NEWS_IMPACT_MULTIPLIER.get(impact_level, 0.6)
-        final_delta  = base_effect * impact_mult * recency_w
-
-        # ── Determine which (country, industry) pairs this news affects ──
-        affected_countries = REGION_COUNTRY_MAP.get(region, []) if region != "Global" else ["__ALL__"]
-
-        if region == "Global":
-            # Mark with special sentinel; matched against any country
-            key = ("__GLOBAL__", affected_industry)
-            overlay[key] = overlay.get(key, 0.0) + final_delta
-        else:
-            for country in affected_countries:
-                key = (country, affected_industry)
-                overlay[key] = overlay.get(key, 0.0) + final_delta
+    deltas = compute_news_deltas(news_df)
+
+    # ── Determine which (country, industry) pairs each event affects ──
+    region  = _news_column(news_df, "Region", "Global").astype(object)
+    targets = {r: overlay_keys(r) for r in region.unique()}
+    exploded = pd.DataFrame({
+        "country":  region.map(targets).to_numpy(),
+        "industry": _news_column(news_df, "Affected_Industry", "").to_numpy(dtype=object),
+        "delta":    deltas,
+    }).explode("country").dropna(subset=["country"])
+
+    # ── Accumulate per key (first-seen key order, as the dict would) ──
+    country_codes,  countries  = pd.factorize(exploded["country"])
+    industry_codes, industries = pd.factorize(exploded["industry"], use_na_sentinel=False)
+    key_codes, keys = pd.factorize(country_codes * len(industries) + industry_codes)
+    totals = np.bincount(key_codes, weights=exploded["delta"].to_numpy(dtype=float), minlength=len(keys))
+
+    unclipped = {
+        (countries[k // len(industries)], industries[k % len(industries)]): float(v)
+        for k, v in zip(keys, totals)
+    }
 
     # ── Clip accumulated delta to [-0.40, +0.40] to avoid dominating score ──
-    overlay = {k: float(np.clip(v, -0.40, 0.40)) for k, v in overlay.items()}
-    return overlay
+    overlay = {k: float(np.clip(v, -0.40, 0.40)) for k, v in unclipped.items()}
+    return NewsOverlay(overlay, unclipped)
+
+
+def _delta_changed(old: float, new: float) -> bool:
+    """old != new, with NaN → NaN counted as unchanged."""
+    return old != new and not (math.isnan(old) and math.isnan(new))
+
+
+def apply_news_event(overlay: NewsOverlay, event: dict, buyers_df: pd.DataFrame = None,
+                     tag_index: dict = None) -> dict:
+    """
+    Fold one new news event (a row cleaned like load_news output) into an
+    existing overlay in place, touching only the keys its region covers.
+
+    Args:
+        overlay:   NewsOverlay from build_news_overlay (updated in place)
+        event:     the news row, including recency_weight and clean_* fields
+        buyers_df: cleaned importers; when given, the report also lists the
+                   buyers whose news delta — and so composite score — changed
+        tag_index: build_news_tag_index result to append the event's card
+                   tag to (in place); without it, deck news tags only pick
+                   the event up on a full rebuild
+
+    Returns:
+        {"changed_keys": [(country, industry), ...],
+         "buyer_rows":   positions in buyers_df whose score needs re-ranking,
+         "buyer_ids":    their Buyer_IDs,
+         "news_deltas":  their new get_news_delta values}
+    """
+    delta    = float(compute_news_deltas(pd.DataFrame([event]))[0])
+    industry = event.get("Affected_Industry", "")
+
+    changed_keys, previous = [], {}
+    for country in overlay_keys(event.get("Region", "Global")):
+        key = (country, industry)
+        overlay.unclipped[key] = overlay.unclipped.get(key, 0.0) + delta
+        clipped = float(np.clip(overlay.unclipped[key], -0.40, 0.40))
+        if key not in overlay or _delta_changed(overlay[key], clipped):
+            changed_keys.append(key)
+            previous[key] = overlay.get(key, 0.0)
+        overlay[key] = clipped
+
+    if tag_index is not None:
+        _index_news_tag(tag_index, event)
+
+    report = {"changed_keys": changed_keys, "buyer_rows": [], "buyer_ids": [], "news_deltas": []}
+    if buyers_df is None or not changed_keys:
+        return report
+
+    # Buyers matching a changed key; get_news_delta is keyed on str() values
+    countries  = buyers_df["Country"].astype(str)
+    industries = buyers_df["Industry"].astype(str)
+    touched = np.zeros(len(buyers_df), dtype=bool)
+    for country, key_industry in changed_keys:
+        match = industries == str(key_industry)
+        if country != "__GLOBAL__":
+            match &= countries == country
+        touched |= match.to_numpy()
+
+    # Only buyers whose combined (exact + global) delta actually moved
+    before = ChainMap(previous, overlay)
+    for pos in np.flatnonzero(touched):
+        country, buyer_industry = countries.iat[pos], industries.iat[pos]
+        new_delta = get_news_delta(overlay, country, buyer_industry)
+        if not _delta_changed(get_news_delta(before, country, buyer_industry), new_delta):
+            continue
+        report["buyer_rows"].append(int(pos))
+        report["buyer_ids"].append(buyers_df["Buyer_ID"].iat[pos])
+        report["news_deltas"].append(new_delta)
+    return report
 
 
 def get_news_delta(overlay: dict, buyer_country: str, buyer_industry: str) -> float:
@@ -110,38 +228,72 @@ def get_news_delta(overlay: dict, buyer_country: str, buyer_industry: str) -> fl
     return float(np.clip(delta, -0.40, 0.40))
 
 
-def get_news_tags(news_df: pd.DataFrame, buyer_country: str, buyer_industry: str) -> list:
+# Card-UI emoji per news event type
+NEWS_TAG_EMOJI = {
+    "Trade Agreement":    "📈",
+    "Tariff Update":      "📋",
+    "Supply Chain Shock": "⛓️",
+    "Stock Crash":        "📉",
+    "War Alert":          "⚠️",
+    "Natural Calamity":   "🌪️",
+}
+
+# Every country named by a region; other countries only see "Global" news
+_REGION_COUNTRIES = {
+    country
+    for countries in REGION_COUNTRY_MAP.values() if countries
+    for country in countries
+}
+
+
+def build_news_tag_index(news_df: pd.DataFrame) -> dict:
     """
-    Return a list of human-readable news tags for the buyer card UI.
-    E.g. ["⚠️ War Alert in Asia affecting Machinery", "📈 Trade Agreement for Textiles"]
+    Pre-compute the card-UI news tags per (country, industry):
+        tag_index[(country, industry)] → [tag, ...]   (news row order)
+
+    Built once alongside build_news_overlay. Global events are folded into
+    every region country's list; ("__GLOBAL__", industry) holds the global
+    tags alone, for buyer countries outside REGION_COUNTRY_MAP.
     """
-    tags = []
-    for _, row in news_df.iterrows():
-        region   = row.get("Region", "Global")
-        industry = row.get("Affected_Industry", "")
-        event    = row.get("Event_Type", "")
-        impact   = row.get("Impact_Level", "Medium")
-        recency_w= row.get("recency_weight", 0)
+    tag_index = {}
+    for row in news_df.to_dict("records"):
+        _index_news_tag(tag_index, row)
+    return tag_index
 
-        # Only surface reasonably recent news
-        if recency_w < 0.2:
-            continue
 
-        industry_match = (industry == buyer_industry)
-        country_match  = _country_in_region(buyer_country, region)
+def _index_news_tag(tag_index: dict, row: dict):
+    """Append one news row's card tag under every (country, industry) it covers."""
+    region   = row.get("Region", "Global")
+    industry = row.get("Affected_Industry", "")
+    event    = row.get("Event_Type", "")
+    impact   = row.get("Impact_Level", "Medium")
+    recency_w= row.get("recency_weight", 0)
 
-        if not (industry_match and country_match):
-            continue
+    # Only surface reasonably recent news
+    if recency_w < 0.2:
+        return
+    # A missing industry never equals a buyer's industry
+    if industry != industry:
+        return
+
+    if region == "Global":
+        countries = ["__GLOBAL__", *sorted(_REGION_COUNTRIES)]
+    else:
+        countries = REGION_COUNTRY_MAP.get(region) or []
 
-        emoji_map = {
-            "Trade Agreement":    "📈",
-            "Tariff Update":      "📋",
-            "Supply Chain Shock": "⛓️",
-            "Stock Crash":        "📉",
-            "War Alert":          "⚠️",
-            "Natural Calamity":   "🌪️",
-        }
-        emoji = emoji_map.get(event, "🔔")
-        tags.append(f"{emoji} {impact} impact: {event} in {region} affecting {industry}")
-
-    return tags
+    emoji = NEWS_TAG_EMOJI.get(event, "🔔")
+    tag   = f"{emoji} {impact} impact: {event} in {region} affecting {industry}"
+    for country in countries:
+        tag_index.setdefault((country, industry), []).append(tag)
+
+
+def get_news_tags(tag_index: dict, buyer_country: str, buyer_industry: str) -> list:
+    """
+    Return a list of human-readable news tags for the buyer card UI.
+    E.g. ["⚠️ War Alert in Asia affecting Machinery", "📈 Trade Agreement for Textiles"]
+
+    tag_index comes from build_news_tag_index(); the lookup is one dict hit.
+    """
+    if buyer_country not in _REGION_COUNTRIES:
+        buyer_country = "__GLOBAL__"
+    return list(tag_index.get((buyer_country, buyer_industry), []))
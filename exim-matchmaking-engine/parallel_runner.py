@@ -0,0 +1,180 @@
+# =============================================================================
+# parallel_runner.py — Multi-Process Sharded Scoring
+# =============================================================================
+# Each exporter's card deck is independent, so exporters are sharded across a
+# process pool. The read-only buyer feature arrays (including the per-buyer
+# news overlay delta) are published ONCE into shared memory; workers attach to
+# them at start-up instead of receiving pickled copies with every task.
+#
+# Workers only do the numeric part — score a shard, pick each exporter's top-N.
+# The parent turns those selections into score documents, in exporter order,
+# so the merged decks are identical to the serial streaming run.
+
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory, util
+import numpy as np
+
+from scoring_engine import score_pairs_batch, select_top_n, take_selection
+
+# Buyer feature columns shared with workers (all numeric)
+SHARED_FEATURE_COLUMNS = [
+    "clean_industry_code",
+    "score_intent",
+    "score_reliability",
+    "score_geopolitical",
+    "score_news_delta",
+    "score_recency_weight",
+]
+
+# Worker-process state, filled in by _init_worker
+_WORKER = {}
+
+
+# ─── SHARED MEMORY ───────────────────────────────────────────────────────────
+
+def publish_arrays(arrays: dict) -> tuple:
+    """
+    Copy numeric arrays into shared memory blocks.
+
+    Returns:
+        (segments, spec) — segments must stay referenced (and be released with
+        release_arrays) for as long as workers use them; spec is the small,
+        picklable {name: (shm_name, shape, dtype)} description workers attach with.
+    """
+    segments, spec = [], {}
+    for name, arr in arrays.items():
+        arr = np.ascontiguousarray(arr)
+        shm = shared_memory.SharedMemory(create=True, size=max(arr.nbytes, 1))
+        np.ndarray(arr.shape, dtype=arr.dtype, buffer=shm.buf)[...] = arr
+        segments.append(shm)
+        spec[name] = (shm.name, arr.shape, arr.dtype.str)
+    return segments, spec
+
+
+def attach_arrays(spec: dict) -> tuple:
+    """Map the arrays described by publish_arrays' spec without copying them."""
+    segments, arrays = [], {}
+    for name, (shm_name, shape, dtype) in spec.items():
+        shm = shared_memory.SharedMemory(name=shm_name)
+        segments.append(shm)
+        arrays[name] = np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf)
+    return segments, arrays
+
+
+def release_arrays(segments: list):
+    """Close and unlink shared memory blocks created by publish_arrays."""
+    for shm in segments:
+        shm.close()
+        shm.unlink()
+
+
+# ─── WORKER SIDE ─────────────────────────────────────────────────────────────
+
+def _init_worker(feature_spec: dict, industry_matrix: tuple, top_n: int):
+    segments, features = attach_arrays(feature_spec)
+    _WORKER["segments"]        = segments
+    _WORKER["features"]        = features
+    _WORKER["industry_matrix"] = industry_matrix
+    _WORKER["top_n"]           = top_n
+    # Pool workers leave through os._exit (no atexit); multiprocessing still
+    # runs its exit finalizers, on fork and spawn alike
+    util.Finalize(None, _release_worker, exitpriority=10)
+
+
+def _release_worker():
+    """Drop the worker's array views, then close (not unlink) its mappings."""
+    _WORKER.pop("features", None)   # views must go before their buffer closes
+    for shm in _WORKER.pop("segments", []):
+        shm.close()
+
+
+def _score_shard(task: tuple) -> list:
+    """
+    Score one shard of exporters against every buyer.
+
+    Args:
+        task: (industry_codes, swipe_factors) where swipe_factors maps a row in
+              the shard to its (swipe_penalty, pattern_penalty, suppressed)
+              buyer vectors; rows without an entry have no swipe history.
+
+    Returns:
+        one take_selection() dict per exporter in the shard
+    """
+    industry_codes, swipe_factors = task
+    features = _WORKER["features"]
+    n_buyers = len(features["score_intent"])
+
+    shape      = (len(industry_codes), n_buyers)
+    swipe_pen  = np.ones(shape)
+    pattern_pen= np.ones(shape)
+    suppressed = np.zeros(shape, dtype=bool)
+    for i, (pen, pat, supp) in swipe_factors.items():
+        swipe_pen[i], pattern_pen[i], suppressed[i] = pen, pat, supp
+
+    batch = score_pairs_batch(
+        exporter_cols   = {"clean_industry_code": industry_codes},
+        buyer_features  = features,
+        swipe_penalty   = swipe_pen,
+        pattern_penalty = pattern_pen,
+        industry_matrix = _WORKER["industry_matrix"],
+    )
+
+    selections = []
+    for i in range(len(industry_codes)):
+        idx = select_top_n(batch["composite_score"][i], _WORKER["top_n"], ~suppressed[i])
+        selections.append(take_selection(batch, i, idx))
+    return selections
+
+
+# ─── PARENT SIDE ─────────────────────────────────────────────────────────────
+
+def score_exporters_parallel(
+    exporter_codes: np.ndarray,
+    swipe_factors: dict,
+    buyer_features,
+    industry_matrix: tuple,
+    top_n: int,
+    workers: int,
+    shard_size: int,
+) -> list:
+    """
+    Score every exporter against every buyer on a pool of worker processes.
+
+    Args:
+        exporter_codes:  clean_industry_code per exporter (pipeline order)
+        swipe_factors:   {exporter_position: (swipe_pen, pattern_pen, suppressed)}
+                         for exporters with swipe history only
+        buyer_features:  build_buyer_features() table
+        industry_matrix: build_industry_matrix() result from the parent
+        top_n:           deck size per exporter
+        workers:         number of worker processes
+        shard_size:      exporters per task
+
+    Returns:
+        one take_selection() dict per exporter, in exporter order
+    """
+    segments, spec = publish_arrays({
+        col: np.asarray(buyer_features[col]) for col in SHARED_FEATURE_COLUMNS
+    })
+    try:
+        tasks = []
+        for start in range(0, len(exporter_codes), shard_size):
+            stop = min(start + shard_size, len(exporter_codes))
+            shard_swipes = {
+                pos - start: factors
+                for pos, factors in swipe_factors.items() if start <= pos < stop
+            }
+            tasks.append((exporter_codes[start:stop], shard_swipes))
+
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(spec, industry_matrix, top_n),
+        ) as pool:
+            selections = []
+            # map() yields results in submission order → deterministic merge
+            for shard in pool.map(_score_shard, tasks):
+                selections.extend(shard)
+        return selections
+    finally:
+        release_arrays(segments)
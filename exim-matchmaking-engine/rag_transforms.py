@@ -0,0 +1,169 @@
+# =============================================================================
+# rag_transforms.py — RAG Export Stages (cleaned_importer / cleaned_exporter)
+# =============================================================================
+# The vector-store export (root main.py → cleaned_*.csv → pipeline.py) as
+# transform_graph stages on top of the source read the scoring branch uses:
+#
+#   {kind}.source        (data_loader) the CSV parsed once, as written
+#   {kind}.rag_base      the source with pandas' default dtypes and NA tokens
+#                        (infer_csv_dtypes), then dedupe, NA tokens, drop rows
+#                        without an ID, median fill (numeric) / "Unknown" fill
+#   {kind}.rag_filtered  IQR outlier removal, then the RAG feature columns
+#   {kind}.rag           rag_text rendered per row
+#
+# Each stage is cached on its own, so editing build_importer_text only
+# re-renders the text, and editing the IQR step never re-runs the scoring
+# branch's cleaning.
+#
+# The RAG branch branches off at {kind}.source, not {kind}.raw: raw is
+# projected to the scoring schema and turns "Unknown" measures into NaN, so
+# dedupe would compare fewer columns and the median fill would see more gaps
+# than the original export did on feeds with extra columns or dirty measures.
+# infer_csv_dtypes reproduces a plain pd.read_csv, so the export is unchanged.
+
+import numpy as np
+import pandas as pd
+
+from data_loader import _infer_column, add_source_read, add_source_stages, infer_csv_dtypes
+from transform_graph import TransformGraph
+
+
+# ─── FEATURE SELECTION ───────────────────────────────────────────────────────
+
+RAG_ID_COLUMNS = {"importers": "Buyer_ID", "exporters": "Exporter_ID"}
+
+# Columns screened for outliers (IQR), in screening order
+RAG_OUTLIER_COLUMNS = {
+    "importers": ["Revenue_Size_USD", "SalesNav_ProfileVisits", "Intent_Score", "Response_Probability"],
+    "exporters": ["Revenue_Size_USD", "Manufacturing_Capacity_Tons", "Shipment_Value_USD", "Intent_Score"],
+}
+
+# Columns kept in the RAG export
+RAG_COLUMNS = {
+    "importers": [
+        "Buyer_ID", "Country", "Industry",
+        "Revenue_Size_USD", "Team_Size", "Certification",
+        "Good_Payment_History", "Intent_Score",
+        "Preferred_Channel", "Response_Probability",
+        "Tariff_News", "StockMarket_Shock",
+        "War_Event", "Natural_Calamity", "Currency_Fluctuation",
+    ],
+    "exporters": [
+        "Exporter_ID", "State", "Industry",
+        "Revenue_Size_USD", "Manufacturing_Capacity_Tons",
+        "Team_Size", "Certification",
+        "Intent_Score", "Shipment_Value_USD",
+        "Tariff_Impact", "StockMarket_Impact",
+        "War_Risk", "Natural_Calamity_Risk", "Currency_Shift",
+    ],
+}
+
+
+# ─── STAGES ──────────────────────────────────────────────────────────────────
+
+def rag_base(text: pd.DataFrame, id_col: str) -> pd.DataFrame:
+    """Type the source text as pd.read_csv would, dedupe, blank NA tokens, drop rows without an ID, fill."""
+    df = infer_csv_dtypes(text).drop_duplicates()
+    df = df.replace(["NA", ""], np.nan)
+    df = df.dropna(subset=[id_col])
+
+    # Numeric → median, text → "Unknown"
+    for col in df.columns:
+        if pd.api.types.is_numeric_dtype(df[col]):
+            df[col] = df[col].fillna(df[col].median())
+        else:
+            df[col] = df[col].fillna("Unknown")
+    return df.reset_index(drop=True)
+
+
+def remove_outliers_iqr(df: pd.DataFrame, column: str) -> pd.DataFrame:
+    """Keep rows within 1.5 × IQR of the column's quartiles."""
+    if column not in df.columns:
+        return df
+
+    q1  = df[column].quantile(0.25)
+    q3  = df[column].quantile(0.75)
+    iqr = q3 - q1
+
+    lower = q1 - 1.5 * iqr
+    upper = q3 + 1.5 * iqr
+    return df[(df[column] >= lower) & (df[column] <= upper)]
+
+
+def rag_filtered(df: pd.DataFrame, outlier_columns: list, columns: list) -> pd.DataFrame:
+    """Screen outliers column by column, then keep the RAG features."""
+    for col in outlier_columns:
+        df = remove_outliers_iqr(df, col)
+    return df[columns].reset_index(drop=True)
+
+
+def build_importer_text(row) -> str:
+    return f"""
+Buyer from {row['Country']} in {row['Industry']} industry.
+Revenue {row['Revenue_Size_USD']} USD.
+Team size {row['Team_Size']}.
+Certification {row['Certification']}.
+Intent score {row['Intent_Score']}.
+Payment history {row['Good_Payment_History']}.
+Preferred channel {row['Preferred_Channel']}.
+Response probability {row['Response_Probability']}.
+Risk factors: Tariff {row['Tariff_News']}, 
+Stock market {row['StockMarket_Shock']}, 
+War {row['War_Event']}, 
+Natural calamity {row['Natural_Calamity']}, 
+Currency fluctuation {row['Currency_Fluctuation']}.
+"""
+
+
+def build_exporter_text(row) -> str:
+    return f"""
+Exporter from {row['State']} in {row['Industry']} industry.
+Revenue {row['Revenue_Size_USD']} USD.
+Manufacturing capacity {row['Manufacturing_Capacity_Tons']} tons.
+Team size {row['Team_Size']}.
+Certification {row['Certification']}.
+Intent score {row['Intent_Score']}.
+Shipment value {row['Shipment_Value_USD']}.
+Risk exposure: Tariff {row['Tariff_Impact']}, 
+Stock market {row['StockMarket_Impact']}, 
+War {row['War_Risk']}, 
+Natural calamity {row['Natural_Calamity_Risk']}, 
+Currency shift {row['Currency_Shift']}.
+"""
+
+
+RAG_TEXT_BUILDERS = {"importers": build_importer_text, "exporters": build_exporter_text}
+
+
+def rag_text(df: pd.DataFrame, kind: str) -> pd.DataFrame:
+    """Add the rag_text column the vector store embeds."""
+    df["rag_text"] = df.apply(RAG_TEXT_BUILDERS[kind], axis=1)
+    return df
+
+
+# ─── GRAPH ───────────────────────────────────────────────────────────────────
+
+def add_rag_stages(graph: TransformGraph, kind: str, filepath: str) -> TransformGraph:
+    """Declare {kind}.rag_base / rag_filtered / rag (and {kind}.source if missing) for one source CSV."""
+    add_source_read(graph, kind, filepath)
+    graph.add(f"{kind}.rag_base", rag_base, inputs=[f"{kind}.source"],
+              params={"id_col": RAG_ID_COLUMNS[kind]}, code=(infer_csv_dtypes, _infer_column))
+    graph.add(f"{kind}.rag_filtered", rag_filtered, inputs=[f"{kind}.rag_base"],
+              params={"outlier_columns": RAG_OUTLIER_COLUMNS[kind], "columns": RAG_COLUMNS[kind]},
+              code=(remove_outliers_iqr,))
+    graph.add(f"{kind}.rag", rag_text, inputs=[f"{kind}.rag_filtered"],
+              params={"kind": kind}, code=(RAG_TEXT_BUILDERS[kind],))
+    return graph
+
+
+def build_rag_graph(importer_path: str, exporter_path: str, as_of=None) -> TransformGraph:
+    """
+    Graph for the importer / exporter CSVs in which the scoring branch
+    ({kind}.clean) and the RAG branch ({kind}.rag) share each file's
+    {kind}.source parse.
+    """
+    graph = TransformGraph()
+    for kind, path in (("importers", importer_path), ("exporters", exporter_path)):
+        add_source_stages(graph, kind, path, as_of)
+        add_rag_stages(graph, kind, path)
+    return graph
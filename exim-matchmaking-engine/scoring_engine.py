@@ -19,6 +19,7 @@ from config import (
     RELIABILITY_WEIGHTS,
     GEOPOLITICAL_PENALTIES,
     CURRENCY_WEIGHT,
+    MIN_COMPOSITE_SCORE,
 )
 
 
@@ -175,6 +176,7 @@ def score_buyer_for_exporter(
     buyer_row: dict,
     news_overlay: dict,
     swipe_state: dict = None,
+    buyer_features: dict = None,
 ) -> dict:
     """
     Master scoring function for one (exporter, buyer) pair.
@@ -187,28 +189,40 @@ def score_buyer_for_exporter(
         news_overlay:  pre-built overlay dict from news_overlay.build_news_overlay()
         swipe_state:   dict with keys 'penalty_factor' and 'pattern_penalty'
                        from the swipe engine. Defaults to no penalty.
+        buyer_features: this buyer's row of build_buyer_features(). When given,
+                       the buyer-only sub-scores are read from it instead of
+                       being recomputed for every exporter.
 
     Returns:
         dict with all scoring fields, ready for MongoDB insertion.
     """
-    from news_overlay import get_news_delta, get_news_tags
+    from news_overlay import get_news_delta
 
     # ── Sub-scores ──
     industry_score_val, industry_tag = score_industry_match(
         exporter_row.get("Industry", ""),
         buyer_row.get("Industry", "")
     )
-    intent_val      = score_intent(buyer_row)
-    reliability_val = score_reliability(buyer_row)
-    geo_val         = score_geopolitical(buyer_row)
-
-    # ── News overlay ──
     buyer_country   = str(buyer_row.get("Country", ""))
     buyer_industry  = str(buyer_row.get("Industry", ""))
-    news_delta_val  = get_news_delta(news_overlay, buyer_country, buyer_industry)
 
-    # ── Recency ──
-    recency_val = float(buyer_row.get("recency_weight", 0.5))
+    if buyer_features is not None:
+        # ── Precomputed buyer-only sub-scores ──
+        intent_val      = float(buyer_features["score_intent"])
+        reliability_val = float(buyer_features["score_reliability"])
+        geo_val         = float(buyer_features["score_geopolitical"])
+        news_delta_val  = float(buyer_features["score_news_delta"])
+        recency_val     = float(buyer_features["score_recency_weight"])
+    else:
+        intent_val      = score_intent(buyer_row)
+        reliability_val = score_reliability(buyer_row)
+        geo_val         = score_geopolitical(buyer_row)
+
+        # ── News overlay ──
+        news_delta_val  = get_news_delta(news_overlay, buyer_country, buyer_industry)
+
+        # ── Recency ──
+        recency_val = float(buyer_row.get("recency_weight", 0.5))
 
     # ── Swipe penalties ──
     swipe_state = swipe_state or {}
@@ -227,11 +241,36 @@ def score_buyer_for_exporter(
         pattern_penalty   = pattern_pen,
     )
 
-    # ── Score tier label ──
-    from data_loader import _get_score_tier
-    tier_label = _get_score_tier(composite)
+    return build_score_document(
+        exporter_row      = exporter_row,
+        buyer_row         = buyer_row,
+        industry_score    = industry_score_val,
+        industry_tag      = industry_tag,
+        intent_score      = intent_val,
+        reliability_score = reliability_val,
+        geo_score         = geo_val,
+        news_delta        = news_delta_val,
+        recency_weight    = recency_val,
+        swipe_penalty     = swipe_pen,
+        pattern_penalty   = pattern_pen,
+        composite_score   = composite,
+    )
+
+
+def build_match_reasons(
+    exporter_row: dict,
+    buyer_row: dict,
+    industry_tag: str,
+    intent_score: float,
+    reliability_score: float,
+    geo_score: float,
+    news_delta: float,
+    swipe_penalty: float,
+) -> list:
+    """Human-readable reasons behind a pair's score, for the card UI."""
+    buyer_country  = str(buyer_row.get("Country", ""))
+    buyer_industry = str(buyer_row.get("Industry", ""))
 
-    # ── Explainability: build reason string ──
     reasons = []
     if industry_tag == "exact":
         reasons.append(f"✅ Exact industry match ({buyer_industry})")
@@ -240,46 +279,84 @@ def score_buyer_for_exporter(
     else:
         reasons.append(f"❌ No industry overlap")
 
-    if intent_val >= 0.7:
+    if intent_score >= 0.7:
         reasons.append("🔥 High buyer intent — funding/hiring/engagement active")
-    elif intent_val >= 0.4:
+    elif intent_score >= 0.4:
         reasons.append("📈 Moderate buyer intent signals")
 
-    if reliability_val >= 0.7:
+    if reliability_score >= 0.7:
         reasons.append("💳 Strong payment & response track record")
-    elif reliability_val < 0.4:
+    elif reliability_score < 0.4:
         reasons.append("⚠️ Reliability concerns — low payment/response history")
 
-    if geo_val < 0.6:
+    if geo_score < 0.6:
         reasons.append(f"🌐 Geopolitical risk in {buyer_country} — trade caution advised")
 
-    if news_delta_val > 0.05:
-        reasons.append(f"📰 Recent news boosts opportunity (+{news_delta_val:.2f})")
-    elif news_delta_val < -0.05:
-        reasons.append(f"📰 Recent news indicates market risk ({news_delta_val:.2f})")
+    if news_delta > 0.05:
+        reasons.append(f"📰 Recent news boosts opportunity (+{news_delta:.2f})")
+    elif news_delta < -0.05:
+        reasons.append(f"📰 Recent news indicates market risk ({news_delta:.2f})")
 
-    if swipe_pen < 0.8:
-        reasons.append(f"👈 Previous left-swipes apply penalty ({swipe_pen:.0%} factor)")
+    if swipe_penalty < 0.8:
+        reasons.append(f"👈 Previous left-swipes apply penalty ({swipe_penalty:.0%} factor)")
 
-    return {
+    return reasons
+
+
+def build_score_document(
+    exporter_row: dict,
+    buyer_row: dict,
+    industry_score: float,
+    industry_tag: str,
+    intent_score: float,
+    reliability_score: float,
+    geo_score: float,
+    news_delta: float,
+    recency_weight: float,
+    swipe_penalty: float,
+    pattern_penalty: float,
+    composite_score: float,
+    explain: bool = True,
+) -> dict:
+    """
+    Assemble the score document for one (exporter, buyer) pair from already
+    computed sub-scores. Shared by the per-pair scorer and the batch scorer so
+    both paths emit identical documents.
+
+    explain=False leaves out "match_reasons"; the batch pipeline adds them
+    later, via MatchExplainer, only for the cards that make a deck.
+    """
+    # ── Score tier label ──
+    from data_loader import _get_score_tier
+    tier_label = _get_score_tier(composite_score)
+
+    # ── Explainability: build reason strings ──
+    reasons = None
+    if explain:
+        reasons = build_match_reasons(
+            exporter_row, buyer_row, industry_tag,
+            intent_score, reliability_score, geo_score, news_delta, swipe_penalty,
+        )
+
+    doc = {
         # ── Identity ──
         "exporter_id":              exporter_row.get("Exporter_ID"),
         "buyer_id":                 buyer_row.get("Buyer_ID"),
 
         # ── Sub-scores (stored raw for UI display & re-ranking) ──
-        "score_industry_match":     round(industry_score_val, 4),
-        "score_intent":             round(intent_val, 4),
-        "score_reliability":        round(reliability_val, 4),
-        "score_geopolitical":       round(geo_val, 4),
-        "score_news_delta":         round(news_delta_val, 4),
-        "score_recency_weight":     round(recency_val, 4),
+        "score_industry_match":     round(industry_score, 4),
+        "score_intent":             round(intent_score, 4),
+        "score_reliability":        round(reliability_score, 4),
+        "score_geopolitical":       round(geo_score, 4),
+        "score_news_delta":         round(news_delta, 4),
+        "score_recency_weight":     round(recency_weight, 4),
 
         # ── Penalty factors ──
-        "swipe_penalty_factor":     round(swipe_pen, 4),
-        "pattern_penalty_factor":   round(pattern_pen, 4),
+        "swipe_penalty_factor":     round(swipe_penalty, 4),
+        "pattern_penalty_factor":   round(pattern_penalty, 4),
 
         # ── Final score ──
-        "composite_score":          round(composite, 4),
+        "composite_score":          round(composite_score, 4),
 
         # ── Display helpers ──
         "score_tier":               tier_label,
@@ -290,3 +367,577 @@ def score_buyer_for_exporter(
         "scored_at":                str(np.datetime64("today")),
         "data_completeness":        round(float(buyer_row.get("data_completeness", 1.0)), 4),
     }
+
+    if reasons is None:
+        del doc["match_reasons"]
+    return doc
+
+
+# ─── 7. BATCH SCORING (exporter × buyer blocks) ──────────────────────────────
+# Vectorised twins of the per-pair functions above. Every array expression
+# performs the same float64 operations in the same order as its scalar
+# counterpart, so batch results are bit-identical to score_buyer_for_exporter
+# before the 4-decimal rounding applied by build_score_document.
+
+INDUSTRY_MATCH_TAGS = ("none", "adjacent", "exact", "unknown")
+_INDUSTRY_TAG_CODE  = {tag: code for code, tag in enumerate(INDUSTRY_MATCH_TAGS)}
+_INDUSTRY_TAG_SCORE = {"none": 0.0, "adjacent": 0.5, "exact": 1.0, "unknown": 0.3}
+
+BUYER_SCORE_COLUMNS = [
+    "clean_intent_score", "clean_engagement_spike", "clean_funding_event",
+    "clean_decision_maker_change", "clean_hiring_growth", "norm_profile_visits",
+    "clean_good_payment", "clean_prompt_response",
+    "clean_war_event", "clean_natural_calamity", "clean_tariff_news",
+    "clean_stock_shock", "clean_currency_fluctuation",
+    "recency_weight",
+]
+
+
+def buyer_score_columns(buyers_df) -> dict:
+    """
+    Extract the NumPy column arrays the batch scorer reads from a cleaned
+    buyers DataFrame (output of data_loader.load_importers) or its
+    compact_store.CompactTable.
+    """
+    cols = {c: np.asarray(buyers_df[c], dtype=np.float64) for c in BUYER_SCORE_COLUMNS}
+    cols["Buyer_ID"]       = np.asarray(buyers_df["Buyer_ID"], dtype=object)
+    cols["Country"]        = np.asarray(buyers_df["Country"], dtype=object)
+    cols["Industry"]       = np.asarray(buyers_df["Industry"], dtype=object)
+    cols["clean_industry_code"] = np.asarray(buyers_df["clean_industry_code"])
+    return cols
+
+
+def exporter_score_columns(exporters_df) -> dict:
+    """Extract the NumPy column arrays the batch scorer reads from a cleaned exporters DataFrame / CompactTable."""
+    return {
+        "Exporter_ID":         np.asarray(exporters_df["Exporter_ID"], dtype=object),
+        "Industry":            np.asarray(exporters_df["Industry"], dtype=object),
+        "clean_industry_code": np.asarray(exporters_df["clean_industry_code"]),
+    }
+
+
+def score_intent_batch(buyer_cols: dict) -> np.ndarray:
+    """Vectorised score_intent over every buyer in buyer_cols."""
+    w = INTENT_SIGNAL_WEIGHTS
+    composite = (
+        buyer_cols["clean_intent_score"]          * w["raw_intent_score"] +
+        buyer_cols["clean_engagement_spike"]      * w["engagement_spike"] +
+        buyer_cols["clean_funding_event"]         * w["funding_event"] +
+        buyer_cols["clean_decision_maker_change"] * w["decision_maker_change"] +
+        buyer_cols["clean_hiring_growth"]         * w["hiring_growth"] +
+        buyer_cols["norm_profile_visits"]         * w["profile_visits_norm"]
+    )
+    return np.clip(composite, 0, 1)
+
+
+def score_reliability_batch(buyer_cols: dict) -> np.ndarray:
+    """Vectorised score_reliability over every buyer in buyer_cols."""
+    w = RELIABILITY_WEIGHTS
+    composite = (
+        buyer_cols["clean_good_payment"]    * w["payment_history"] +
+        buyer_cols["clean_prompt_response"] * w["prompt_response"]
+    )
+    return np.clip(composite, 0, 1)
+
+
+def score_geopolitical_batch(buyer_cols: dict) -> np.ndarray:
+    """Vectorised score_geopolitical over every buyer in buyer_cols."""
+    safety = np.ones(len(buyer_cols["clean_war_event"]))
+    safety = safety - buyer_cols["clean_war_event"]        * GEOPOLITICAL_PENALTIES["war_event"]
+    safety = safety - buyer_cols["clean_natural_calamity"] * GEOPOLITICAL_PENALTIES["natural_calamity"]
+    safety = safety - buyer_cols["clean_tariff_news"]      * GEOPOLITICAL_PENALTIES["tariff_news"]
+    safety = safety - buyer_cols["clean_stock_shock"]      * GEOPOLITICAL_PENALTIES["stock_market_shock"]
+
+    currency_clamped = np.clip(buyer_cols["clean_currency_fluctuation"], -1, 1)
+    safety = safety + currency_clamped * CURRENCY_WEIGHT
+
+    return np.clip(safety, 0, 1)
+
+
+# build_industry_matrix results, keyed on the INDUSTRY_VOCAB labels they were
+# built from (a grown vocabulary gets a new matrix)
+_industry_matrix_cache = {}
+
+
+def build_industry_matrix() -> tuple:
+    """
+    Dense industry-adjacency lookup over data_loader.INDUSTRY_VOCAB, derived
+    from config.INDUSTRY_ADJACENCY with the same rules as score_industry_match.
+
+    Returns:
+        (scores, tag_codes) — both shaped (n_industries, n_industries), indexed
+        [exporter_code, buyer_code]; tag codes index into INDUSTRY_MATCH_TAGS.
+    """
+    from data_loader import INDUSTRY_VOCAB
+
+    vocab = tuple(INDUSTRY_VOCAB)
+    if vocab in _industry_matrix_cache:
+        return _industry_matrix_cache[vocab]
+
+    n = len(vocab)
+    tag_codes = np.full((n, n), _INDUSTRY_TAG_CODE["none"], dtype=np.int8)
+    for e, exp_ind in enumerate(vocab):
+        adjacent = INDUSTRY_ADJACENCY.get(exp_ind, [])
+        for b, buy_ind in enumerate(vocab):
+            if exp_ind is None or buy_ind is None:
+                tag_codes[e, b] = _INDUSTRY_TAG_CODE["unknown"]
+            elif exp_ind == buy_ind:
+                tag_codes[e, b] = _INDUSTRY_TAG_CODE["exact"]
+            elif buy_ind in adjacent:
+                tag_codes[e, b] = _INDUSTRY_TAG_CODE["adjacent"]
+
+    tag_scores = np.array([_INDUSTRY_TAG_SCORE[t] for t in INDUSTRY_MATCH_TAGS])
+    _industry_matrix_cache[vocab] = (tag_scores[tag_codes], tag_codes)
+    return _industry_matrix_cache[vocab]
+
+
+def score_industry_match_batch(
+    exporter_codes: np.ndarray,
+    buyer_codes: np.ndarray,
+    industry_matrix: tuple = None,
+) -> tuple:
+    """
+    Vectorised score_industry_match for every (exporter, buyer) combination,
+    as a gather from the industry matrix using clean_industry_code values.
+    industry_matrix defaults to build_industry_matrix(); worker processes pass
+    the parent's matrix so codes added at load time resolve the same way.
+
+    Returns:
+        (scores, tag_codes) — both shaped (n_exporters, n_buyers); tag codes
+        index into INDUSTRY_MATCH_TAGS.
+    """
+    score_matrix, tag_matrix = industry_matrix or build_industry_matrix()
+    idx = (np.asarray(exporter_codes)[:, None], np.asarray(buyer_codes)[None, :])
+    return score_matrix[idx], tag_matrix[idx]
+
+
+def compute_composite_score_batch(
+    industry_score,
+    intent_score,
+    reliability_score,
+    geo_score,
+    news_delta,
+    recency_weight,
+    swipe_penalty=1.0,
+    pattern_penalty=1.0,
+) -> np.ndarray:
+    """
+    Vectorised compute_composite_score. Arguments broadcast against each other,
+    so buyer-only vectors (shape (n_buyers,)) combine with (n_exporters, n_buyers)
+    industry and penalty blocks.
+    """
+    w = SCORING_WEIGHTS
+
+    base = (
+        industry_score    * w["industry_match"] +
+        intent_score      * w["intent_score"] +
+        reliability_score * w["reliability_score"] +
+        geo_score         * w["geopolitical_safety"]
+    )
+    base_with_news   = np.clip(base + news_delta, 0, 1)
+    recency_adjusted = base_with_news * recency_weight
+    final = recency_adjusted * swipe_penalty * pattern_penalty
+
+    return np.clip(final, 0, 1)
+
+
+def build_buyer_features(buyers_df, news_overlay: dict):
+    """
+    Build the buyer feature table: every sub-score that depends only on the
+    buyer row, computed once per load instead of once per (exporter, buyer) pair.
+    buyers_df is a cleaned buyers DataFrame or its compact_store.CompactTable.
+
+    Columns (row-aligned with buyers_df; index aligned for a DataFrame):
+        Buyer_ID, clean_industry_code,
+        score_intent, score_reliability, score_geopolitical,
+        score_news_delta, score_recency_weight
+    """
+    import pandas as pd
+    from news_overlay import get_news_delta
+
+    cols = buyer_score_columns(buyers_df)
+    news_deltas = np.array([
+        get_news_delta(news_overlay, str(country), str(industry))
+        for country, industry in zip(cols["Country"], cols["Industry"])
+    ], dtype=np.float64)
+
+    return pd.DataFrame({
+        "Buyer_ID":             cols["Buyer_ID"],
+        "clean_industry_code":  cols["clean_industry_code"],
+        "score_intent":         score_intent_batch(cols),
+        "score_reliability":    score_reliability_batch(cols),
+        "score_geopolitical":   score_geopolitical_batch(cols),
+        "score_news_delta":     news_deltas,
+        "score_recency_weight": cols["recency_weight"],
+    }, index=getattr(buyers_df, "index", None))
+
+
+def score_pairs_batch(
+    exporter_cols: dict,
+    buyer_features,
+    swipe_penalty=1.0,
+    pattern_penalty=1.0,
+    industry_matrix: tuple = None,
+) -> dict:
+    """
+    Batch counterpart of score_buyer_for_exporter for a whole block of pairs.
+
+    Args:
+        exporter_cols:   exporter_score_columns() output for the block's exporters
+        buyer_features:  build_buyer_features() table (or a dict of its columns)
+        swipe_penalty:   scalar or (n_exporters, n_buyers) left-swipe decay factors
+        pattern_penalty: scalar or (n_exporters, n_buyers) pattern factors
+        industry_matrix: optional build_industry_matrix() result
+
+    Returns:
+        dict keyed like the score document: buyer-only sub-scores are
+        (n_buyers,) vectors, pair-dependent fields are (n_exporters, n_buyers)
+        arrays. Values are unrounded; build_score_document rounds them.
+    """
+    industry_scores, tag_codes = score_industry_match_batch(
+        exporter_cols["clean_industry_code"], buyer_features["clean_industry_code"], industry_matrix
+    )
+    intent_vals      = np.asarray(buyer_features["score_intent"])
+    reliability_vals = np.asarray(buyer_features["score_reliability"])
+    geo_vals         = np.asarray(buyer_features["score_geopolitical"])
+    news_deltas      = np.asarray(buyer_features["score_news_delta"])
+    recency_vals     = np.asarray(buyer_features["score_recency_weight"])
+
+    composite = compute_composite_score_batch(
+        industry_score    = industry_scores,
+        intent_score      = intent_vals,
+        reliability_score = reliability_vals,
+        geo_score         = geo_vals,
+        news_delta        = news_deltas,
+        recency_weight    = recency_vals,
+        swipe_penalty     = swipe_penalty,
+        pattern_penalty   = pattern_penalty,
+    )
+
+    return {
+        "score_industry_match":   industry_scores,
+        "industry_match_code":    tag_codes,
+        "score_intent":           intent_vals,
+        "score_reliability":      reliability_vals,
+        "score_geopolitical":     geo_vals,
+        "score_news_delta":       news_deltas,
+        "score_recency_weight":   recency_vals,
+        "swipe_penalty_factor":   np.broadcast_to(swipe_penalty, composite.shape),
+        "pattern_penalty_factor": np.broadcast_to(pattern_penalty, composite.shape),
+        "composite_score":        composite,
+    }
+
+
+# score_pairs_batch result fields, by shape
+BUYER_ONLY_FIELDS = [
+    "score_intent", "score_reliability", "score_geopolitical",
+    "score_news_delta", "score_recency_weight",
+]
+PAIR_FIELDS = [
+    "score_industry_match", "industry_match_code",
+    "swipe_penalty_factor", "pattern_penalty_factor", "composite_score",
+]
+
+
+def take_selection(batch: dict, row: int, buyer_idx) -> dict:
+    """
+    Cut the pairs (row, buyer_idx) out of a score_pairs_batch result.
+
+    The selection keeps the batch layout — a one-exporter block over the
+    selected buyers — plus "buyer_idx" mapping its columns back to buyer
+    positions, so build_score_document_from_batch(selection, 0, k, ...)
+    materialises the k-th selected pair.
+    """
+    idx = np.asarray(buyer_idx, dtype=np.int64)
+    selection = {"buyer_idx": idx}
+    for field in BUYER_ONLY_FIELDS:
+        selection[field] = np.asarray(batch[field])[idx]
+    for field in PAIR_FIELDS:
+        selection[field] = batch[field][row, idx][None, :]
+    return selection
+
+
+def build_score_document_from_batch(
+    batch: dict,
+    row: int,
+    col: int,
+    exporter_row: dict,
+    buyer_row: dict,
+    explain: bool = False,
+) -> dict:
+    """
+    Materialise the score document for pair (row, col) of a score_pairs_batch
+    result. Reasons are left to MatchExplainer unless explain=True.
+    """
+    return build_score_document(
+        exporter_row      = exporter_row,
+        buyer_row         = buyer_row,
+        industry_score    = float(batch["score_industry_match"][row, col]),
+        industry_tag      = INDUSTRY_MATCH_TAGS[batch["industry_match_code"][row, col]],
+        intent_score      = float(batch["score_intent"][col]),
+        reliability_score = float(batch["score_reliability"][col]),
+        geo_score         = float(batch["score_geopolitical"][col]),
+        news_delta        = float(batch["score_news_delta"][col]),
+        recency_weight    = float(batch["score_recency_weight"][col]),
+        swipe_penalty     = float(batch["swipe_penalty_factor"][row, col]),
+        pattern_penalty   = float(batch["pattern_penalty_factor"][row, col]),
+        composite_score   = float(batch["composite_score"][row, col]),
+        explain           = explain,
+    )
+
+
+# ─── 8. TOP-N DECK SELECTION ─────────────────────────────────────────────────
+
+# Stored scores are rounded to 4 decimals; scores closer than this may tie
+_ROUNDING_TOLERANCE = 1e-4
+
+
+def select_top_n(scores: np.ndarray, n: int, candidates: np.ndarray = None) -> list:
+    """
+    Pick the deck for one exporter from its composite score vector without
+    sorting (or materialising documents for) every buyer.
+
+    Equivalent to building every score document with a stored
+    composite_score >= MIN_COMPOSITE_SCORE, sorting by composite_score DESC
+    (ties keep buyer order) and keeping the first n — but only the buyers
+    within rounding distance of the n-th best score are ever sorted.
+
+    Args:
+        scores:     unrounded composite scores, one per buyer
+        n:          deck size
+        candidates: optional bool mask of buyers allowed in the deck
+                    (e.g. not suppressed by swipes)
+
+    Returns:
+        list of buyer indices in deck order (at most n)
+    """
+    eligible = scores >= MIN_COMPOSITE_SCORE - _ROUNDING_TOLERANCE
+    if candidates is not None:
+        eligible &= candidates
+    pool = np.flatnonzero(eligible)
+
+    # Keep only the pool that can tie with or beat the n-th best score
+    if n <= 0:
+        return []
+    if len(pool) > n:
+        pool_scores = scores[pool]
+        kth = np.partition(pool_scores, len(pool) - n)[len(pool) - n]
+        pool = pool[pool_scores >= kth - _ROUNDING_TOLERANCE]
+
+    ranked = [(round(float(scores[j]), 4), j) for j in pool]
+    ranked = [r for r in ranked if r[0] >= MIN_COMPOSITE_SCORE]
+    ranked.sort(key=lambda r: (-r[0], r[1]))
+    return [int(j) for _, j in ranked[:n]]
+
+
+# ─── 9. INDUSTRY-BLOCKED CANDIDATE GENERATION ────────────────────────────────
+# Buyers are bucketed by industry code. For a given exporter every buyer in a
+# bucket gets the same industry score, so an upper bound on composite_score per
+# bucket is known before scoring it. Buckets are scored best-bound first and
+# the rest are skipped once no bucket can reach the current N-th best score.
+
+_BUCKET_FEATURE_COLUMNS = [
+    "clean_industry_code", "score_intent", "score_reliability",
+    "score_geopolitical", "score_news_delta", "score_recency_weight",
+]
+
+def build_industry_buckets(buyer_features) -> dict:
+    """
+    Group buyers by clean_industry_code and precompute each bucket's score
+    bound for every possible industry-match tag.
+
+    Returns:
+        {
+            "codes":    (n_buckets,) industry code of each bucket,
+            "members":  list of ascending buyer-index arrays, one per bucket,
+            "bounds":   (n_buckets, len(INDUSTRY_MATCH_TAGS)) best possible
+                        composite (before swipe factors) per bucket and tag,
+        }
+    """
+    w = SCORING_WEIGHTS
+    codes   = np.asarray(buyer_features["clean_industry_code"])
+    rest    = (
+        np.asarray(buyer_features["score_intent"])       * w["intent_score"] +
+        np.asarray(buyer_features["score_reliability"])  * w["reliability_score"] +
+        np.asarray(buyer_features["score_geopolitical"]) * w["geopolitical_safety"] +
+        np.asarray(buyer_features["score_news_delta"])
+    )
+    recency = np.asarray(buyer_features["score_recency_weight"])
+    tag_scores = np.array([_INDUSTRY_TAG_SCORE[t] for t in INDUSTRY_MATCH_TAGS])
+
+    bucket_codes = np.unique(codes)
+    members = [np.flatnonzero(codes == code) for code in bucket_codes]
+    bounds = np.array([
+        [
+            np.max(np.clip(tag_score * w["industry_match"] + rest[m], 0, 1) * recency[m])
+            for tag_score in tag_scores
+        ]
+        for m in members
+    ]).reshape(len(bucket_codes), len(tag_scores))
+
+    return {"codes": bucket_codes, "members": members, "bounds": bounds}
+
+
+def select_top_n_pruned(
+    exporter_code: int,
+    buyer_features,
+    buckets: dict,
+    n: int,
+    swipe_penalty: np.ndarray = None,
+    pattern_penalty: np.ndarray = None,
+    suppressed: np.ndarray = None,
+    industry_matrix: tuple = None,
+) -> dict:
+    """
+    Same deck as select_top_n over the exhaustive score vector, but only
+    industry buckets that can still beat the N-th best score are scored.
+
+    Args:
+        exporter_code:   the exporter's clean_industry_code
+        buyer_features:  build_buyer_features() table
+        buckets:         build_industry_buckets() result for that table
+        n:               deck size
+        swipe_penalty, pattern_penalty, suppressed:
+                         optional (n_buyers,) swipe vectors for this exporter
+        industry_matrix: optional build_industry_matrix() result
+
+    Returns:
+        take_selection() dict for the deck, plus "n_scored" (pairs scored)
+    """
+    industry_matrix = industry_matrix or build_industry_matrix()
+    n_buyers   = len(buyer_features["score_intent"])
+    swipe_pen  = np.ones(n_buyers) if swipe_penalty is None else swipe_penalty
+    pattern_pen= np.ones(n_buyers) if pattern_penalty is None else pattern_penalty
+    allowed    = np.ones(n_buyers, dtype=bool) if suppressed is None else ~suppressed
+
+    # ── Bound per bucket for this exporter (swipe factors can only scale it) ──
+    tags   = industry_matrix[1][exporter_code, buckets["codes"]]
+    bounds = buckets["bounds"][np.arange(len(tags)), tags]
+    if swipe_penalty is not None or pattern_penalty is not None:
+        factors = swipe_pen * pattern_pen
+        bounds = bounds * np.array([
+            factors[m][allowed[m]].max() if allowed[m].any() else 0.0
+            for m in buckets["members"]
+        ])
+    bounds = np.clip(bounds, 0, 1)
+
+    # ── Score buckets best-bound first until none can make the deck ──
+    exporter_cols = {"clean_industry_code": np.array([exporter_code])}
+    scored_idx, scored_vals = [], []
+    kept = np.empty(0)
+    for k in np.argsort(-bounds, kind="stable"):
+        if bounds[k] < MIN_COMPOSITE_SCORE - _ROUNDING_TOLERANCE:
+            break
+        if n > 0 and len(kept) >= n and bounds[k] < kept[-n] - _ROUNDING_TOLERANCE:
+            break
+
+        m = buckets["members"][k]
+        batch = score_pairs_batch(
+            exporter_cols   = exporter_cols,
+            buyer_features  = {c: np.asarray(buyer_features[c])[m] for c in _BUCKET_FEATURE_COLUMNS},
+            swipe_penalty   = swipe_pen[m][None, :],
+            pattern_penalty = pattern_pen[m][None, :],
+            industry_matrix = industry_matrix,
+        )
+        composite = batch["composite_score"][0]
+        scored_idx.append(m)
+        scored_vals.append(np.where(allowed[m], composite, -np.inf))
+        kept = np.sort(np.concatenate([kept, composite[allowed[m]]]))[-max(n, 1):]
+
+    # ── Exact deck selection over the scored buyers, in buyer order ──
+    if scored_idx:
+        idx  = np.concatenate(scored_idx)
+        vals = np.concatenate(scored_vals)
+        order = np.argsort(idx, kind="stable")
+        idx, vals = idx[order], vals[order]
+    else:
+        idx, vals = np.empty(0, dtype=np.int64), np.empty(0)
+    deck = idx[select_top_n(vals, n)]
+
+    # Re-score just the deck to carry every score field
+    batch = score_pairs_batch(
+        exporter_cols   = exporter_cols,
+        buyer_features  = {c: np.asarray(buyer_features[c])[deck] for c in _BUCKET_FEATURE_COLUMNS},
+        swipe_penalty   = swipe_pen[deck][None, :],
+        pattern_penalty = pattern_pen[deck][None, :],
+        industry_matrix = industry_matrix,
+    )
+    selection = take_selection(batch, 0, np.arange(len(deck)))
+    selection["buyer_idx"] = deck
+    selection["n_scored"] = int(len(idx))
+    return selection
+
+
+# ─── 10. ON-DEMAND EXPLAINABILITY ────────────────────────────────────────────
+
+def _table_row(table, pos: int) -> dict:
+    """Row pos of a cleaned DataFrame or CompactTable as a plain dict."""
+    return table.row(pos) if hasattr(table, "row") else table.iloc[pos].to_dict()
+
+
+class MatchExplainer:
+    """
+    Builds match reasons and news tags for a pair only when a card is shown:
+    the deck builder calls it for deck cards, the API for a single pair
+    (GET /match/:exporter/:buyer), so the scoring loop allocates no strings.
+
+    exporters / buyers are cleaned DataFrames or their compact_store
+    CompactTables. When an ID has several records, the last one wins — the
+    same record whose deck run_pipeline keeps.
+    """
+
+    def __init__(self, exporters_df, buyers_df, buyer_features, news_tag_index, swipe_store=None):
+        self._exporters   = exporters_df
+        self._buyers      = buyers_df
+        self._features    = {c: np.asarray(buyer_features[c]) for c in BUYER_ONLY_FIELDS}
+        self._news_tags   = news_tag_index
+        self._swipe_store = swipe_store
+        self._exporter_pos = {eid: pos for pos, eid in enumerate(exporters_df["Exporter_ID"])}
+        self._buyer_pos    = {bid: pos for pos, bid in enumerate(buyers_df["Buyer_ID"])}
+
+    def explain_match(self, exporter_id: str, buyer_id: str) -> dict:
+        """
+        Explain one (exporter, buyer) pair by ID, including its current
+        swipe penalty when a swipe store was given.
+
+        Returns:
+            {"match_reasons": [...], "news_tags": [...]}
+        """
+        if exporter_id not in self._exporter_pos or buyer_id not in self._buyer_pos:
+            raise KeyError(f"Unknown pair ({exporter_id}, {buyer_id})")
+
+        exporter_row = _table_row(self._exporters, self._exporter_pos[exporter_id])
+        buyer_pos    = self._buyer_pos[buyer_id]
+        buyer_row    = _table_row(self._buyers, buyer_pos)
+
+        swipe_penalty = 1.0
+        if self._swipe_store is not None:
+            from swipe_engine import compute_full_swipe_factors
+            factors = compute_full_swipe_factors(
+                self._swipe_store.get_state(exporter_id, buyer_id),
+                self._swipe_store.get_preference_vector(exporter_id),
+                buyer_row,
+            )
+            swipe_penalty = factors["penalty_factor"]
+
+        return self.explain(exporter_row, buyer_pos, buyer_row, swipe_penalty)
+
+    def explain(self, exporter_row: dict, buyer_pos: int, buyer_row: dict, swipe_penalty: float = 1.0) -> dict:
+        """Explain a pair whose rows the caller already holds (buyer_pos = row in buyers_df)."""
+        from news_overlay import get_news_tags
+
+        industry_tag = score_industry_match(
+            exporter_row.get("Industry", ""), buyer_row.get("Industry", "")
+        )[1]
+        reasons = build_match_reasons(
+            exporter_row, buyer_row, industry_tag,
+            intent_score      = float(self._features["score_intent"][buyer_pos]),
+            reliability_score = float(self._features["score_reliability"][buyer_pos]),
+            geo_score         = float(self._features["score_geopolitical"][buyer_pos]),
+            news_delta        = float(self._features["score_news_delta"][buyer_pos]),
+            swipe_penalty     = float(swipe_penalty),
+        )
+        news_tags = get_news_tags(
+            self._news_tags, buyer_row.get("Country", ""), buyer_row.get("Industry", "")
+        )
+        return {"match_reasons": reasons, "news_tags": news_tags}
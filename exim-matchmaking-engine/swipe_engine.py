@@ -15,13 +15,15 @@
 #   This is per-exporter — one exporter's patterns don't affect others.
 #
 # MONGODB STORAGE:
-#   swipe_events collection:     raw swipe log (append-only)
+#   swipe_events collection:     raw swipe log (append-only; swipe_log.py locally)
 #   exporter_swipe_state:        per (exporter, buyer) penalty state
 #   exporter_preference_vectors: per exporter pattern learning state
 
-from datetime import datetime, timedelta
-from collections import defaultdict
+import time
+from datetime import datetime, timedelta, timezone
+from types import MappingProxyType
 import numpy as np
+import pandas as pd
 from config import (
     SWIPE_LEFT_DECAY_FACTOR,
     SWIPE_MIN_PENALTY_FLOOR,
@@ -31,7 +33,53 @@ from config import (
     PATTERN_PENALTY_FACTOR,
     PATTERN_DIMENSIONS,
     MAX_LEFT_SWIPES_BEFORE_HIDE,
+    SWIPE_LOG_FSYNC_EVERY,
+    SWIPE_SNAPSHOT_EVERY,
 )
+from swipe_log import SwipeLog, read_snapshot, write_snapshot
+
+
+# ─── SWIPE TIMESTAMPS ────────────────────────────────────────────────────────
+# Swipe times are integer microseconds since the Unix epoch (UTC): cheap to
+# store and compare, and whole days elapsed are one integer division, for a
+# single pair or a whole array of them.
+
+_US_PER_DAY = 86_400 * 1_000_000
+_EPOCH      = datetime(1970, 1, 1)
+
+# last_swiped_at in swiped_arrays() for a state without one
+NO_SWIPE_TIME = -1
+
+
+def now_epoch_us() -> int:
+    """Current time as epoch microseconds."""
+    return time.time_ns() // 1_000
+
+
+def to_epoch_us(value):
+    """
+    A swipe timestamp as epoch microseconds. Accepts ints and (legacy) ISO
+    strings; naive datetimes are UTC, as datetime.utcnow() wrote them.
+    Raises ValueError / TypeError for anything else.
+    """
+    if value is None or isinstance(value, (int, np.integer)):
+        return value if value is None else int(value)
+    dt = datetime.fromisoformat(value)
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
+    return (dt - _EPOCH) // timedelta(microseconds=1)
+
+
+def _stored_swipe_time(value):
+    """
+    last_swiped_at as SwipeStore keeps it: epoch µs, or None when unset or
+    unreadable. A legacy time that doesn't parse never gave time recovery
+    (apply_time_recovery skipped it), so it is kept as no time at all.
+    """
+    try:
+        return to_epoch_us(value)
+    except (ValueError, TypeError):
+        return None
 
 
 # ─── SWIPE STATE DOCUMENT (stored per exporter+buyer in MongoDB) ─────────────
@@ -40,22 +88,29 @@ def default_swipe_state() -> dict:
     return {
         "left_count":     0,
         "right_count":    0,
-        "last_swiped_at": None,
+        "last_swiped_at": None,   # epoch microseconds (see SWIPE TIMESTAMPS)
         "penalty_factor": 1.0,    # B: starts at full score
         "suppressed":     False,  # True if left_count >= MAX_LEFT_SWIPES_BEFORE_HIDE
     }
 
 
+# Shared read-only defaults for pairs / exporters with no swipe history, so
+# the store's own reads (_apply_event, process_swipes) never allocate one
+UNSWIPED_STATE   = MappingProxyType(default_swipe_state())
+EMPTY_PREFERENCE = MappingProxyType({})
+
+
 # ─── OPTION B: SOFT DECAY ────────────────────────────────────────────────────
 
-def apply_left_swipe(state: dict) -> dict:
+def apply_left_swipe(state: dict, now_us: int = None) -> dict:
     """
     Call when exporter left-swipes a buyer.
     Decays the penalty_factor and increments left_count.
+    now_us: swipe time (epoch µs); defaults to now. Replay passes the logged time.
     """
     state = dict(state)  # don't mutate original
     state["left_count"]     += 1
-    state["last_swiped_at"]  = datetime.utcnow().isoformat()
+    state["last_swiped_at"]  = now_epoch_us() if now_us is None else now_us
 
     # Multiplicative decay — gets harsher with repeated left-swipes
     new_penalty = state["penalty_factor"] * SWIPE_LEFT_DECAY_FACTOR
@@ -68,11 +123,11 @@ def apply_left_swipe(state: dict) -> dict:
     return state
 
 
-def apply_right_swipe(state: dict) -> dict:
-    """Call when exporter right-swipes (interested in) a buyer."""
+def apply_right_swipe(state: dict, now_us: int = None) -> dict:
+    """Call when exporter right-swipes (interested in) a buyer (now_us as apply_left_swipe)."""
     state = dict(state)
     state["right_count"]    += 1
-    state["last_swiped_at"]  = datetime.utcnow().isoformat()
+    state["last_swiped_at"]  = now_epoch_us() if now_us is None else now_us
     # Right swipe partially resets penalty (exporter showed renewed interest)
     state["penalty_factor"]  = min(state["penalty_factor"] + 0.20, 1.0)
     state["suppressed"]      = False
@@ -87,16 +142,16 @@ def apply_time_recovery(state: dict) -> dict:
     """
     state = dict(state)
     last_swiped = state.get("last_swiped_at")
-    if not last_swiped or state["penalty_factor"] >= 1.0:
+    if last_swiped is None or state["penalty_factor"] >= 1.0:
         return state
 
     try:
-        last_dt = datetime.fromisoformat(last_swiped)
-        weeks_elapsed = (datetime.utcnow() - last_dt).days / 7
+        days_elapsed  = (now_epoch_us() - to_epoch_us(last_swiped)) // _US_PER_DAY
+        weeks_elapsed = days_elapsed / 7
         recovery = weeks_elapsed * SWIPE_RECOVERY_PER_WEEK
         state["penalty_factor"] = min(state["penalty_factor"] + recovery, 1.0)
     except Exception:
-        pass
+        pass    # unreadable legacy time: no time recovery, as before epoch µs
 
     # If penalty recovered above suppression threshold, un-suppress
     if state["penalty_factor"] > 0.3 and state["suppressed"]:
@@ -105,6 +160,11 @@ def apply_time_recovery(state: dict) -> dict:
     return state
 
 
+def buyer_signal_strength(funding, dm_change, hiring_growth):
+    """Fresh-signal strength behind signal recovery (scalars or arrays)."""
+    return funding * 0.4 + dm_change * 0.4 + hiring_growth * 0.2
+
+
 def apply_signal_recovery(state: dict, buyer_row: dict) -> dict:
     """
     OPTION B signal recovery: if buyer got a NEW signal (funding, DM change)
@@ -113,7 +173,7 @@ def apply_signal_recovery(state: dict, buyer_row: dict) -> dict:
     """
     state = dict(state)
     last_swiped = state.get("last_swiped_at")
-    if not last_swiped or state["penalty_factor"] >= 1.0:
+    if last_swiped is None or state["penalty_factor"] >= 1.0:
         return state
 
     # Check if buyer has fresh signals (simplified: funding + DM change as proxies)
@@ -121,7 +181,7 @@ def apply_signal_recovery(state: dict, buyer_row: dict) -> dict:
     new_dm_change  = float(buyer_row.get("clean_decision_maker_change", 0))
     hiring_growth  = float(buyer_row.get("clean_hiring_growth", 0))
 
-    signal_strength = (new_funding * 0.4 + new_dm_change * 0.4 + hiring_growth * 0.2)
+    signal_strength = buyer_signal_strength(new_funding, new_dm_change, hiring_growth)
 
     if signal_strength > 0.3:
         recovery = SWIPE_SIGNAL_RECOVERY * signal_strength
@@ -143,10 +203,16 @@ def get_final_swipe_penalty(state: dict, buyer_row: dict) -> dict:
 
 # ─── OPTION C: PATTERN LEARNING ──────────────────────────────────────────────
 
+def pattern_key(buyer_row: dict) -> str:
+    """The buyer's "{Country}|{Industry}" key (one part per PATTERN_DIMENSIONS)."""
+    return "|".join(str(buyer_row.get(dim, "Unknown")).strip() for dim in PATTERN_DIMENSIONS)
+
+
 def update_preference_vector(
     preference_vector: dict,
     buyer_row: dict,
     direction: str,   # "left" or "right"
+    now_us: int = None,
 ) -> dict:
     """
     Updates a per-exporter preference vector based on a swipe action.
@@ -160,23 +226,22 @@ def update_preference_vector(
     Each key is "{Country}|{Industry}" (or whatever PATTERN_DIMENSIONS specifies).
     Value is the count of swipes in that direction.
     """
+    return _count_patterns(preference_vector, [(pattern_key(buyer_row), direction)], now_us)
+
+
+def _count_patterns(preference_vector: dict, swipes, now_us: int = None) -> dict:
+    """update_preference_vector for (pattern key, direction) pairs, in order, with one copy."""
     pv = dict(preference_vector)
-    pv.setdefault("left_patterns", {})
-    pv.setdefault("right_patterns", {})
-
-    # Build the pattern key from configured dimensions
-    key_parts = []
-    for dim in PATTERN_DIMENSIONS:
-        val = str(buyer_row.get(dim, "Unknown")).strip()
-        key_parts.append(val)
-    pattern_key = "|".join(key_parts)
-
-    if direction == "left":
-        pv["left_patterns"][pattern_key] = pv["left_patterns"].get(pattern_key, 0) + 1
-    elif direction == "right":
-        pv["right_patterns"][pattern_key] = pv["right_patterns"].get(pattern_key, 0) + 1
-
-    pv["last_updated"] = datetime.utcnow().isoformat()
+    pv["left_patterns"]  = dict(pv.get("left_patterns", {}))
+    pv["right_patterns"] = dict(pv.get("right_patterns", {}))
+
+    for key, direction in swipes:
+        if direction == "left":
+            pv["left_patterns"][key] = pv["left_patterns"].get(key, 0) + 1
+        elif direction == "right":
+            pv["right_patterns"][key] = pv["right_patterns"].get(key, 0) + 1
+
+    pv["last_updated"] = now_epoch_us() if now_us is None else now_us
     return pv
 
 
@@ -195,19 +260,15 @@ def compute_pattern_penalty(
     if not preference_vector:
         return 1.0
 
-    # Build this buyer's pattern key
-    key_parts = []
-    for dim in PATTERN_DIMENSIONS:
-        val = str(buyer_row.get(dim, "Unknown")).strip()
-        key_parts.append(val)
-    pattern_key = "|".join(key_parts)
+    key = pattern_key(buyer_row)
+    return _pattern_penalty(
+        preference_vector.get("left_patterns", {}).get(key, 0),
+        preference_vector.get("right_patterns", {}).get(key, 0),
+    )
 
-    left_patterns  = preference_vector.get("left_patterns", {})
-    right_patterns = preference_vector.get("right_patterns", {})
-
-    left_count  = left_patterns.get(pattern_key, 0)
-    right_count = right_patterns.get(pattern_key, 0)
 
+def _pattern_penalty(left_count: int, right_count: int) -> float:
+    """compute_pattern_penalty for a pattern's left / right swipe counts."""
     # Net negative sentiment for this pattern
     net_left = left_count - right_count
 
@@ -229,15 +290,16 @@ def get_pattern_boost(preference_vector: dict, buyer_row: dict) -> float:
     if not preference_vector:
         return 1.0
 
-    key_parts = []
-    for dim in PATTERN_DIMENSIONS:
-        val = str(buyer_row.get(dim, "Unknown")).strip()
-        key_parts.append(val)
-    pattern_key = "|".join(key_parts)
+    key = pattern_key(buyer_row)
+    return _pattern_boost(
+        preference_vector.get("left_patterns", {}).get(key, 0),
+        preference_vector.get("right_patterns", {}).get(key, 0),
+    )
+
 
-    right_count = preference_vector.get("right_patterns", {}).get(pattern_key, 0)
-    left_count  = preference_vector.get("left_patterns", {}).get(pattern_key, 0)
-    net_right   = right_count - left_count
+def _pattern_boost(left_count: int, right_count: int) -> float:
+    """get_pattern_boost for a pattern's left / right swipe counts."""
+    net_right = right_count - left_count
 
     if net_right <= 0:
         return 1.0
@@ -281,6 +343,162 @@ def compute_full_swipe_factors(
     }
 
 
+# ─── BATCH SWIPE FACTORS (one exporter × all buyers) ─────────────────────────
+
+class SwipeBuyerIndex:
+    """
+    Per-buyer lookups shared by the batch swipe functions, built once per
+    buyer table (a cleaned DataFrame or compact_store.CompactTable):
+        positions:       Buyer_ID → list of positions in the table
+        signal_strength: buyer_signal_strength per position
+        pattern_group:   per position, an integer ID of its pattern_key
+        pattern_groups:  pattern_key → group ID
+    """
+
+    def __init__(self, buyers):
+        buyer_ids = np.asarray(buyers["Buyer_ID"], dtype=object)
+        self.size = len(buyer_ids)
+        self.positions = {}
+        for pos, buyer_id in enumerate(buyer_ids):
+            self.positions.setdefault(buyer_id, []).append(pos)
+
+        self.signal_strength = buyer_signal_strength(
+            np.asarray(buyers["clean_funding_event"], dtype=np.float64),
+            np.asarray(buyers["clean_decision_maker_change"], dtype=np.float64),
+            np.asarray(buyers["clean_hiring_growth"], dtype=np.float64),
+        )
+
+        # Pattern keys, built per distinct value of each dimension, then per
+        # distinct combination — never per buyer
+        parts = []
+        for dim in PATTERN_DIMENSIONS:
+            if dim not in buyers:
+                parts.append(np.full(self.size, "Unknown", dtype=object))
+                continue
+            codes, uniques = pd.factorize(np.asarray(buyers[dim], dtype=object), use_na_sentinel=False)
+            parts.append(np.array([str(v).strip() for v in uniques], dtype=object)[codes])
+        combo, combos = pd.factorize(pd.MultiIndex.from_arrays(parts))
+        group, keys   = pd.factorize(np.array(["|".join(c) for c in combos], dtype=object))
+        self.pattern_group  = group[combo]
+        self.pattern_groups = {key: g for g, key in enumerate(keys)}
+
+
+def compile_pattern_table(preference_vector: dict, buyer_index: SwipeBuyerIndex) -> np.ndarray:
+    """
+    One exporter's Option C factor per pattern group: pattern penalty ×
+    pattern boost, as compute_full_swipe_factors combines them. Groups the
+    exporter never swiped stay 1.0, so the factor for every buyer is
+    table[buyer_index.pattern_group].
+    """
+    table = np.ones(len(buyer_index.pattern_groups))
+    if not preference_vector:
+        return table
+    left_patterns  = preference_vector.get("left_patterns", {})
+    right_patterns = preference_vector.get("right_patterns", {})
+    for key in left_patterns.keys() | right_patterns.keys():
+        group = buyer_index.pattern_groups.get(key)
+        if group is None:
+            continue    # no buyer in this table has the pattern
+        left, right  = left_patterns.get(key, 0), right_patterns.get(key, 0)
+        table[group] = _pattern_penalty(left, right) * _pattern_boost(left, right)
+    return table
+
+
+def compute_swipe_penalties(swiped: dict, buyer_index: SwipeBuyerIndex, now_us: int = None) -> tuple:
+    """
+    Batch Option B for one exporter: time recovery, signal recovery and
+    suppression for all of its swiped buyers as array operations — the same
+    rules (and floats) as get_final_swipe_penalty per pair.
+
+    Args:
+        swiped:      SwipeStore.swiped_arrays() for the exporter
+        buyer_index: SwipeBuyerIndex of the scored buyer table
+        now_us:      reference time (default: now), epoch microseconds
+
+    Returns:
+        (penalty_factor, suppressed) — dense vectors over all buyers; buyers
+        the exporter never swiped get 1.0 / False.
+    """
+    penalty    = np.ones(buyer_index.size)
+    suppressed = np.zeros(buyer_index.size, dtype=bool)
+    pos = swiped["positions"]
+    if not len(pos):
+        return penalty, suppressed
+
+    now_us   = now_epoch_us() if now_us is None else now_us
+    pf       = swiped["penalty_factor"]
+    supp     = swiped["suppressed"]
+    last     = swiped["last_swiped_at"]
+    has_time = last != NO_SWIPE_TIME
+
+    # ── Time recovery ──
+    active = has_time & (pf < 1.0)
+    weeks  = ((now_us - last) // _US_PER_DAY) / 7
+    pf     = np.where(active, np.minimum(pf + weeks * SWIPE_RECOVERY_PER_WEEK, 1.0), pf)
+    supp   = np.where(active & (pf > 0.3), False, supp)
+
+    # ── Signal recovery ──
+    signal = buyer_index.signal_strength[pos]
+    fresh  = has_time & (pf < 1.0) & (signal > 0.3)
+    pf     = np.where(fresh, np.minimum(pf + SWIPE_SIGNAL_RECOVERY * signal, 1.0), pf)
+    supp   = np.where(fresh, False, supp)
+
+    penalty[pos]    = pf
+    suppressed[pos] = supp
+    return penalty, suppressed
+
+
+# ─── PER-EXPORTER SWIPE COLUMNS ──────────────────────────────────────────────
+
+class _SwipeColumns:
+    """
+    One exporter's swiped pairs as compact arrays (one slot per buyer),
+    written through on every state change so swiped_arrays() only gathers.
+    """
+
+    _FIELDS = {
+        "penalty_factor": np.float64, "suppressed": bool,
+        "left_count": np.int64, "right_count": np.int64, "last_swiped_at": np.int64,
+    }
+
+    def __init__(self):
+        self.slots     = {}     # buyer_id → slot
+        self.buyer_ids = []     # slot → buyer_id
+        self.arrays    = {name: np.empty(8, dtype=dtype) for name, dtype in self._FIELDS.items()}
+        self._mapping  = None   # (buyer_positions, n_slots, slot idx, positions)
+
+    def set(self, buyer_id, state: dict):
+        slot = self.slots.get(buyer_id)
+        if slot is None:
+            slot = self.slots[buyer_id] = len(self.buyer_ids)
+            self.buyer_ids.append(buyer_id)
+            if slot == len(self.arrays["penalty_factor"]):
+                self.arrays = {name: np.resize(arr, 2 * slot) for name, arr in self.arrays.items()}
+        last = state["last_swiped_at"]
+        self.arrays["penalty_factor"][slot] = state["penalty_factor"]
+        self.arrays["suppressed"][slot]     = state["suppressed"]
+        self.arrays["left_count"][slot]     = state["left_count"]
+        self.arrays["right_count"][slot]    = state["right_count"]
+        self.arrays["last_swiped_at"][slot] = NO_SWIPE_TIME if last is None else last
+
+    def gather(self, buyer_positions: dict) -> dict:
+        """SwipeStore.swiped_arrays for this exporter (slot → position map cached per table)."""
+        cached = self._mapping
+        if cached is None or cached[0] is not buyer_positions or cached[1] != len(self.buyer_ids):
+            slots, positions = [], []
+            for slot, buyer_id in enumerate(self.buyer_ids):
+                for pos in buyer_positions.get(buyer_id, ()):
+                    slots.append(slot)
+                    positions.append(pos)
+            cached = self._mapping = (buyer_positions, len(self.buyer_ids),
+                                      np.asarray(slots, dtype=np.int64), np.asarray(positions, dtype=np.int64))
+        _, _, slots, positions = cached
+        swiped = {name: arr[slots] for name, arr in self.arrays.items()}
+        swiped["positions"] = positions
+        swiped["buyer_ids"] = [self.buyer_ids[slot] for slot in slots]
+        return swiped
+
+
 # ─── MOCK IN-MEMORY STORE (Replace with MongoDB calls in production) ──────────
 
 class SwipeStore:
@@ -289,56 +507,261 @@ class SwipeStore:
     In production, replace each method with a pymongo call.
     
     Collections replicated:
-        - exporter_swipe_states:     { (exporter_id, buyer_id): state_dict }
+        - exporter_swipe_states:     { exporter_id: { buyer_id: state_dict } }
         - exporter_preference_vectors: { exporter_id: pv_dict }
         - swipe_events_log:          [ event_dicts ]  (append-only)
+
+    Sparse: only swiped pairs are stored, and each exporter's pairs are also
+    kept as compact arrays (_SwipeColumns) that every state write updates, so
+    the batch scorer reads them without touching the state dicts. get_state /
+    get_preference_vector return plain dict copies, as they always have;
+    unswiped pairs get a fresh default state.
+
+    Durable mode (log_path given): swipe events go to a swipe_log.SwipeLog
+    file instead of the in-memory list, one append per event, and states +
+    vectors are snapshotted every snapshot_every events. Opening the store
+    replays the latest snapshot plus the events logged after it, so recovery
+    time is bounded by snapshot_every, not the size of the log. Call close()
+    (or sync()) to fsync the tail of the log.
     """
-    def __init__(self):
-        self._states    = defaultdict(default_swipe_state)
-        self._pvectors  = defaultdict(dict)
+    def __init__(self, log_path: str = None, snapshot_path: str = None,
+                 snapshot_every: int = SWIPE_SNAPSHOT_EVERY,
+                 fsync_every: int = SWIPE_LOG_FSYNC_EVERY):
+        self._states    = {}
+        self._columns   = {}    # exporter_id → _SwipeColumns mirror of _states
+        self._pvectors  = {}
         self._log       = []
+        self._event_log = None
+        if log_path:
+            self._event_log      = SwipeLog(log_path, fsync_every)
+            self._snapshot_path  = snapshot_path or log_path + ".snapshot.json"
+            self._snapshot_every = snapshot_every
+            self._since_snapshot = 0
+            self.replay()
 
     def get_state(self, exporter_id: str, buyer_id: str) -> dict:
-        return self._states[(exporter_id, buyer_id)].copy()
+        return dict(self._states.get(exporter_id, {}).get(buyer_id, UNSWIPED_STATE))
 
     def save_state(self, exporter_id: str, buyer_id: str, state: dict):
-        self._states[(exporter_id, buyer_id)] = state
+        self._put_state(exporter_id, buyer_id, dict(state))
+
+    def _put_state(self, exporter_id: str, buyer_id: str, state: dict):
+        """
+        Store a state the store owns, and write it through to the exporter's
+        columns. Legacy ISO last_swiped_at strings are converted here, once.
+        """
+        last = state["last_swiped_at"]
+        if last is not None and type(last) is not int:
+            state["last_swiped_at"] = _stored_swipe_time(last)
+        self._states.setdefault(exporter_id, {})[buyer_id] = state
+        columns = self._columns.get(exporter_id)
+        if columns is None:
+            columns = self._columns[exporter_id] = _SwipeColumns()
+        columns.set(buyer_id, state)
+
+    def _rebuild_columns(self):
+        """Recreate every exporter's columns from _states (after loading a snapshot)."""
+        self._columns = {}
+        for exporter_id, states in self._states.items():
+            for buyer_id, state in states.items():
+                self._put_state(exporter_id, buyer_id, state)
 
     def get_preference_vector(self, exporter_id: str) -> dict:
-        return self._pvectors[exporter_id].copy()
+        return dict(self._pvectors.get(exporter_id, EMPTY_PREFERENCE))
 
     def save_preference_vector(self, exporter_id: str, pv: dict):
-        self._pvectors[exporter_id] = pv
+        self._pvectors[exporter_id] = dict(pv)
 
-    def record_swipe_event(self, exporter_id: str, buyer_id: str, direction: str):
-        self._log.append({
-            "exporter_id": exporter_id,
-            "buyer_id":    buyer_id,
-            "direction":   direction,
-            "timestamp":   datetime.utcnow().isoformat(),
-        })
+    def swiped_exporter_ids(self) -> set:
+        """Exporters with any swipe state. All others score with neutral factors."""
+        return set(self._states) | set(self._pvectors)
 
-    def process_swipe(self, exporter_id: str, buyer_id: str, direction: str, buyer_row: dict):
+    def swiped_arrays(self, exporter_id: str, buyer_positions: dict) -> dict:
         """
-        Single entry point for processing a swipe event.
-        Updates both Option B state and Option C preference vector.
+        One exporter's swiped buyers as compact arrays, ready to scatter into
+        dense per-buyer vectors (unswiped positions keep the neutral values).
+
+        Args:
+            buyer_positions: Buyer_ID → positions of that buyer in the scored
+                             buyer table (several when records aren't merged);
+                             swiped buyers missing from it are skipped.
+
+        Returns:
+            {"positions": int64 array, "buyer_ids": [...] (one per position),
+             "penalty_factor": float64, "suppressed": bool,
+             "left_count" / "right_count": int64,
+             "last_swiped_at": int64 epoch µs (NO_SWIPE_TIME if unset)}
         """
-        # Load current state
-        state = self.get_state(exporter_id, buyer_id)
-        pv    = self.get_preference_vector(exporter_id)
+        columns = self._columns.get(exporter_id)
+        if columns is None:
+            columns = _SwipeColumns()
+        return columns.gather(buyer_positions)
+
+    def record_swipe_event(self, event: dict):
+        """Append one swipe event: the store's single write per swipe."""
+        if self._event_log is None:
+            self._log.append(event)
+            return
+        self._event_log.append(event)
+        self._since_snapshot += 1
+
+    def record_swipe_events(self, events: list):
+        """Append a batch of swipe events as one write + one fsync (group commit)."""
+        if self._event_log is None:
+            self._log.extend(events)
+            return
+        self._event_log.append_batch(events)
+        self._since_snapshot += len(events)
+
+    def _apply_event(self, event: dict):
+        """Fold one logged event into the states and vectors (live or replayed)."""
+        exporter_id, buyer_id = event["exporter_id"], event["buyer_id"]
+        direction, swiped_at  = event["direction"], event["timestamp"]
 
         # Update B state
+        state = self._states.get(exporter_id, {}).get(buyer_id, UNSWIPED_STATE)
         if direction == "left":
-            state = apply_left_swipe(state)
+            state = apply_left_swipe(state, swiped_at)
         elif direction == "right":
-            state = apply_right_swipe(state)
+            state = apply_right_swipe(state, swiped_at)
+        else:
+            state = dict(state)
 
         # Update C preference vector
-        pv = update_preference_vector(pv, buyer_row, direction)
-
-        # Persist
-        self.save_state(exporter_id, buyer_id, state)
-        self.save_preference_vector(exporter_id, pv)
-        self.record_swipe_event(exporter_id, buyer_id, direction)
+        pv = _count_patterns(self._pvectors.get(exporter_id, EMPTY_PREFERENCE),
+                             [(event["pattern_key"], direction)], swiped_at)
 
+        self._put_state(exporter_id, buyer_id, state)
+        self._pvectors[exporter_id] = pv
         return state, pv
+
+    def process_swipe(self, exporter_id: str, buyer_id: str, direction: str, buyer_row: dict):
+        """
+        Single entry point for processing a swipe event.
+        Logs the event (write-ahead), then updates both Option B state and
+        Option C preference vector from it. Returns copies of both.
+        """
+        event = {
+            "exporter_id": exporter_id,
+            "buyer_id":    buyer_id,
+            "direction":   direction,
+            "timestamp":   now_epoch_us(),
+            "pattern_key": pattern_key(buyer_row),
+        }
+        self.record_swipe_event(event)
+        state, pv = self._apply_event(event)
+        self._maybe_snapshot()
+        return dict(state), dict(pv)
+
+    def process_swipes(self, events) -> int:
+        """
+        Batched process_swipe for bursts from the deck (group commit).
+
+        Args:
+            events: iterable of {"exporter_id", "buyer_id", "direction",
+                    "buyer_row"} dicts, optionally with "timestamp" (epoch
+                    µs; defaults to one shared now).
+
+        The batch is ordered by timestamp (ties keep arrival order), logged
+        with one write and one fsync, then applied per exporter: each
+        exporter's preference vector is copied and stored once, and each
+        swiped pair's state once, however many events they got. The result
+        equals calling process_swipe for the events in timestamp order.
+        Returns the number of events applied.
+        """
+        now_us = now_epoch_us()
+        batch  = [{
+            "exporter_id": ev["exporter_id"],
+            "buyer_id":    ev["buyer_id"],
+            "direction":   ev["direction"],
+            "timestamp":   int(ev.get("timestamp", now_us)),
+            "pattern_key": pattern_key(ev["buyer_row"]),
+        } for ev in events]
+        if not batch:
+            return 0
+        batch.sort(key=lambda event: event["timestamp"])
+
+        # Persist first (write-ahead), in the order the events are applied
+        self.record_swipe_events(batch)
+
+        by_exporter = {}
+        for event in batch:
+            by_exporter.setdefault(event["exporter_id"], []).append(event)
+
+        for exporter_id, exp_events in by_exporter.items():
+            # Update B state: fold each pair's events locally, store once
+            states  = self._states.get(exporter_id, {})
+            touched = {}
+            for event in exp_events:
+                buyer_id = event["buyer_id"]
+                state = touched[buyer_id] if buyer_id in touched else states.get(buyer_id, UNSWIPED_STATE)
+                if event["direction"] == "left":
+                    state = apply_left_swipe(state, event["timestamp"])
+                elif event["direction"] == "right":
+                    state = apply_right_swipe(state, event["timestamp"])
+                else:
+                    state = dict(state)
+                touched[buyer_id] = state
+            for buyer_id, state in touched.items():
+                self._put_state(exporter_id, buyer_id, state)
+
+            # Update C preference vector: one copy per exporter
+            self._pvectors[exporter_id] = _count_patterns(
+                self._pvectors.get(exporter_id, EMPTY_PREFERENCE),
+                [(event["pattern_key"], event["direction"]) for event in exp_events],
+                exp_events[-1]["timestamp"],
+            )
+
+        self._maybe_snapshot()
+        return len(batch)
+
+    # ── Durable mode ──────────────────────────────────────────────────────
+
+    def _maybe_snapshot(self):
+        if self._event_log is not None and self._since_snapshot >= self._snapshot_every:
+            self.snapshot()
+
+    def replay(self) -> int:
+        """
+        Rebuild states and vectors from the latest snapshot and the events
+        logged after it; a torn last line is cut off. Returns the number of
+        events replayed.
+        """
+        snapshot = read_snapshot(self._snapshot_path) or {}
+        offset   = snapshot.get("log_offset", 0)
+        if offset > self._event_log.size():
+            raise ValueError(f"{self._snapshot_path} covers more of the log than {self._event_log.path} holds")
+
+        self._states   = snapshot.get("states", {})
+        self._pvectors = snapshot.get("pvectors", {})
+        self._rebuild_columns()
+        replayed = 0
+        for event, offset in self._event_log.read_events(offset):
+            self._apply_event(event)
+            replayed += 1
+        self._event_log.truncate(offset)
+
+        self._since_snapshot = replayed
+        if replayed >= self._snapshot_every:
+            self.snapshot()
+        return replayed
+
+    def snapshot(self):
+        """fsync the log, then snapshot states + vectors with the offset they cover."""
+        self._event_log.sync()
+        write_snapshot(self._snapshot_path, {
+            "log_offset": self._event_log.size(),
+            "taken_at":   now_epoch_us(),
+            "states":     self._states,
+            "pvectors":   self._pvectors,
+        })
+        self._since_snapshot = 0
+
+    def sync(self):
+        """fsync swipes logged since the last batch (no-op in memory)."""
+        if self._event_log is not None:
+            self._event_log.sync()
+
+    def close(self):
+        if self._event_log is not None:
+            self._event_log.close()
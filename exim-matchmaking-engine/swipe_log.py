@@ -0,0 +1,129 @@
+# =============================================================================
+# swipe_log.py — Durable Append-Only Swipe Event Log + Snapshots
+# =============================================================================
+# Local stand-in for the swipe_events collection, so SwipeStore survives a
+# restart. One JSON event per line, appended once per swipe:
+#
+#   {"exporter_id": ..., "buyer_id": ..., "direction": "left",
+#    "timestamp": <epoch µs>, "pattern_key": "Netherlands|Solar"}
+#
+# Every append is flushed to the OS (a crashed process loses nothing); fsync
+# is batched every SWIPE_LOG_FSYNC_EVERY appends, so a power loss costs at
+# most that many of the latest events. append_batch() group-commits a whole
+# batch: one write, one fsync. A crash mid-write leaves a torn last line,
+# which read_events() stops at and truncate() cuts off.
+#
+# Snapshots hold the materialised swipe states and preference vectors plus
+# the log offset they cover; recovery loads the latest one and replays only
+# the events written after it (SwipeStore.replay).
+
+import json
+import os
+
+from config import SWIPE_LOG_FSYNC_EVERY
+
+
+class SwipeLog:
+    """Append-only JSON-lines event file with batched fsync (see module header)."""
+
+    def __init__(self, path: str, fsync_every: int = SWIPE_LOG_FSYNC_EVERY):
+        self.path        = path
+        self.fsync_every = max(int(fsync_every), 1)
+        self._file       = None
+        self._pending    = 0    # appends since the last fsync
+
+    def _handle(self):
+        if self._file is None:
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+            self._file = open(self.path, "ab")
+        return self._file
+
+    def append(self, event: dict):
+        """Write one event (one write call); fsync once fsync_every are pending."""
+        f = self._handle()
+        f.write((json.dumps(event, separators=(",", ":")) + "\n").encode())
+        f.flush()
+        self._pending += 1
+        if self._pending >= self.fsync_every:
+            self.sync()
+
+    def append_batch(self, events: list):
+        """Write a batch of events with one write call and fsync it (group commit)."""
+        if not events:
+            return
+        f = self._handle()
+        f.write("".join(json.dumps(event, separators=(",", ":")) + "\n" for event in events).encode())
+        f.flush()
+        self._pending += len(events)
+        self.sync()
+
+    def sync(self):
+        """fsync everything appended so far."""
+        if self._file is not None and self._pending:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+        self._pending = 0
+
+    def size(self) -> int:
+        """Bytes in the log, including unsynced appends."""
+        if self._file is not None:
+            self._file.flush()
+        return os.path.getsize(self.path) if os.path.exists(self.path) else 0
+
+    def read_events(self, offset: int = 0):
+        """
+        Yield (event, end_offset) for each complete line from offset on.
+        Stops at a torn last line; a damaged line before it raises ValueError.
+        """
+        if not os.path.exists(self.path):
+            return
+        if self._file is not None:
+            self._file.flush()
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    return      # torn write at the tail
+                try:
+                    event = json.loads(line)
+                except json.JSONDecodeError as exc:
+                    raise ValueError(f"{self.path}: corrupt swipe event at byte {offset}") from exc
+                offset += len(line)
+                yield event, offset
+
+    def truncate(self, offset: int):
+        """Cut the log back to offset (drops a torn tail before appending again)."""
+        if os.path.exists(self.path) and os.path.getsize(self.path) > offset:
+            self.close()
+            with open(self.path, "r+b") as f:
+                f.truncate(offset)
+                f.flush()
+                os.fsync(f.fileno())
+
+    def close(self):
+        """fsync pending appends and release the file."""
+        if self._file is not None:
+            self.sync()
+            self._file.close()
+            self._file = None
+
+
+# ─── SNAPSHOTS ───────────────────────────────────────────────────────────────
+
+def write_snapshot(path: str, snapshot: dict):
+    """Write a snapshot atomically: readers see the old one or the new one."""
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(snapshot, f, separators=(",", ":"))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def read_snapshot(path: str):
+    """The last snapshot written to path, or None."""
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
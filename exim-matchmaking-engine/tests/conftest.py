@@ -0,0 +1,6 @@
+# The engine modules import each other as top-level modules (from config
+# import ...), as when main.py is run from this directory.
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
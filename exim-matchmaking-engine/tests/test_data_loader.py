@@ -0,0 +1,206 @@
+import pandas as pd
+import pytest
+
+import data_loader as dl
+
+AS_OF = "2025-03-01"
+
+
+def importer_row(record_id, buyer_id, date="2024-06-01", **fields):
+    """A source importer record (IMPORTER_SCHEMA columns) with plain defaults."""
+    row = {
+        "Record_ID": record_id, "Date": date, "Buyer_ID": buyer_id,
+        "Country": "Germany", "Industry": "Solar", "Avg_Order_Tons": 120.0,
+        "Revenue_Size_USD": 5_000_000, "Team_Size": 40, "Certification": "ISO9001",
+        "Good_Payment_History": 1, "Prompt_Response": 0.6, "Hiring_Growth": 0,
+        "Funding_Event": "0", "Engagement_Spike": 0, "SalesNav_ProfileVisits": 900,
+        "DecisionMaker_Change": 0, "Intent_Score": 0.5, "Preferred_Channel": "Email",
+        "Response_Probability": 0.4, "Tariff_News": 0, "StockMarket_Shock": 0,
+        "War_Event": 0, "Natural_Calamity": 0, "Currency_Fluctuation": 0.1,
+    }
+    row.update(fields)
+    return row
+
+
+def write_csv(path, rows):
+    pd.DataFrame(rows).to_csv(path, index=False)
+    return str(path)
+
+
+def clean_importers_csv(path):
+    """Full (uncached) load of an importer CSV."""
+    return dl._clean_importers(dl.read_source_csv(path, dl.IMPORTER_SCHEMA), AS_OF)
+
+
+# ─── DELTA INGESTION ─────────────────────────────────────────────────────────
+
+BASE_RECORDS = [
+    importer_row(1, "BUY_A"),
+    importer_row(2, "BUY_B", Intent_Score=0.5),
+    importer_row(3, "BUY_C", Country="Japan", Industry="Textiles"),
+]
+
+
+def test_ingest_delta_upserts_and_reports_changed_ids(tmp_path):
+    base  = clean_importers_csv(write_csv(tmp_path / "base.csv", BASE_RECORDS))
+    delta = [
+        importer_row(1, "BUY_A"),                               # identical to the base
+        importer_row(2, "BUY_B", Intent_Score=0.9),             # changed measure
+        importer_row(4, "BUY_D", Country="UAE"),                # new record, new ID
+    ]
+    updated, changed = dl.ingest_delta(base, write_csv(tmp_path / "delta.csv", delta), "importers", AS_OF)
+
+    assert changed == {"BUY_B", "BUY_D"}
+    assert updated["Record_ID"].tolist() == [1, 2, 3, 4]
+    assert updated.loc[updated["Buyer_ID"] == "BUY_B", "clean_intent_score"].item() == 0.9
+
+    # Same frame as a full load of the base file with the delta applied
+    full = clean_importers_csv(write_csv(tmp_path / "full.csv", [delta[0], delta[1], BASE_RECORDS[2], delta[2]]))
+    pd.testing.assert_frame_equal(updated, full, check_categorical=False)
+
+
+def test_ingest_delta_without_changes_reports_nothing(tmp_path):
+    base = clean_importers_csv(write_csv(tmp_path / "base.csv", BASE_RECORDS))
+    updated, changed = dl.ingest_delta(base, write_csv(tmp_path / "delta.csv", BASE_RECORDS[:2]), "importers", AS_OF)
+    assert changed == set()
+    pd.testing.assert_frame_equal(updated, base, check_categorical=False)
+
+
+def test_ingest_delta_moved_and_blanked_records(tmp_path):
+    base  = clean_importers_csv(write_csv(tmp_path / "base.csv", BASE_RECORDS))
+    delta = [
+        importer_row(1, "BUY_E"),                   # record moves to another buyer
+        importer_row(3, ""),                        # ID blanked: dropped, like a full load
+        importer_row(2, "BUY_B", Intent_Score=0.1),
+        importer_row(2, "BUY_B", Intent_Score=0.5), # last row wins: back to the base value
+    ]
+    updated, changed = dl.ingest_delta(base, write_csv(tmp_path / "delta.csv", delta), "importers", AS_OF)
+
+    assert changed == {"BUY_A", "BUY_E", "BUY_C"}
+    assert updated["Buyer_ID"].tolist() == ["BUY_E", "BUY_B"]
+    assert updated["clean_intent_score"].tolist() == [0.5, 0.5]
+
+
+# ─── ENTITY RESOLUTION ───────────────────────────────────────────────────────
+
+ENTITY_RECORDS = [
+    importer_row(1, "BUY_A", date="2023-01-01", Country="Germany", Revenue_Size_USD=1_000,
+                 Hiring_Growth=1, Funding_Event="1", Intent_Score=0.2, Response_Probability=0.3),
+    importer_row(2, "BUY_B", date="2024-01-01"),
+    importer_row(3, "BUY_A", date="2024-06-01", Country="France", Revenue_Size_USD=3_000,
+                 Hiring_Growth=0, Funding_Event="0", Intent_Score=0.8, Response_Probability=None),
+    importer_row(4, "BUY_A", date="not a date", Country="Japan", Revenue_Size_USD=2_000,
+                 Intent_Score=0.5, Response_Probability=0.7),
+    importer_row(5, "BUY_C", date="2024-06-01", Revenue_Size_USD=10),
+    importer_row(6, "BUY_C", date="2024-06-01", Revenue_Size_USD=20),
+]
+
+
+def test_resolve_entities_survivor_and_merge_rules(tmp_path):
+    records  = clean_importers_csv(write_csv(tmp_path / "importers.csv", ENTITY_RECORDS))
+    entities = dl.resolve_entities(records, "importers").set_index("Buyer_ID")
+
+    # One row per ID, in order of each ID's first record
+    assert entities.index.tolist() == ["BUY_A", "BUY_B", "BUY_C"]
+    assert entities["entity_record_count"].tolist() == [3, 1, 2]
+
+    # Survivor: the most recent record (undated counts as oldest; ties → later row)
+    buy_a = entities.loc["BUY_A"]
+    assert (buy_a["Record_ID"], buy_a["Country"], buy_a["Revenue_Size_USD"]) == (3, "France", 3_000)
+    assert entities.loc["BUY_C", "Record_ID"] == 6
+
+    # Event flags: set if any record reported them
+    assert buy_a["clean_hiring_growth"] == 1.0
+    assert buy_a["clean_funding_event"] == 1.0
+
+    # Rates / scores: recency-weighted mean over the records that have a value
+    a = records[records["Buyer_ID"] == "BUY_A"]
+    w = a["recency_weight"]
+    assert buy_a["clean_intent_score"] == pytest.approx((w * a["clean_intent_score"]).sum() / w.sum())
+    has_rate = a["clean_response_probability"].notna()
+    assert buy_a["clean_response_probability"] == pytest.approx(
+        (w * a["clean_response_probability"])[has_rate].sum() / w[has_rate].sum())
+
+    # Derived scores are recomputed from the merged signals, not the survivor's
+    assert buy_a["market_momentum_score"] == pytest.approx(0.3 * 1.0 + 0.4 * 1.0)
+    assert buy_a["buyer_activity_tier"] == "Growing"
+
+    # A single-record entity comes through unchanged
+    single = records[records["Buyer_ID"] == "BUY_B"].iloc[0]
+    pd.testing.assert_series_equal(
+        entities.loc["BUY_B"].drop("entity_record_count"),
+        single.drop("Buyer_ID"), check_names=False)
+
+
+# ─── DATA-QUALITY PROFILE ────────────────────────────────────────────────────
+
+def test_profile_separates_na_tokens_from_blanks(tmp_path):
+    path = write_csv(tmp_path / "importers.csv", [
+        importer_row(1, "BUY_A", Funding_Event="Unknown", Response_Probability="NA"),
+        importer_row(2, "BUY_B", Funding_Event="Unknown", Response_Probability=None),
+        importer_row(3, "BUY_C", Funding_Event="1", Avg_Order_Tons="12 tons"),
+        importer_row(4, "BUY_D", date="2024-13-01", Intent_Score=1.7),
+    ])
+    report  = dl.profile_frame(dl.read_source_text(path, dl.IMPORTER_SCHEMA), dl.IMPORTER_SCHEMA, "importers")
+    columns = report["columns"]
+
+    assert columns["Funding_Event"] == {
+        "null_rate": 0.0, "na_token_rate": 0.5, "na_tokens": {"Unknown": 2},
+        "unparseable": 0, "out_of_range": 0,
+    }
+    assert columns["Response_Probability"]["null_rate"] == 0.25
+    assert columns["Response_Probability"]["na_tokens"] == {"NA": 1}
+    assert columns["Avg_Order_Tons"]["unparseable_tokens"] == {"12 tons": 1}
+    assert columns["Intent_Score"]["out_of_range"] == 1
+    assert columns["Buyer_ID"]["cardinality"] == 4
+    assert report["date_range"] == {"min": "2024-06-01", "max": "2024-06-01", "invalid": 1}
+
+
+# ─── SHARED SOURCE READ ──────────────────────────────────────────────────────
+
+SOURCE_EDITS = {
+    "clean":              {},
+    "measure tokens":     {"Prompt_Response": "Unknown", "Intent_Score": "NA", "Currency_Fluctuation": "none"},
+    "whole float in int": {"Team_Size": "12.0", "Revenue_Size_USD": "+5e6"},
+    "blank int":          {"Team_Size": ""},              # typed read fails → inferred dtypes
+    "fraction in int":    {"Team_Size": "12.5"},
+    "text in float":      {"Avg_Order_Tons": "heavy"},
+    "NA-like category":   {"Country": "N/A", "Industry": ""},
+}
+
+
+@pytest.mark.parametrize("edit", SOURCE_EDITS.values(), ids=SOURCE_EDITS.keys())
+def test_views_of_the_source_text_match_direct_reads(tmp_path, edit):
+    rows = [importer_row(i, f"BUY_{i}", Intent_Score=i / 7, Currency_Fluctuation=-i / 3,
+                         Partner_Flag="true" if i % 2 else "FALSE", Partner_Note="" if i == 2 else f"n{i}")
+            for i in range(1, 6)]
+    rows[2].update(edit)
+    path = write_csv(tmp_path / "importer.csv", rows)
+    text = dl.read_source_text(path)
+
+    typed = dl.type_source_frame(text, dl.IMPORTER_SCHEMA, path)
+    pd.testing.assert_frame_equal(typed, dl.read_source_csv(path, dl.IMPORTER_SCHEMA))
+    pd.testing.assert_frame_equal(dl.infer_csv_dtypes(text), pd.read_csv(path))
+
+
+def test_scoring_and_rag_branches_share_one_parse(tmp_path, monkeypatch):
+    from rag_transforms import add_rag_stages
+
+    path  = write_csv(tmp_path / "importer.csv", [importer_row(1, "BUY_A"), importer_row(2, "BUY_B")])
+    reads = []
+    read_source_text = dl.read_source_text
+    monkeypatch.setattr(dl, "read_source_text", lambda filepath: reads.append(filepath) or read_source_text(filepath))
+
+    graph = dl.add_source_stages(dl.TransformGraph(cache_dir=None), "importers", path, AS_OF)
+    add_rag_stages(graph, "importers", path)
+    graph.run("importers.rag")
+    graph.run("importers.clean")
+    graph.run("importers.profile")
+    assert reads == [path]
+    monkeypatch.undo()
+
+    # The cached text feeds the typed read exactly as a fresh parse does
+    cache = str(tmp_path / "cache")
+    dl.add_source_stages(dl.TransformGraph(cache), "importers", path, AS_OF).run("importers.source")
+    reloaded = dl.add_source_stages(dl.TransformGraph(cache), "importers", path, AS_OF)
+    pd.testing.assert_frame_equal(reloaded.run("importers.raw"), dl.read_source_csv(path, dl.IMPORTER_SCHEMA))
@@ -0,0 +1,110 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from news_overlay import apply_news_event, build_news_overlay, build_news_tag_index, get_news_delta, get_news_tags
+
+
+def news_row(region, event_type, industry, impact="High", recency=1.0, tariff_change=0.0, war_flag=0.0):
+    """One cleaned news row, as load_news returns it."""
+    return {
+        "Region": region, "Event_Type": event_type, "Affected_Industry": industry,
+        "Impact_Level": impact, "recency_weight": recency,
+        "clean_tariff_change": tariff_change, "clean_war_flag": war_flag,
+    }
+
+
+BASE_NEWS = [
+    # (Europe, Solar) accumulates to 0.36: one more agreement crosses +0.40
+    *[news_row("Europe", "Trade Agreement", "Solar")] * 3,
+    # (Asia, Textiles) accumulates to -0.54, already clipped at -0.40
+    *[news_row("Asia", "War Alert", "Textiles")] * 3,
+    news_row("Global", "Stock Crash", "Solar", impact="Low", recency=0.5),
+    news_row("North America", "Tariff Update", "Machinery", impact="Medium", tariff_change=0.2),
+]
+
+BUYERS = pd.DataFrame({
+    "Buyer_ID": ["B_DE_SOL", "B_FR_SOL", "B_BR_SOL", "B_JP_TEX", "B_US_MAC", "B_US_SOL", "B_JP_MAC"],
+    "Country":  ["Germany", "France", "Brazil", "Japan", "USA", "USA", "Japan"],
+    "Industry": ["Solar", "Solar", "Solar", "Textiles", "Machinery", "Solar", "Machinery"],
+})
+
+EVENTS = {
+    "crosses clip bound":   news_row("Europe", "Trade Agreement", "Solar"),
+    "stays beyond bound":   news_row("Asia", "Trade Agreement", "Textiles", impact="Medium"),
+    "new global key":       news_row("Global", "Natural Calamity", "Machinery", recency=0.8),
+    "tariff sign":          news_row("North America", "Tariff Update", "Machinery", tariff_change=-0.1),
+    "global, all exact":    news_row("Global", "Supply Chain Shock", "Solar", impact="Medium"),
+    "too old for a tag":    news_row("Europe", "Stock Crash", "Machinery", recency=0.1),
+}
+
+
+@pytest.mark.parametrize("event", EVENTS.values(), ids=EVENTS.keys())
+def test_incremental_event_matches_full_rebuild(event):
+    overlay   = build_news_overlay(pd.DataFrame(BASE_NEWS))
+    tag_index = build_news_tag_index(pd.DataFrame(BASE_NEWS))
+    before    = dict(overlay)
+
+    report = apply_news_event(overlay, event, BUYERS, tag_index)
+    full   = build_news_overlay(pd.DataFrame(BASE_NEWS + [event]))
+
+    assert dict(overlay) == dict(full)
+    assert overlay.unclipped == full.unclipped
+    assert tag_index == build_news_tag_index(pd.DataFrame(BASE_NEWS + [event]))
+
+    # changed_keys: exactly the keys whose clipped value moved (or appeared)
+    moved = [k for k in full if k not in before or before[k] != full[k]]
+    assert sorted(report["changed_keys"]) == sorted(moved)
+
+    # buyer_rows: exactly the buyers whose get_news_delta moved, with new values
+    expected = [
+        pos for pos, (country, industry) in enumerate(zip(BUYERS["Country"], BUYERS["Industry"]))
+        if get_news_delta(before, country, industry) != get_news_delta(full, country, industry)
+    ]
+    assert report["buyer_rows"] == expected
+    assert report["buyer_ids"] == BUYERS["Buyer_ID"].iloc[expected].tolist()
+    assert report["news_deltas"] == [
+        get_news_delta(full, BUYERS["Country"].iat[p], BUYERS["Industry"].iat[p]) for p in expected
+    ]
+
+
+def test_clip_bound_crossing_and_saturated_keys():
+    overlay = build_news_overlay(pd.DataFrame(BASE_NEWS))
+
+    report = apply_news_event(overlay, EVENTS["crosses clip bound"], BUYERS)
+    assert overlay[("Germany", "Solar")] == 0.40
+    assert overlay.unclipped[("Germany", "Solar")] == pytest.approx(0.48)
+    assert ("Germany", "Solar") in report["changed_keys"]
+    assert report["buyer_ids"] == ["B_DE_SOL", "B_FR_SOL"]
+
+    # A key already clipped that stays clipped changes nothing downstream
+    report = apply_news_event(overlay, EVENTS["stays beyond bound"], BUYERS)
+    assert report == {"changed_keys": [], "buyer_rows": [], "buyer_ids": [], "news_deltas": []}
+    assert overlay.unclipped[("Japan", "Textiles")] == pytest.approx(-0.54 + 0.072)
+
+
+def test_events_applied_in_sequence_match_rebuild():
+    overlay   = build_news_overlay(pd.DataFrame(BASE_NEWS))
+    tag_index = build_news_tag_index(pd.DataFrame(BASE_NEWS))
+    for event in EVENTS.values():
+        apply_news_event(overlay, event, tag_index=tag_index)
+    full_news = pd.DataFrame(BASE_NEWS + list(EVENTS.values()))
+    full      = build_news_overlay(full_news)
+    assert dict(overlay) == dict(full)
+    assert overlay.unclipped == full.unclipped
+    assert tag_index == build_news_tag_index(full_news)
+
+    # Deck tags see the streamed events: a region country and an unmapped one
+    assert get_news_tags(tag_index, "Germany", "Solar")[-1].startswith("⛓️ Medium impact: Supply Chain Shock")
+    assert get_news_tags(tag_index, "Peru", "Machinery") == [
+        "🌪️ High impact: Natural Calamity in Global affecting Machinery",
+    ]
+
+
+def test_nan_delta_key_counts_as_unchanged():
+    # A missing recency weight makes the event's delta NaN
+    overlay = build_news_overlay(pd.DataFrame([news_row("Oceania", "War Alert", "Solar", recency=np.nan)]))
+    assert np.isnan(overlay[("Australia", "Solar")])
+
+    report = apply_news_event(overlay, news_row("Oceania", "War Alert", "Solar"), BUYERS)
+    assert report["changed_keys"] == []
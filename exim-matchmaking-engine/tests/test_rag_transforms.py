@@ -0,0 +1,53 @@
+import pandas as pd
+
+from rag_transforms import RAG_COLUMNS, add_rag_stages
+from transform_graph import TransformGraph
+
+
+def importer_record(buyer_id, **fields):
+    row = {
+        "Record_ID": 1, "Date": "2024-06-01", "Buyer_ID": buyer_id, "Country": "Japan",
+        "Industry": "Solar", "Revenue_Size_USD": 1_000_000, "Team_Size": 50,
+        "Certification": "ISO9001", "Good_Payment_History": 1, "Intent_Score": 0.5,
+        "Preferred_Channel": "Email", "Response_Probability": 0.4, "SalesNav_ProfileVisits": 100,
+        "Tariff_News": 0, "StockMarket_Shock": 0, "War_Event": 0, "Natural_Calamity": 0,
+        "Currency_Fluctuation": 0.1,
+    }
+    row.update(fields)
+    return row
+
+
+def run_rag(path):
+    graph = add_rag_stages(TransformGraph(cache_dir=None), "importers", str(path))
+    return graph.run("importers.rag")
+
+
+def test_rag_branch_reads_the_csv_untouched(tmp_path):
+    path = tmp_path / "importer.csv"
+    pd.DataFrame([
+        # Same in every scoring column, different in a column the scoring schema drops
+        importer_record("BUY_A", Partner_Notes="met at trade fair"),
+        importer_record("BUY_A", Partner_Notes="referral"),
+        # "Unknown" keeps Team_Size a text column, as in the original export
+        importer_record("BUY_B", Team_Size="Unknown"),
+        importer_record("BUY_C", Team_Size=None, Response_Probability="NA"),
+        importer_record(None),
+    ]).to_csv(path, index=False)
+
+    rag = run_rag(path)
+
+    assert list(rag.columns) == RAG_COLUMNS["importers"] + ["rag_text"]
+    assert rag["Buyer_ID"].tolist() == ["BUY_A", "BUY_A", "BUY_B", "BUY_C"]
+    assert rag["Team_Size"].astype(str).tolist() == ["50", "50", "Unknown", "Unknown"]
+    assert rag["Response_Probability"].tolist() == [0.4] * 4     # "NA" → median
+    assert "Team size Unknown." in rag["rag_text"].iat[3]
+
+
+def test_rag_branch_matches_a_plain_read_on_clean_files(tmp_path):
+    path = tmp_path / "importer.csv"
+    rows = [importer_record(f"BUY_{i}", Intent_Score=0.4 + i / 100) for i in range(6)]
+    pd.DataFrame(rows).to_csv(path, index=False)
+
+    rag = run_rag(path)
+    plain = pd.read_csv(path)[RAG_COLUMNS["importers"]]
+    pd.testing.assert_frame_equal(rag.drop(columns="rag_text"), plain)
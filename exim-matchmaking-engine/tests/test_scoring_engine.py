@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_loader import INDUSTRY_VOCAB
+from scoring_engine import (
+    build_industry_buckets,
+    score_pairs_batch,
+    select_top_n,
+    select_top_n_pruned,
+)
+
+
+def random_features(rng, n_buyers):
+    """A build_buyer_features()-shaped table over the fixed industry codes."""
+    return pd.DataFrame({
+        "clean_industry_code":  rng.integers(0, len(INDUSTRY_VOCAB), n_buyers).astype(np.int16),
+        "score_intent":         rng.random(n_buyers),
+        "score_reliability":    rng.random(n_buyers),
+        "score_geopolitical":   rng.random(n_buyers),
+        "score_news_delta":     rng.uniform(-0.4, 0.4, n_buyers),
+        "score_recency_weight": rng.uniform(0.2, 1.0, n_buyers),
+    })
+
+
+def exhaustive_deck(exporter_code, features, n, swipe_pen, pattern_pen, suppressed):
+    batch = score_pairs_batch(
+        exporter_cols   = {"clean_industry_code": np.array([exporter_code])},
+        buyer_features  = features,
+        swipe_penalty   = swipe_pen[None, :],
+        pattern_penalty = pattern_pen[None, :],
+    )
+    return select_top_n(batch["composite_score"][0], n, ~suppressed)
+
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("n", [1, 10, 50])
+def test_pruned_deck_matches_exhaustive(seed, n):
+    rng      = np.random.default_rng(seed)
+    n_buyers = 2_000
+    features = random_features(rng, n_buyers)
+    buckets  = build_industry_buckets(features)
+
+    # Option B decay in (0.05, 1], Option C factors up to the 1.15 boost
+    swipe_pen   = np.where(rng.random(n_buyers) < 0.3, rng.uniform(0.05, 1.0, n_buyers), 1.0)
+    pattern_pen = rng.choice([0.35, 0.7, 1.0, 1.06, 1.15], n_buyers)
+    suppressed  = rng.random(n_buyers) < 0.05
+
+    for code in range(len(INDUSTRY_VOCAB)):
+        plain = select_top_n_pruned(code, features, buckets, n)
+        assert plain["buyer_idx"].tolist() == exhaustive_deck(
+            code, features, n, np.ones(n_buyers), np.ones(n_buyers), np.zeros(n_buyers, dtype=bool))
+
+        swiped = select_top_n_pruned(code, features, buckets, n, swipe_pen, pattern_pen, suppressed)
+        assert swiped["buyer_idx"].tolist() == exhaustive_deck(
+            code, features, n, swipe_pen, pattern_pen, suppressed)
+
+
+def test_pruning_skips_buckets():
+    """Decks of an exact-match industry never need every bucket scored."""
+    rng      = np.random.default_rng(0)
+    features = random_features(rng, 5_000)
+    buckets  = build_industry_buckets(features)
+    code     = INDUSTRY_VOCAB.index("Textiles")
+    assert select_top_n_pruned(code, features, buckets, 10)["n_scored"] < len(features)
@@ -0,0 +1,330 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import swipe_engine
+import swipe_log
+from swipe_engine import (
+    NO_SWIPE_TIME, SwipeBuyerIndex, SwipeStore, apply_time_recovery, compute_swipe_penalties,
+    default_swipe_state, get_final_swipe_penalty, now_epoch_us, to_epoch_us,
+)
+from swipe_log import SwipeLog, read_snapshot, write_snapshot
+
+DAY_US = 86_400 * 1_000_000
+T0     = 1_740_787_200_000_000   # 2025-03-01T00:00:00Z
+
+BUYER_ROW = {"Industry": "Solar", "Country": "Germany", "Funding_Event": "Unknown"}
+
+# Buyer_ID → table positions; B2 appears twice, B9 is not in the table
+BUYER_POSITIONS = {"B1": [0], "B2": [1, 4], "B3": [2], "B4": [3]}
+
+
+def reference_swiped_arrays(store, exporter_id, buyer_positions):
+    """swiped_arrays rebuilt from the state dicts, as the store did before the columns."""
+    rows = [(pos, buyer_id, state)
+            for buyer_id, state in store._states.get(exporter_id, {}).items()
+            for pos in buyer_positions.get(buyer_id, ())]
+    last = [NO_SWIPE_TIME if st["last_swiped_at"] is None else to_epoch_us(st["last_swiped_at"])
+            for _, _, st in rows]
+    return {
+        "positions":      np.array([pos for pos, _, _ in rows], dtype=np.int64),
+        "buyer_ids":      [buyer_id for _, buyer_id, _ in rows],
+        "penalty_factor": np.array([st["penalty_factor"] for _, _, st in rows], dtype=np.float64),
+        "suppressed":     np.array([st["suppressed"] for _, _, st in rows], dtype=bool),
+        "left_count":     np.array([st["left_count"] for _, _, st in rows], dtype=np.int64),
+        "right_count":    np.array([st["right_count"] for _, _, st in rows], dtype=np.int64),
+        "last_swiped_at": np.array(last, dtype=np.int64),
+    }
+
+
+def assert_swiped_equal(got, want):
+    assert got.keys() == want.keys()
+    order_got, order_want = np.argsort(got["positions"]), np.argsort(want["positions"])
+    for name in want:
+        if name == "buyer_ids":
+            assert [got[name][i] for i in order_got] == [want[name][i] for i in order_want]
+        else:
+            np.testing.assert_array_equal(got[name][order_got], want[name][order_want], err_msg=name)
+            assert got[name].dtype == want[name].dtype, name
+
+
+def test_reads_are_plain_mutable_copies():
+    store = SwipeStore()
+    state, pv = store.process_swipe("E1", "B1", "left", BUYER_ROW)
+    for value in (state, pv, store.get_state("E1", "B1"), store.get_preference_vector("E1"),
+                  store.get_state("E1", "B_NEW"), store.get_preference_vector("E_NEW")):
+        assert type(value) is dict
+        json.dumps(value)
+
+    state["left_count"] = 99
+    pv.clear()
+    fresh = store.get_state("E1", "B_NEW")
+    fresh["left_count"] = 5
+    store.get_preference_vector("E_NEW")["x"] = 1
+
+    assert store.get_state("E1", "B1")["left_count"] == 1
+    assert store.get_preference_vector("E1")
+    assert store.get_state("E1", "B_NEW") == default_swipe_state()
+    assert store.get_preference_vector("E_NEW") == {}
+
+
+def test_swiped_arrays_track_every_write():
+    store = SwipeStore()
+    assert_swiped_equal(store.swiped_arrays("E1", BUYER_POSITIONS),
+                        reference_swiped_arrays(store, "E1", BUYER_POSITIONS))
+
+    store.process_swipes([
+        {"exporter_id": "E1", "buyer_id": buyer_id, "direction": direction,
+         "buyer_row": BUYER_ROW, "timestamp": T0 + i * DAY_US}
+        for i, (buyer_id, direction) in enumerate(
+            [("B1", "left"), ("B2", "left"), ("B9", "left"), ("B1", "left"), ("B2", "right")])
+    ])
+    assert_swiped_equal(store.swiped_arrays("E1", BUYER_POSITIONS),
+                        reference_swiped_arrays(store, "E1", BUYER_POSITIONS))
+
+    # New buyers after the position map was cached, past the initial capacity
+    for i in range(20):
+        store.process_swipe("E1", f"B{10 + i}", "left", BUYER_ROW)
+    store.process_swipe("E1", "B3", "left", BUYER_ROW)
+    store.save_state("E1", "B4", {**default_swipe_state(), "penalty_factor": 0.5,
+                                  "left_count": 2, "last_swiped_at": T0})
+    positions = {**BUYER_POSITIONS, **{f"B{10 + i}": [5 + i] for i in range(20)}}
+    for table in (BUYER_POSITIONS, positions):
+        assert_swiped_equal(store.swiped_arrays("E1", table),
+                            reference_swiped_arrays(store, "E1", table))
+
+
+def test_swiped_arrays_after_replay(tmp_path):
+    log, snap = str(tmp_path / "swipes.jsonl"), str(tmp_path / "snapshot.json")
+    store = SwipeStore(log_path=log, snapshot_path=snap, snapshot_every=3)
+    for i, buyer_id in enumerate(["B1", "B2", "B3", "B1", "B4"]):
+        store.process_swipe("E1", buyer_id, "left" if i % 2 == 0 else "right", BUYER_ROW)
+    store.close()
+
+    reopened = SwipeStore(log_path=log, snapshot_path=snap, snapshot_every=3)
+    assert_swiped_equal(reopened.swiped_arrays("E1", BUYER_POSITIONS),
+                        reference_swiped_arrays(reopened, "E1", BUYER_POSITIONS))
+    assert_swiped_equal(reopened.swiped_arrays("E1", BUYER_POSITIONS),
+                        store.swiped_arrays("E1", BUYER_POSITIONS))
+    reopened.close()
+
+
+LEGACY_STATES = {
+    "B1": "2025-02-01T00:00:00",          # naive ISO, as datetime.utcnow() wrote it
+    "B2": "2025-02-01T05:30:00+05:30",    # aware ISO: same instant as B1
+    "B3": "last tuesday",                 # unparseable
+    "B4": "",
+}
+
+
+def legacy_state(last_swiped_at):
+    return {**default_swipe_state(), "left_count": 2, "penalty_factor": 0.5,
+            "suppressed": True, "last_swiped_at": last_swiped_at}
+
+
+def test_legacy_times_convert_once_on_save():
+    store = SwipeStore()
+    for buyer_id, last in LEGACY_STATES.items():
+        store.save_state("E1", buyer_id, legacy_state(last))
+
+    feb_1 = to_epoch_us("2025-02-01T00:00:00+00:00")
+    assert [store.get_state("E1", b)["last_swiped_at"] for b in LEGACY_STATES] == [feb_1, feb_1, None, None]
+
+    swiped = store.swiped_arrays("E1", BUYER_POSITIONS)
+    by_buyer = dict(zip(swiped["buyer_ids"], swiped["last_swiped_at"]))
+    assert by_buyer == {"B1": feb_1, "B2": feb_1, "B3": NO_SWIPE_TIME, "B4": NO_SWIPE_TIME}
+
+
+def test_legacy_times_convert_on_replay(tmp_path):
+    log, snap = str(tmp_path / "swipes.jsonl"), str(tmp_path / "snapshot.json")
+    write_snapshot(snap, {
+        "log_offset": 0,
+        "states":     {"E1": {b: legacy_state(last) for b, last in LEGACY_STATES.items()}},
+        "pvectors":   {},
+    })
+    store = SwipeStore(log_path=log, snapshot_path=snap)
+    store.process_swipe("E1", "B3", "left", BUYER_ROW)
+
+    assert store.get_state("E1", "B1")["last_swiped_at"] == to_epoch_us("2025-02-01T00:00:00")
+    assert store.get_state("E1", "B3")["left_count"] == 3
+    assert isinstance(store.get_state("E1", "B3")["last_swiped_at"], int)
+    assert store.get_state("E1", "B4")["last_swiped_at"] is None
+    assert_swiped_equal(store.swiped_arrays("E1", BUYER_POSITIONS),
+                        reference_swiped_arrays(store, "E1", BUYER_POSITIONS))
+    store.close()
+
+
+def test_batch_penalties_match_per_pair_for_legacy_times():
+    buyers = pd.DataFrame({
+        "Buyer_ID":                    ["B1", "B2", "B3", "B4"],
+        "Industry":                    ["Solar"] * 4,
+        "Country":                     ["Germany"] * 4,
+        "clean_funding_event":         [1.0, 0.0, 1.0, 0.0],
+        "clean_decision_maker_change": [1.0, 0.0, 0.0, 1.0],
+        "clean_hiring_growth":         [0.5, 0.1, 0.9, 0.0],
+    })
+    index = SwipeBuyerIndex(buyers)
+    store = SwipeStore()
+    for buyer_id, last in LEGACY_STATES.items():
+        store.save_state("E1", buyer_id, legacy_state(last))
+
+    now_us = now_epoch_us()
+    penalty, suppressed = compute_swipe_penalties(store.swiped_arrays("E1", index.positions), index, now_us)
+    for pos, row in buyers.iterrows():
+        final = get_final_swipe_penalty(store.get_state("E1", row["Buyer_ID"]), row.to_dict())
+        assert penalty[pos] == final["penalty_factor"]
+        assert suppressed[pos] == final["suppressed"]
+
+
+def test_time_recovery_ignores_unreadable_times():
+    for last in ("last tuesday", 3.5, ["2025-02-01"]):
+        assert apply_time_recovery(legacy_state(last))["penalty_factor"] == 0.5
+
+
+ROWS = {
+    "B1": BUYER_ROW,
+    "B2": {"Industry": "Textiles", "Country": "Japan", "Funding_Event": "Series A"},
+    "B3": {"Industry": "Solar", "Country": "Brazil", "Funding_Event": "Unknown"},
+}
+
+# (exporter, buyer, direction): ten swipes, then one after the reopen
+SWIPES = [("E1", "B1", "left"), ("E1", "B2", "right"), ("E2", "B1", "left"), ("E1", "B1", "left"),
+          ("E2", "B3", "right"), ("E1", "B3", "left"), ("E1", "B1", "right"), ("E2", "B1", "left"),
+          ("E1", "B2", "left"), ("E2", "B2", "left")]
+NEXT_SWIPE = ("E2", "B1", "right")
+
+
+def reference_store(swipes) -> SwipeStore:
+    """In-memory store fed the same swipes, timestamped as swipe_at() does."""
+    store = SwipeStore()
+    for i, (exporter_id, buyer_id, direction) in enumerate(swipes):
+        store.process_swipes([{"exporter_id": exporter_id, "buyer_id": buyer_id, "direction": direction,
+                               "buyer_row": ROWS[buyer_id], "timestamp": T0 + i * DAY_US}])
+    return store
+
+
+def swipe_at(store, monkeypatch, i, swipe):
+    """process_swipe with the clock set to swipe number i."""
+    monkeypatch.setattr(swipe_engine, "now_epoch_us", lambda: T0 + i * DAY_US)
+    exporter_id, buyer_id, direction = swipe
+    store.process_swipe(exporter_id, buyer_id, direction, ROWS[buyer_id])
+
+
+def assert_same_store(got, want):
+    assert got._states == want._states
+    assert got._pvectors == want._pvectors
+    for exporter_id in want._states:
+        assert_swiped_equal(got.swiped_arrays(exporter_id, BUYER_POSITIONS),
+                            want.swiped_arrays(exporter_id, BUYER_POSITIONS))
+
+
+def test_recovery_from_snapshot_log_suffix_and_torn_tail(tmp_path, monkeypatch):
+    log, snap = str(tmp_path / "swipes.jsonl"), str(tmp_path / "snapshot.json")
+    store = SwipeStore(log_path=log, snapshot_path=snap, snapshot_every=4)
+    for i, swipe in enumerate(SWIPES):
+        swipe_at(store, monkeypatch, i, swipe)
+    store.close()
+
+    # Snapshot taken mid-stream (after swipe 8), two swipes only in the log
+    snapshot = read_snapshot(snap)
+    assert 0 < snapshot["log_offset"] < os.path.getsize(log)
+    assert sum(st["left_count"] + st["right_count"]
+               for states in snapshot["states"].values() for st in states.values()) == 8
+
+    # Crash mid-append: a partial JSON line at the tail
+    complete = os.path.getsize(log)
+    with open(log, "ab") as f:
+        f.write(b'{"exporter_id":"E1","buyer_id":"B3","direc')
+
+    reopened = SwipeStore(log_path=log, snapshot_path=snap, snapshot_every=4)
+    assert os.path.getsize(log) == complete
+    assert_same_store(reopened, reference_store(SWIPES))
+
+    # The next append lands on a clean line and survives another restart
+    swipe_at(reopened, monkeypatch, len(SWIPES), NEXT_SWIPE)
+    reopened.close()
+    events = [event for event, _ in SwipeLog(log).read_events()]
+    assert len(events) == len(SWIPES) + 1
+    assert events[-1]["buyer_id"] == NEXT_SWIPE[1] and events[-1]["timestamp"] == T0 + len(SWIPES) * DAY_US
+
+    again = SwipeStore(log_path=log, snapshot_path=snap, snapshot_every=4)
+    assert_same_store(again, reference_store(SWIPES + [NEXT_SWIPE]))
+    again.close()
+
+
+def test_recovery_ignores_a_failed_snapshot_write(tmp_path, monkeypatch):
+    log, snap = str(tmp_path / "swipes.jsonl"), str(tmp_path / "snapshot.json")
+    store = SwipeStore(log_path=log, snapshot_path=snap, snapshot_every=4)
+    for i, swipe in enumerate(SWIPES[:7]):
+        swipe_at(store, monkeypatch, i, swipe)
+
+    # The next snapshot dies after writing its temp file, before the rename
+    def crash(src, dst):
+        raise OSError("crash before rename")
+    monkeypatch.setattr(swipe_log.os, "replace", crash)
+    with pytest.raises(OSError):
+        swipe_at(store, monkeypatch, 7, SWIPES[7])
+    monkeypatch.undo()
+    store.close()
+    assert os.path.exists(snap + ".tmp")
+    assert read_snapshot(snap)["log_offset"] < os.path.getsize(log)   # still the snapshot after swipe 4
+
+    reopened = SwipeStore(log_path=log, snapshot_path=snap, snapshot_every=4)
+    assert_same_store(reopened, reference_store(SWIPES[:8]))
+    reopened.close()
+
+
+HOUR_US = 3_600 * 1_000_000
+
+# Three bursts in arrival order: (exporter, buyer, direction, hours after T0).
+# Within a burst times arrive out of order, pairs repeat, and ties (same
+# pair or not) must keep arrival order.
+BURSTS = [
+    [("E1", "B1", "left", 3), ("E1", "B2", "right", 1), ("E1", "B1", "left", 2), ("E2", "B1", "left", 2)],
+    [("E1", "B1", "right", 6), ("E2", "B3", "right", 4), ("E1", "B1", "left", 5), ("E1", "B1", "left", 7)],
+    [("E2", "B2", "right", 10), ("E2", "B1", "left", 9), ("E2", "B2", "left", 10),
+     ("E1", "B3", "left", 8), ("E2", "B1", "left", 9)],
+]
+
+
+def test_process_swipes_equals_sequential_process_swipe(tmp_path, monkeypatch):
+    seq_log, seq_snap = str(tmp_path / "seq.jsonl"), str(tmp_path / "seq.json")
+    batch_log, batch_snap = str(tmp_path / "batch.jsonl"), str(tmp_path / "batch.json")
+    sequential = SwipeStore(log_path=seq_log, snapshot_path=seq_snap, snapshot_every=5)
+    batched    = SwipeStore(log_path=batch_log, snapshot_path=batch_snap, snapshot_every=5)
+
+    snapshot_offsets = []
+    for burst in BURSTS:
+        for exporter_id, buyer_id, direction, hours in sorted(burst, key=lambda swipe: swipe[3]):
+            monkeypatch.setattr(swipe_engine, "now_epoch_us", lambda: T0 + hours * HOUR_US)
+            sequential.process_swipe(exporter_id, buyer_id, direction, ROWS[buyer_id])
+
+        monkeypatch.setattr(swipe_engine, "now_epoch_us", lambda: T0 + 99 * DAY_US)
+        applied = batched.process_swipes([
+            {"exporter_id": exporter_id, "buyer_id": buyer_id, "direction": direction,
+             "buyer_row": ROWS[buyer_id], "timestamp": T0 + hours * HOUR_US}
+            for exporter_id, buyer_id, direction, hours in burst
+        ])
+        assert applied == len(burst)
+        snapshot = read_snapshot(batch_snap)
+        snapshot_offsets.append(snapshot and snapshot["log_offset"])
+
+        assert_same_store(batched, sequential)     # states include last_swiped_at
+
+    # The batched store snapshots only at burst ends, once 5 events are pending:
+    # not after burst 1 (4), after burst 2 (8) and burst 3 (5)
+    sequential.close()
+    batched.close()
+    ends = [offset for _, offset in SwipeLog(batch_log).read_events()]
+    assert snapshot_offsets == [None, ends[7], ends[12]]
+
+    # Both logs hold the same events in the same (applied) order
+    assert ([event for event, _ in SwipeLog(batch_log).read_events()]
+            == [event for event, _ in SwipeLog(seq_log).read_events()])
+
+    reopened = SwipeStore(log_path=batch_log, snapshot_path=batch_snap, snapshot_every=5)
+    assert_same_store(reopened, sequential)
+    reopened.close()
@@ -0,0 +1,59 @@
+import json
+
+import pytest
+
+import swipe_log
+from swipe_log import SwipeLog, read_snapshot, write_snapshot
+
+EVENTS = [{"exporter_id": "E1", "buyer_id": f"B{i}", "direction": "left",
+           "timestamp": 1_740_787_200_000_000 + i, "pattern_key": "Germany|Solar"} for i in range(5)]
+
+
+def test_read_events_stops_at_torn_tail_and_truncate_cuts_it(tmp_path):
+    log = SwipeLog(str(tmp_path / "swipes.jsonl"))
+    log.append_batch(EVENTS[:3])
+    log.append(EVENTS[3])
+    complete = log.size()
+    log.close()
+    with open(log.path, "ab") as f:
+        f.write(b'{"exporter_id":"E1","buy')
+
+    read = list(log.read_events())
+    assert [event for event, _ in read] == EVENTS[:4]
+    assert read[-1][1] == complete
+    assert [event for event, _ in log.read_events(read[1][1])] == EVENTS[2:4]
+
+    log.truncate(complete)
+    log.append(EVENTS[4])
+    log.close()
+    assert [event for event, _ in log.read_events()] == EVENTS
+
+
+def test_read_events_rejects_a_damaged_line_before_the_tail(tmp_path):
+    path = tmp_path / "swipes.jsonl"
+    path.write_bytes(b"".join(json.dumps(event).encode() + b"\n" for event in EVENTS[:2])
+                     + b'{"exporter_id": \n' + json.dumps(EVENTS[2]).encode() + b"\n")
+    with pytest.raises(ValueError, match="corrupt swipe event"):
+        list(SwipeLog(str(path)).read_events())
+
+
+def test_write_snapshot_replaces_atomically(tmp_path, monkeypatch):
+    path = str(tmp_path / "snapshot.json")
+    assert read_snapshot(path) is None
+    write_snapshot(path, {"log_offset": 10})
+
+    # A crash before the rename leaves the old snapshot whole
+    def crash(src, dst):
+        raise OSError("crash before rename")
+    monkeypatch.setattr(swipe_log.os, "replace", crash)
+    with pytest.raises(OSError):
+        write_snapshot(path, {"log_offset": 20})
+    monkeypatch.undo()
+    assert read_snapshot(path) == {"log_offset": 10}
+
+    # The leftover temp file is simply overwritten by the next snapshot
+    with open(path + ".tmp", "w") as f:
+        f.write('{"log_off')
+    write_snapshot(path, {"log_offset": 30})
+    assert read_snapshot(path) == {"log_offset": 30}
+    assert not (tmp_path / "snapshot.json.tmp").exists()
@@ -0,0 +1,172 @@
+# =============================================================================
+# transform_graph.py — Declarative Transform Graph with Per-Stage Caching
+# =============================================================================
+# Both consumers of the source CSVs — the scoring pipeline (data_loader) and
+# the RAG export (root main.py) — are declared as stages of one graph:
+#
+#   importer.csv ── importers.source ──┬── importers.raw ── importers.clean
+#                                      ├── importers.profile        (scoring)
+#                                      └── importers.rag_base
+#                         ── importers.rag_filtered ── importers.rag   (RAG)
+#
+# A stage is a function of its input stages' outputs plus keyword params.
+# Its cache key hashes the input keys, the params, the stage's code (its own
+# source and that of any helpers it lists), an optional version value and,
+# for source stages, the bytes of the file. Editing one stage therefore only
+# re-runs that stage and the ones below it: changing build_importer_text
+# re-renders rag_text from the cached IQR-filtered frame, and changing the
+# IQR step leaves the scoring branch alone. A helper whose source is not
+# listed is invisible to the key, so stages list every function they call
+# that can change their output.
+#
+# Outputs are memoised per graph and written to DATA_CACHE_DIR — DataFrames
+# as Feather (needs pyarrow; skipped without it), dicts as JSON.
+
+import hashlib
+import inspect
+import json
+import os
+
+import pandas as pd
+
+from config import DATA_CACHE_DIR
+
+
+def file_digest(filepath: str) -> str:
+    """sha256 of a file's bytes."""
+    digest = hashlib.sha256()
+    with open(filepath, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _code_fingerprint(fn) -> str:
+    """Source of a function (falls back to its qualified name)."""
+    try:
+        return inspect.getsource(fn)
+    except (OSError, TypeError):
+        return f"{getattr(fn, '__module__', '')}.{getattr(fn, '__qualname__', repr(fn))}"
+
+
+class Stage:
+    """One node of a TransformGraph (see module header)."""
+
+    def __init__(self, name: str, fn, inputs=(), params=None, code=(), source=None,
+                 version=None, cache=True):
+        self.name    = name
+        self.fn      = fn
+        self.inputs  = tuple(inputs)
+        self.params  = dict(params or {})
+        self.code    = tuple(code)      # helpers whose source is part of the key
+        self.source  = source           # file path whose bytes are part of the key
+        self.version = version          # anything else the output depends on (repr'd)
+        self.cache   = cache            # False: memoise in-process only
+
+
+class TransformGraph:
+    """
+    A set of named stages run on demand. run(name) runs (or loads from the
+    cache) everything name depends on, once per graph instance.
+    """
+
+    def __init__(self, cache_dir: str = DATA_CACHE_DIR):
+        self.cache_dir = cache_dir
+        self._stages   = {}
+        self._keys     = {}
+        self._results  = {}
+
+    def add(self, name: str, fn, inputs=(), params=None, code=(), source=None,
+            version=None, cache=True) -> "TransformGraph":
+        """Declare a stage; inputs must already be declared. Returns the graph."""
+        missing = [i for i in inputs if i not in self._stages]
+        if missing:
+            raise KeyError(f"stage {name!r} depends on undeclared stages {missing}")
+        self._stages[name] = Stage(name, fn, inputs, params, code, source, version, cache)
+        return self
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._stages
+
+    def key(self, name: str) -> str:
+        """Cache key of a stage: its code, params, source bytes and input keys."""
+        if name not in self._keys:
+            stage = self._stages[name]
+            payload = repr((
+                name,
+                [_code_fingerprint(fn) for fn in (stage.fn, *stage.code)],
+                sorted(stage.params.items()),
+                file_digest(stage.source) if stage.source else None,
+                stage.version,
+                [self.key(i) for i in stage.inputs],
+            ))
+            self._keys[name] = hashlib.sha256(payload.encode()).hexdigest()[:24]
+        return self._keys[name]
+
+    def run(self, name: str):
+        """Output of a stage; inputs are handed over as copies, so stages may mutate them."""
+        if name in self._results:
+            return self._results[name]
+
+        stage  = self._stages[name]
+        result = self._load(stage)
+        if result is None:
+            inputs = [self._copy(self.run(i)) for i in stage.inputs]
+            result = stage.fn(*inputs, **stage.params)
+            self._store(stage, result)
+        self._results[name] = result
+        return result
+
+    @staticmethod
+    def _copy(value):
+        if isinstance(value, pd.DataFrame):
+            return value.copy()
+        if isinstance(value, dict):
+            return json.loads(json.dumps(value))
+        return value
+
+    # ── Disk cache ────────────────────────────────────────────────────────
+
+    def _path(self, stage: Stage, ext: str) -> str:
+        return os.path.join(self.cache_dir, f"{stage.name}-{self.key(stage.name)}.{ext}")
+
+    def _load(self, stage: Stage):
+        """Cached output of a stage, or None."""
+        if not (stage.cache and self.cache_dir):
+            return None
+        json_path = self._path(stage, "json")
+        if os.path.exists(json_path):
+            with open(json_path) as f:
+                return json.load(f)
+        feather_path = self._path(stage, "feather")
+        if os.path.exists(feather_path):
+            try:
+                from pyarrow import feather
+            except ImportError:
+                return None
+            print(f"  [Cache] {stage.name}: loaded from {feather_path}")
+            # Mapped, not read, but to_pandas() still copies every column:
+            # stages get an ordinary, writable DataFrame
+            return feather.read_table(feather_path, memory_map=True).to_pandas()
+        return None
+
+    def _store(self, stage: Stage, result):
+        """Write a stage output to the cache; failures only cost the cache entry."""
+        if not (stage.cache and self.cache_dir):
+            return
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            if isinstance(result, pd.DataFrame):
+                try:
+                    import pyarrow  # noqa: F401
+                except ImportError:
+                    return
+                path = self._path(stage, "feather")
+                result.to_feather(path + ".tmp", compression="uncompressed")
+            else:
+                path = self._path(stage, "json")
+                with open(path + ".tmp", "w") as f:
+                    json.dump(result, f, indent=2)
+            os.replace(path + ".tmp", path)   # atomic: readers never see a partial file
+        except Exception as exc:             # e.g. mixed-type columns Arrow can't store
+            print(f"  [Cache] {stage.name}: not cached ({exc})")